@@ -13,6 +13,19 @@ WEEK: constant(uint256) = 604800
 # Cannot change weight votes more often than once in 10 days
 WEIGHT_VOTE_DELAY: constant(uint256) = 10 * 86400
 
+# Maximum number of gauges in a single `vote_for_many_gauge_weights` call
+MAX_VOTES: constant(uint256) = 20
+
+# Page size of `gauge_relative_weights`: gauges per call and timestamps per call
+WEIGHT_PAGE: constant(uint256) = 16
+WEIGHT_TIMES: constant(uint256) = 4
+
+# Maximum number of consecutive weeks in a single `gauge_relative_weight_weeks` call
+WEIGHT_WEEKS: constant(uint256) = 16
+
+# Maximum number of users in a single `notifySavingsChanges` call
+MAX_NOTIFY: constant(int128) = 8  # must match LiquidityGaugeV3
+
 
 struct Point:
     bias: uint256
@@ -31,6 +44,7 @@ interface VotingEscrow:
 interface LiquidityGauge:
     def lp_token() -> address: view
     def notifySavingsChange(addr: address): nonpayable
+    def notifySavingsChanges(addrs: address[MAX_NOTIFY]): nonpayable
 
 event CommitOwnership:
     admin: address
@@ -388,6 +402,90 @@ def gauge_relative_weight(addr: address, time: uint256 = block.timestamp) -> uin
     return self._gauge_relative_weight(addr, time)
 
 
+@external
+@view
+def gauge_relative_weight_weeks(addr: address, time: uint256, n_weeks: uint256) -> uint256[WEIGHT_WEEKS]:
+    """
+    @notice Get Gauge relative weights for consecutive weeks, normalized to 1e18
+    @dev Entry `i` is `gauge_relative_weight(addr, time + i * WEEK)`. Only the
+         first `n_weeks` entries are filled, at most `WEIGHT_WEEKS`
+    @param addr Gauge address
+    @param time Timestamp within the first week, in the past or present
+    @param n_weeks Number of weeks to fill
+    @return Relative weights, one per week
+    """
+    weights: uint256[WEIGHT_WEEKS] = empty(uint256[WEIGHT_WEEKS])
+    gauge_type: int128 = -1
+    t: uint256 = time / WEEK * WEEK
+    for i in range(WEIGHT_WEEKS):
+        if i == n_weeks:
+            break
+        _total_weight: uint256 = self.points_total[t]
+        if _total_weight > 0:
+            if gauge_type == -1:
+                gauge_type = self.gauge_types_[addr] - 1
+            weights[i] = MULTIPLIER * self.points_type_weight[gauge_type][t] * self.points_weight[addr][t].bias / _total_weight
+        t += WEEK
+
+    return weights
+
+
+@external
+@view
+def gauge_relative_weights(_start: uint256, _times: uint256[WEIGHT_TIMES]) -> (
+    address[WEIGHT_PAGE],
+    uint256[WEIGHT_TIMES][WEIGHT_PAGE],
+    uint256[WEIGHT_TIMES][WEIGHT_PAGE],
+    uint256[WEIGHT_TIMES][WEIGHT_PAGE],
+    uint256[WEIGHT_TIMES],
+):
+    """
+    @notice Get relative weights for a page of gauges at several timestamps
+    @dev Reads the same stored points as `gauge_relative_weight`, so weeks that
+         were never checkpointed read as zero. Gauges past `n_gauges` are
+         returned as `ZERO_ADDRESS` and the timestamp list ends at the first zero
+    @param _start Index of the first gauge in `gauges`
+    @param _times Timestamps in the past or present
+    @return (gauge addresses,
+             relative weights normalized to 1e18 [gauge][time],
+             gauge weights [gauge][time],
+             type weights of each gauge's type [gauge][time],
+             total weights [time])
+    """
+    gauges: address[WEIGHT_PAGE] = empty(address[WEIGHT_PAGE])
+    relative_weights: uint256[WEIGHT_TIMES][WEIGHT_PAGE] = empty(uint256[WEIGHT_TIMES][WEIGHT_PAGE])
+    gauge_weights: uint256[WEIGHT_TIMES][WEIGHT_PAGE] = empty(uint256[WEIGHT_TIMES][WEIGHT_PAGE])
+    type_weights: uint256[WEIGHT_TIMES][WEIGHT_PAGE] = empty(uint256[WEIGHT_TIMES][WEIGHT_PAGE])
+    totals: uint256[WEIGHT_TIMES] = empty(uint256[WEIGHT_TIMES])
+
+    weeks: uint256[WEIGHT_TIMES] = empty(uint256[WEIGHT_TIMES])
+    n_times: uint256 = 0
+    for j in range(WEIGHT_TIMES):
+        if _times[j] == 0:
+            break
+        weeks[j] = _times[j] / WEEK * WEEK
+        totals[j] = self.points_total[weeks[j]]
+        n_times += 1
+
+    _n_gauges: uint256 = convert(self.n_gauges, uint256)
+    for i in range(WEIGHT_PAGE):
+        if _start + i >= _n_gauges:
+            break
+        addr: address = self.gauges[_start + i]
+        gauge_type: int128 = self.gauge_types_[addr] - 1
+        gauges[i] = addr
+        for j in range(WEIGHT_TIMES):
+            if j == n_times:
+                break
+            t: uint256 = weeks[j]
+            gauge_weights[i][j] = self.points_weight[addr][t].bias
+            type_weights[i][j] = self.points_type_weight[gauge_type][t]
+            if totals[j] > 0:
+                relative_weights[i][j] = MULTIPLIER * type_weights[i][j] * gauge_weights[i][j] / totals[j]
+
+    return gauges, relative_weights, gauge_weights, type_weights, totals
+
+
 @external
 def gauge_relative_weight_write(addr: address, time: uint256 = block.timestamp) -> uint256:
     """
@@ -489,60 +587,63 @@ def change_gauge_weight(addr: address, weight: uint256):
     self._change_gauge_weight(addr, weight)
 
 
-@external
-def vote_for_gauge_weights(_gauge_addr: address, _user_weight: uint256):
-    """
-    @notice Allocate voting power for changing pool weights
-    @param _gauge_addr Gauge which `msg.sender` votes for
-    @param _user_weight Weight for a gauge in bps (units of 0.01%). Minimal is 0.01%. Ignored if 0
+@internal
+def _vote_for_gauge_weights(
+    _user: address,
+    _gauge_addr: address,
+    _user_weight: uint256,
+    _slope: uint256,
+    _lock_end: uint256,
+    _next_time: uint256,
+    _power_used: uint256,
+) -> uint256:
+    """
+    @notice Replace the vote of `_user` for `_gauge_addr` and schedule its slope changes
+    @dev The caller validates the lock, the resulting power and fills `_get_total`
+    @param _user Voting account
+    @param _gauge_addr Gauge which `_user` votes for
+    @param _user_weight Weight for a gauge in bps (units of 0.01%)
+    @param _slope Last user slope in `VotingEscrow`
+    @param _lock_end Lock end of `_user` in `VotingEscrow`
+    @param _next_time Start of the next week
+    @param _power_used Power used by `_user` before this vote
+    @return Power used by `_user` after this vote
     """
-    escrow: address = self.voting_escrow
-    slope: uint256 = convert(VotingEscrow(escrow).get_last_user_slope(msg.sender), uint256)
-    lock_end: uint256 = VotingEscrow(escrow).locked__end(msg.sender)
-    _n_gauges: int128 = self.n_gauges
-    next_time: uint256 = (block.timestamp + WEEK) / WEEK * WEEK
-    assert lock_end > next_time, "Your token lock expires too soon"
     assert (_user_weight >= 0) and (_user_weight <= 10000), "You used all your voting power"
-    # assert block.timestamp >= self.last_user_vote[msg.sender][_gauge_addr] + WEIGHT_VOTE_DELAY, "Cannot vote so often"
+    # assert block.timestamp >= self.last_user_vote[_user][_gauge_addr] + WEIGHT_VOTE_DELAY, "Cannot vote so often"
 
     gauge_type: int128 = self.gauge_types_[_gauge_addr] - 1
     assert gauge_type >= 0, "Gauge not added"
     # Prepare slopes and biases in memory
-    old_slope: VotedSlope = self.vote_user_slopes[msg.sender][_gauge_addr]
+    old_slope: VotedSlope = self.vote_user_slopes[_user][_gauge_addr]
     old_dt: uint256 = 0
-    if old_slope.end > next_time:
-        old_dt = old_slope.end - next_time
+    if old_slope.end > _next_time:
+        old_dt = old_slope.end - _next_time
     old_bias: uint256 = old_slope.slope * old_dt
     new_slope: VotedSlope = VotedSlope({
-        slope: slope * _user_weight / 10000,
-        end: lock_end,
+        slope: _slope * _user_weight / 10000,
+        end: _lock_end,
         power: _user_weight
     })
-    new_dt: uint256 = lock_end - next_time  # dev: raises when expired
+    new_dt: uint256 = _lock_end - _next_time  # dev: raises when expired
     new_bias: uint256 = new_slope.slope * new_dt
 
-    # Check and update powers (weights) used
-    power_used: uint256 = self.vote_user_power[msg.sender]
-    power_used = power_used + new_slope.power - old_slope.power
-    self.vote_user_power[msg.sender] = power_used
-    assert (power_used >= 0) and (power_used <= 10000), 'Used too much power'
-
     ## Remove old and schedule new slope changes
     # Remove slope changes for old slopes
     # Schedule recording of initial slope for next_time
     old_weight_bias: uint256 = self._get_weight(_gauge_addr)
-    old_weight_slope: uint256 = self.points_weight[_gauge_addr][next_time].slope
+    old_weight_slope: uint256 = self.points_weight[_gauge_addr][_next_time].slope
     old_sum_bias: uint256 = self._get_sum(gauge_type)
-    old_sum_slope: uint256 = self.points_sum[gauge_type][next_time].slope
+    old_sum_slope: uint256 = self.points_sum[gauge_type][_next_time].slope
 
-    self.points_weight[_gauge_addr][next_time].bias = max(old_weight_bias + new_bias, old_bias) - old_bias
-    self.points_sum[gauge_type][next_time].bias = max(old_sum_bias + new_bias, old_bias) - old_bias
-    if old_slope.end > next_time:
-        self.points_weight[_gauge_addr][next_time].slope = max(old_weight_slope + new_slope.slope, old_slope.slope) - old_slope.slope
-        self.points_sum[gauge_type][next_time].slope = max(old_sum_slope + new_slope.slope, old_slope.slope) - old_slope.slope
+    self.points_weight[_gauge_addr][_next_time].bias = max(old_weight_bias + new_bias, old_bias) - old_bias
+    self.points_sum[gauge_type][_next_time].bias = max(old_sum_bias + new_bias, old_bias) - old_bias
+    if old_slope.end > _next_time:
+        self.points_weight[_gauge_addr][_next_time].slope = max(old_weight_slope + new_slope.slope, old_slope.slope) - old_slope.slope
+        self.points_sum[gauge_type][_next_time].slope = max(old_sum_slope + new_slope.slope, old_slope.slope) - old_slope.slope
     else:
-        self.points_weight[_gauge_addr][next_time].slope += new_slope.slope
-        self.points_sum[gauge_type][next_time].slope += new_slope.slope
+        self.points_weight[_gauge_addr][_next_time].slope += new_slope.slope
+        self.points_sum[gauge_type][_next_time].slope += new_slope.slope
     if old_slope.end > block.timestamp:
         # Cancel old slope changes if they still didn't happen
         self.changes_weight[_gauge_addr][old_slope.end] -= old_slope.slope
@@ -551,14 +652,66 @@ def vote_for_gauge_weights(_gauge_addr: address, _user_weight: uint256):
     self.changes_weight[_gauge_addr][new_slope.end] += new_slope.slope
     self.changes_sum[gauge_type][new_slope.end] += new_slope.slope
 
+    self.vote_user_slopes[_user][_gauge_addr] = new_slope
+
+    # Record last action time
+    self.last_user_vote[_user][_gauge_addr] = block.timestamp
+
+    log VoteForGauge(block.timestamp, _user, _gauge_addr, _user_weight)
+
+    return _power_used + new_slope.power - old_slope.power
+
+
+@external
+def vote_for_gauge_weights(_gauge_addr: address, _user_weight: uint256):
+    """
+    @notice Allocate voting power for changing pool weights
+    @param _gauge_addr Gauge which `msg.sender` votes for
+    @param _user_weight Weight for a gauge in bps (units of 0.01%). Minimal is 0.01%. Ignored if 0
+    """
+    escrow: address = self.voting_escrow
+    slope: uint256 = convert(VotingEscrow(escrow).get_last_user_slope(msg.sender), uint256)
+    lock_end: uint256 = VotingEscrow(escrow).locked__end(msg.sender)
+    next_time: uint256 = (block.timestamp + WEEK) / WEEK * WEEK
+    assert lock_end > next_time, "Your token lock expires too soon"
+
+    # Check and update powers (weights) used
+    power_used: uint256 = self._vote_for_gauge_weights(
+        msg.sender, _gauge_addr, _user_weight, slope, lock_end, next_time, self.vote_user_power[msg.sender]
+    )
+    assert (power_used >= 0) and (power_used <= 10000), 'Used too much power'
+    self.vote_user_power[msg.sender] = power_used
+
     self._get_total()
 
-    self.vote_user_slopes[msg.sender][_gauge_addr] = new_slope
 
-    # Record last action time
-    self.last_user_vote[msg.sender][_gauge_addr] = block.timestamp
+@external
+def vote_for_many_gauge_weights(_gauge_addrs: address[MAX_VOTES], _user_weights: uint256[MAX_VOTES]):
+    """
+    @notice Allocate voting power across multiple gauges in one call
+    @dev The lock is read once and the used power is only checked after all
+         votes are applied, so weight can move between gauges in any order.
+         The list is terminated by the first `ZERO_ADDRESS`
+    @param _gauge_addrs Gauges which `msg.sender` votes for
+    @param _user_weights Weight for each gauge in bps (units of 0.01%)
+    """
+    escrow: address = self.voting_escrow
+    slope: uint256 = convert(VotingEscrow(escrow).get_last_user_slope(msg.sender), uint256)
+    lock_end: uint256 = VotingEscrow(escrow).locked__end(msg.sender)
+    next_time: uint256 = (block.timestamp + WEEK) / WEEK * WEEK
+    assert lock_end > next_time, "Your token lock expires too soon"
 
-    log VoteForGauge(block.timestamp, msg.sender, _gauge_addr, _user_weight)
+    power_used: uint256 = self.vote_user_power[msg.sender]
+    for i in range(MAX_VOTES):
+        if _gauge_addrs[i] == ZERO_ADDRESS:
+            break
+        power_used = self._vote_for_gauge_weights(
+            msg.sender, _gauge_addrs[i], _user_weights[i], slope, lock_end, next_time, power_used
+        )
+    assert (power_used >= 0) and (power_used <= 10000), 'Used too much power'
+    self.vote_user_power[msg.sender] = power_used
+
+    self._get_total()
 
 
 @external
@@ -614,3 +767,16 @@ def notifySavingsChange(user: address):
     gauge: address = self.gauges_lptoken[msg.sender]
     if gauge != ZERO_ADDRESS:
         LiquidityGauge(gauge).notifySavingsChange(user)
+
+@external
+def notifySavingsChanges(users: address[MAX_NOTIFY]):
+    """
+    @notice Notify gauge the saving balances of several users changed
+    @dev The list ends at the first empty address
+    @param users The user accounts
+    """
+    assert users[0] != ZERO_ADDRESS # dev: invalid parameter
+
+    gauge: address = self.gauges_lptoken[msg.sender]
+    if gauge != ZERO_ADDRESS:
+        LiquidityGauge(gauge).notifySavingsChanges(users)
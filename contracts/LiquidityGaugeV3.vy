@@ -15,9 +15,11 @@ interface RewardPolicyMaker:
     def rate_at(_timestamp: uint256) -> uint256: view
     def epoch_at(_timestamp: uint256) -> uint256: view
     def epoch_start_time(_epoch: uint256) -> uint256: view
+    def epoch_schedule(_timestamp: uint256) -> (uint256[EPOCH_BATCH], uint256[EPOCH_BATCH]): view
 
 interface Controller:
     def gauge_relative_weight(addr: address, time: uint256) -> uint256: view
+    def gauge_relative_weight_weeks(addr: address, time: uint256, n_weeks: uint256) -> uint256[WEIGHT_WEEKS]: view
     def voting_escrow() -> address: view
     def checkpoint(): nonpayable
     def checkpoint_gauge(addr: address): nonpayable
@@ -65,6 +67,10 @@ event PointProportionChanged:
 
 
 MAX_REWARDS: constant(uint256) = 8
+MAX_NOTIFY: constant(int128) = 8
+MAX_KICK: constant(int128) = 8
+EPOCH_BATCH: constant(uint256) = 16  # must match RewardPolicyMaker
+WEIGHT_WEEKS: constant(uint256) = 16  # must match GaugeController
 TOKENLESS_PRODUCTION: constant(uint256) = 40
 WEEK: constant(uint256) = 604800
 CLAIM_FREQUENCY: constant(uint256) = 3600
@@ -101,16 +107,17 @@ integrate_checkpoint_of: public(HashMap[address, uint256])
 integrate_fraction: public(HashMap[address, uint256])
 
 # For tracking rewards
-reward_rate: public(HashMap[address, uint256])
-reward_tokens: public(address[MAX_REWARDS])
-reward_timestamp: public(uint256)
-reward_token_length: public(uint256)
+# [uint128 reward timestamp][uint128 reward token length]
+reward_state: uint256
+
+# reward slot -> [uint96 reward rate][uint160 reward token]
+reward_data: uint256[MAX_REWARDS]
 
 # claimant -> default reward receiver
 rewards_receiver: public(HashMap[address, address])
 
-# reward token -> integral
-reward_integral: public(HashMap[address, uint256])
+# reward slot -> integral
+reward_integrals: uint256[MAX_REWARDS]
 
 # reward token -> claiming address -> integral
 reward_integral_for: public(HashMap[address, HashMap[address, uint256]])
@@ -179,7 +186,7 @@ def integrate_checkpoint() -> uint256:
 
 
 @internal
-def _update_liquidity_limit(addr: address, l: uint256, L: uint256):
+def _update_liquidity_limit(addr: address, l: uint256, L: uint256, voting_total: uint256):
     """
     @notice Calculate limits which depend on the amount of CRV token per-user.
             Effectively it calculates working balances to apply amplification
@@ -187,11 +194,10 @@ def _update_liquidity_limit(addr: address, l: uint256, L: uint256):
     @param addr User address
     @param l User's amount of liquidity (LP tokens)
     @param L Total amount of liquidity (LP tokens)
+    @param voting_total Voting escrow total supply, read once per transaction
     """
     # To be called after totalSupply is updated
-    _voting_escrow: address = self.voting_escrow
-    voting_balance: uint256 = ERC20(_voting_escrow).balanceOf(addr)
-    voting_total: uint256 = ERC20(_voting_escrow).totalSupply()
+    voting_balance: uint256 = ERC20(self.voting_escrow).balanceOf(addr)
 
     lim: uint256 = l * TOKENLESS_PRODUCTION / 100
     if voting_total > 0:
@@ -207,43 +213,47 @@ def _update_liquidity_limit(addr: address, l: uint256, L: uint256):
 
 
 @internal
-def _checkpoint_rewards( _user: address, _claim: bool, _receiver: address):
+def _checkpoint_rewards(
+    _user: address, _claim: bool, _receiver: address, _user_balance: uint256, _working_supply: uint256
+):
     """
     @notice Checkpoint rewards for a user
+    @param _user_balance Working balance of `_user`
+    @param _working_supply Current working supply
     """
+    reward_state: uint256 = self.reward_state
+    token_length: uint256 = reward_state % 2 ** 128
+    if token_length == 0:
+        # nothing to checkpoint, `add_reward_token` starts the reward clock
+        return
+
     # load reward tokens and integrals into memory
     reward_tokens: address[MAX_REWARDS] = empty(address[MAX_REWARDS])
     reward_rate: uint256[MAX_REWARDS] = empty(uint256[MAX_REWARDS])
     reward_integrals: uint256[MAX_REWARDS] = empty(uint256[MAX_REWARDS])
 
-    reward_timestamp: uint256 = self.reward_timestamp
-    if reward_timestamp == 0:
-        reward_timestamp = block.timestamp
-
-    self.reward_timestamp = block.timestamp
+    reward_timestamp: uint256 = shift(reward_state, -128)
+    self.reward_state = shift(block.timestamp, 128) + token_length
 
     for i in range(MAX_REWARDS):
-        token: address = self.reward_tokens[i]
-        if token == ZERO_ADDRESS:
+        if i == token_length:
             break
-        reward_tokens[i] = token
-        reward_rate[i] = self.reward_rate[token]
-        reward_integrals[i] = self.reward_integral[token]
-
-    _working_supply: uint256 = self.working_supply
+        reward_data: uint256 = self.reward_data[i]
+        reward_tokens[i] = convert(convert(reward_data % 2 ** 160, bytes32), address)
+        reward_rate[i] = shift(reward_data, -160)
+        reward_integrals[i] = self.reward_integrals[i]
 
     if _working_supply != 0:
 
         dt: uint256 = block.timestamp - reward_timestamp
         # get balances after claim and calculate new reward integrals
         for i in range(MAX_REWARDS):
-            token: address = reward_tokens[i]
-            if token == ZERO_ADDRESS:
+            if i == token_length:
                 break
             dI: uint256 = 10**18 * reward_rate[i] * dt / _working_supply
             if dI > 0:
                 reward_integrals[i] += dI
-                self.reward_integral[token] = reward_integrals[i]
+                self.reward_integrals[i] = reward_integrals[i]
 
     if _user != ZERO_ADDRESS:
 
@@ -256,18 +266,21 @@ def _checkpoint_rewards( _user: address, _claim: bool, _receiver: address):
                 receiver = _user
 
         # calculate new user reward integral and transfer any owed rewards
-        user_balance: uint256 = self.working_balances[_user]
         for i in range(MAX_REWARDS):
-            token: address = reward_tokens[i]
-            if token == ZERO_ADDRESS:
+            if i == token_length:
                 break
 
+            token: address = reward_tokens[i]
             integral: uint256 = reward_integrals[i]
             integral_for: uint256 = self.reward_integral_for[token][_user]
             new_claimable: uint256 = 0
             if integral_for < integral:
                 self.reward_integral_for[token][_user] = integral
-                new_claimable = user_balance * (integral - integral_for) / 10**18
+                new_claimable = _user_balance * (integral - integral_for) / 10**18
+
+            if not _claim and new_claimable == 0:
+                # nothing to transfer or to add to claim data
+                continue
 
             claim_data: uint256 = self.claim_data[_user][token]
             total_claimable: uint256 = shift(claim_data, -128) + new_claimable
@@ -277,42 +290,64 @@ def _checkpoint_rewards( _user: address, _claim: bool, _receiver: address):
                     ERC20(token).transfer(receiver, total_claimable)
                     # update amount claimed (lower order bytes)
                     self.claim_data[_user][token] = total_claimed + total_claimable
-                elif new_claimable > 0:
+                else:
                     # update total_claimable (higher order bytes)
                     self.claim_data[_user][token] = total_claimed + shift(total_claimable, 128)
 
 
 @internal
-def _checkpoint_dao(addr: address):
+def _checkpoint_dao(addr: address, _working_balance: uint256, _working_supply: uint256, _is_killed: bool):
     """
     @notice Checkpoint interest for a user
     @param addr User address
+    @param _working_balance Working balance of `addr`
+    @param _working_supply Current working supply
+    @param _is_killed Killed status of the gauge
     """
     _period: int128 = self.period
     _period_time: uint256 = self.period_timestamp[_period]
     _integrate_inv_supply: uint256 = self.integrate_inv_supply[_period]
 
-    _epoch: uint256 = RewardPolicyMaker(self.reward_policy_maker).epoch_at(block.timestamp)
+    _reward_policy_maker: address = self.reward_policy_maker
     if _period_time == 0:
-        _period_time = RewardPolicyMaker(self.reward_policy_maker).epoch_start_time(_epoch)
+        _epoch: uint256 = RewardPolicyMaker(_reward_policy_maker).epoch_at(block.timestamp)
+        _period_time = RewardPolicyMaker(_reward_policy_maker).epoch_start_time(_epoch)
 
     # Update integral of 1/supply
-    if block.timestamp > _period_time and not self.is_killed:
-        _working_supply: uint256 = self.working_supply
+    if block.timestamp > _period_time and not _is_killed:
         _controller: address = self.controller
         Controller(_controller).checkpoint_gauge(self)
         prev_week_time: uint256 = _period_time
 
+        # epoch ends and rates are fetched `EPOCH_BATCH` epochs at a time,
+        # relative weights up to `WEIGHT_WEEKS` weeks at a time when catching up
+        epoch_ends: uint256[EPOCH_BATCH] = empty(uint256[EPOCH_BATCH])
+        epoch_rates: uint256[EPOCH_BATCH] = empty(uint256[EPOCH_BATCH])
+        j: uint256 = EPOCH_BATCH
+        weights: uint256[WEIGHT_WEEKS] = empty(uint256[WEIGHT_WEEKS])
+        w_start: uint256 = 0
+        w_end: uint256 = 0
+
         for i in range(500):
-            _epoch = RewardPolicyMaker(self.reward_policy_maker).epoch_at(prev_week_time)
-            week_time: uint256 = RewardPolicyMaker(self.reward_policy_maker).epoch_start_time(_epoch + 1)
-            week_time = min(week_time, block.timestamp)
+            if j == EPOCH_BATCH:
+                epoch_ends, epoch_rates = RewardPolicyMaker(_reward_policy_maker).epoch_schedule(prev_week_time)
+                j = 0
+            week_time: uint256 = min(epoch_ends[j], block.timestamp)
 
             dt: uint256 = week_time - prev_week_time
-            w: uint256 = Controller(_controller).gauge_relative_weight(self, prev_week_time / WEEK * WEEK)
+            w_week: uint256 = prev_week_time / WEEK * WEEK
+            if w_week >= w_end:
+                n_weeks: uint256 = min(block.timestamp / WEEK - w_week / WEEK + 1, WEIGHT_WEEKS)
+                if n_weeks == 1:
+                    weights[0] = Controller(_controller).gauge_relative_weight(self, w_week)
+                else:
+                    weights = Controller(_controller).gauge_relative_weight_weeks(self, w_week, n_weeks)
+                w_start = w_week
+                w_end = w_week + n_weeks * WEEK
+            w: uint256 = weights[(w_week - w_start) / WEEK]
 
             if _working_supply > 0:
-                _integrate_inv_supply += RewardPolicyMaker(self.reward_policy_maker).rate_at(prev_week_time) * w * dt / _working_supply
+                _integrate_inv_supply += epoch_rates[j] * w * dt / _working_supply
                 # On precisions of the calculation
                 # rate ~= 10e18
                 # last_weight > 0.01 * 1e18 = 1e16 (if pool weight is 1%)
@@ -323,24 +358,30 @@ def _checkpoint_dao(addr: address):
             if week_time == block.timestamp:
                 break
             prev_week_time = week_time
+            j += 1
 
-    _period += 1
-    self.period = _period
-    self.period_timestamp[_period] = block.timestamp
-    self.integrate_inv_supply[_period] = _integrate_inv_supply
+    # a second checkpoint in the same block leaves the integral unchanged
+    if _period_time != block.timestamp:
+        _period += 1
+        self.period = _period
+        self.period_timestamp[_period] = block.timestamp
+        self.integrate_inv_supply[_period] = _integrate_inv_supply
 
     if addr != ZERO_ADDRESS:
         # Update user-specific integrals
-        _working_balance: uint256 = self.working_balances[addr]
         self.integrate_fraction[addr] += _working_balance * (_integrate_inv_supply - self.integrate_inv_supply_of[addr]) / 10 ** 18
         self.integrate_inv_supply_of[addr] = _integrate_inv_supply
         self.integrate_checkpoint_of[addr] = block.timestamp
 
 @internal
-def _checkpoint(addr: address):
+def _checkpoint_point(addr: address, _is_killed: bool) -> uint256:
     """
-    @notice Checkpoint for a user
+    @notice Checkpoint points for a user
+    @dev The accrued amount is not added to `point_integrate_fraction` and
+         `totalSupply` here, so callers can write both slots once
     @param addr User address
+    @param _is_killed Killed status of the gauge
+    @return Point amount accrued by `addr` since its last checkpoint
     """
     _point_period: int128 = self.point_period
     _point_period_timestamp: uint256 = self.point_period_timestamp[_point_period]
@@ -359,7 +400,7 @@ def _checkpoint(addr: address):
         self.point_rate = new_rate
 
     # Update integral of 1/supply
-    if block.timestamp > _point_period_timestamp and not self.is_killed:
+    if block.timestamp > _point_period_timestamp and not _is_killed:
         prev_week_time: uint256 = _point_period_timestamp
         week_time: uint256 = min((_point_period_timestamp + WEEK) / WEEK * WEEK, block.timestamp)
 
@@ -387,19 +428,90 @@ def _checkpoint(addr: address):
             prev_week_time = week_time
             week_time = min(week_time + WEEK, block.timestamp)
 
-    _point_period += 1
-    self.point_period = _point_period
-    self.point_period_timestamp[_point_period] = block.timestamp
-    self.point_integrate_inv_supply[_point_period] = _point_integrate_inv_supply
+    if _point_period_timestamp != block.timestamp:
+        _point_period += 1
+        self.point_period = _point_period
+        self.point_period_timestamp[_point_period] = block.timestamp
+        self.point_integrate_inv_supply[_point_period] = _point_integrate_inv_supply
 
-    if addr != ZERO_ADDRESS:
-        # Update user-specific integrals
-        _balance: uint256 = self.lpBalanceOf[addr]
-        _user_integrate_amount: uint256 = _balance * (_point_integrate_inv_supply - self.point_integrate_inv_supply_of[addr]) / 10 ** 18
-        self.totalSupply += _user_integrate_amount
-        self.point_integrate_fraction[addr] += _user_integrate_amount
-        self.point_integrate_inv_supply_of[addr] = _point_integrate_inv_supply
-        self.point_integrate_checkpoint_of[addr] = block.timestamp
+    if addr == ZERO_ADDRESS:
+        return 0
+
+    # Update user-specific integrals
+    _balance: uint256 = self.lpBalanceOf[addr]
+    _user_integrate_amount: uint256 = _balance * (_point_integrate_inv_supply - self.point_integrate_inv_supply_of[addr]) / 10 ** 18
+    self.point_integrate_inv_supply_of[addr] = _point_integrate_inv_supply
+    self.point_integrate_checkpoint_of[addr] = block.timestamp
+    return _user_integrate_amount
+
+
+@internal
+def _checkpoint(addr: address, _rewards: bool, _claim: bool, _receiver: address) -> uint256:
+    """
+    @notice Checkpoint points, FYO and optionally rewards for a user
+    @dev Killed status, working balance and working supply are read once and
+         shared by the three integrals
+    @param addr User address
+    @param _rewards Whether to checkpoint reward tokens
+    @param _claim Whether to claim the rewards, see `_checkpoint_rewards`
+    @param _receiver Reward receiver, see `_checkpoint_rewards`
+    @return Point amount accrued by `addr`, to be added to
+            `point_integrate_fraction` and `totalSupply` by the caller
+    """
+    _is_killed: bool = self.is_killed
+    _working_balance: uint256 = self.working_balances[addr]
+    _working_supply: uint256 = self.working_supply
+
+    _point_amount: uint256 = self._checkpoint_point(addr, _is_killed)
+    self._checkpoint_dao(addr, _working_balance, _working_supply, _is_killed)
+    if _rewards:
+        self._checkpoint_rewards(addr, _claim, _receiver, _working_balance, _working_supply)
+
+    return _point_amount
+
+
+@internal
+def _checkpoint_user(addr: address, _rewards: bool) -> uint256:
+    """
+    @notice Checkpoint points, FYO and optionally rewards for a user, against
+            integrals already checkpointed in this block
+    @dev Same as `_checkpoint` after a checkpoint at `block.timestamp`, which
+         leaves the integrals unchanged, but without reading the gauge state
+         needed to advance them
+    @param addr User address
+    @param _rewards Whether to checkpoint reward tokens
+    @return Point amount accrued by `addr`, see `_checkpoint`
+    """
+    _working_balance: uint256 = self.working_balances[addr]
+
+    _point_integrate_inv_supply: uint256 = self.point_integrate_inv_supply[self.point_period]
+    _point_amount: uint256 = self.lpBalanceOf[addr] * (_point_integrate_inv_supply - self.point_integrate_inv_supply_of[addr]) / 10 ** 18
+    self.point_integrate_inv_supply_of[addr] = _point_integrate_inv_supply
+    self.point_integrate_checkpoint_of[addr] = block.timestamp
+
+    _integrate_inv_supply: uint256 = self.integrate_inv_supply[self.period]
+    self.integrate_fraction[addr] += _working_balance * (_integrate_inv_supply - self.integrate_inv_supply_of[addr]) / 10 ** 18
+    self.integrate_inv_supply_of[addr] = _integrate_inv_supply
+    self.integrate_checkpoint_of[addr] = block.timestamp
+
+    if _rewards:
+        self._checkpoint_rewards(addr, False, ZERO_ADDRESS, _working_balance, self.working_supply)
+
+    return _point_amount
+
+
+@internal
+def _add_points(addr: address, _amount: uint256) -> uint256:
+    """
+    @notice Credit accrued points to a user
+    @return New point balance of `addr`
+    """
+    _point_fraction: uint256 = self.point_integrate_fraction[addr]
+    if _amount != 0:
+        _point_fraction += _amount
+        self.point_integrate_fraction[addr] = _point_fraction
+        self.totalSupply += _amount
+    return self.lpBalanceOf[addr] + _point_fraction
 
 @view
 @internal
@@ -414,10 +526,10 @@ def user_checkpoint(addr: address) -> bool:
     @return bool success
     """
     assert (msg.sender == addr) or (msg.sender == self.minter)  # dev: unauthorized
-    self._checkpoint(addr)
-    self._checkpoint_dao(addr)
-    self._checkpoint_rewards(addr, False, ZERO_ADDRESS)
-    self._update_liquidity_limit(addr, self._balance_of(addr), self.totalSupply)
+    _point_amount: uint256 = self._checkpoint(addr, True, False, ZERO_ADDRESS)
+    self._update_liquidity_limit(
+        addr, self._add_points(addr, _point_amount), self.totalSupply, ERC20(self.voting_escrow).totalSupply()
+    )
     return True
 
 
@@ -428,12 +540,85 @@ def claimable_tokens(addr: address) -> uint256:
     @dev This function should be manually changed to "view" in the ABI
     @return uint256 number of claimable tokens per user
     """
-    self._checkpoint(addr)
-    self._checkpoint_dao(addr)
+    self._add_points(addr, self._checkpoint(addr, False, False, ZERO_ADDRESS))
     return self.integrate_fraction[addr] - Minter(self.minter).minted(addr, self)
 
 
 
+@view
+@internal
+def _reward_slot(_reward_token: address) -> uint256:
+    """
+    @notice Get the slot of a reward token
+    @return Slot index, `MAX_REWARDS` if `_reward_token` is not added
+    """
+    token_length: uint256 = self.reward_state % 2 ** 128
+    for i in range(MAX_REWARDS):
+        if i == token_length:
+            break
+        if self.reward_data[i] % 2 ** 160 == convert(_reward_token, uint256):
+            return i
+
+    return MAX_REWARDS
+
+
+@view
+@external
+def reward_tokens(_index: uint256) -> address:
+    """
+    @notice Get the reward token in slot `_index`
+    @param _index Slot index
+    @return address Reward token, ZERO_ADDRESS for an empty slot
+    """
+    return convert(convert(self.reward_data[_index] % 2 ** 160, bytes32), address)
+
+
+@view
+@external
+def reward_rate(_reward_token: address) -> uint256:
+    """
+    @notice Get the reward rate of a reward token
+    @param _reward_token Reward token address
+    @return uint256 Reward tokens per second, 0 if not added
+    """
+    slot: uint256 = self._reward_slot(_reward_token)
+    if slot == MAX_REWARDS:
+        return 0
+    return shift(self.reward_data[slot], -160)
+
+
+@view
+@external
+def reward_integral(_reward_token: address) -> uint256:
+    """
+    @notice Get the reward integral of a reward token
+    @param _reward_token Reward token address
+    @return uint256 1e18 * ∫(rate / working_supply dt), 0 if not added
+    """
+    slot: uint256 = self._reward_slot(_reward_token)
+    if slot == MAX_REWARDS:
+        return 0
+    return self.reward_integrals[slot]
+
+
+@view
+@external
+def reward_timestamp() -> uint256:
+    """
+    @notice Get the time of the last reward checkpoint
+    """
+    return shift(self.reward_state, -128)
+
+
+@view
+@external
+def reward_token_length() -> uint256:
+    """
+    @notice Get the number of reward tokens
+    """
+    return self.reward_state % 2 ** 128
+
+
 @view
 @external
 def claimed_reward(_addr: address, _token: address) -> uint256:
@@ -472,8 +657,8 @@ def claimable_reward_write(_addr: address, _token: address) -> uint256:
     @param _token Token to get reward amount for
     @return uint256 Claimable reward token amount
     """
-    if self.reward_tokens[0] != ZERO_ADDRESS:
-        self._checkpoint_rewards(_addr, False, ZERO_ADDRESS)
+    if self.reward_state % 2 ** 128 != 0:
+        self._checkpoint_rewards(_addr, False, ZERO_ADDRESS, self.working_balances[_addr], self.working_supply)
     return shift(self.claim_data[_addr][_token], -128)
 
 
@@ -499,12 +684,12 @@ def claim_rewards(_addr: address = msg.sender, _receiver: address = ZERO_ADDRESS
     """
     if _receiver != ZERO_ADDRESS:
         assert _addr == msg.sender  # dev: cannot redirect when claiming for another user
-    self._checkpoint_rewards(_addr, True, _receiver)
+    _point_amount: uint256 = self._checkpoint(_addr, True, True, _receiver)
 
     # update user's point amount and working balance
-    self._checkpoint_dao(_addr)
-    self._checkpoint(_addr)
-    self._update_liquidity_limit(_addr, self._balance_of(_addr), self.totalSupply)
+    self._update_liquidity_limit(
+        _addr, self._add_points(_addr, _point_amount), self.totalSupply, ERC20(self.voting_escrow).totalSupply()
+    )
 
 
 @external
@@ -524,68 +709,103 @@ def kick(addr: address):
     assert ERC20(_voting_escrow).balanceOf(addr) == 0 or t_ve > t_last # dev: kick not allowed
     assert self.working_balances[addr] > _balance * TOKENLESS_PRODUCTION / 100  # dev: kick not needed
 
-    self._checkpoint(addr)
-    self._checkpoint_dao(addr)
-    self._update_liquidity_limit(addr, self._balance_of(addr), self.totalSupply)
+    _point_amount: uint256 = self._checkpoint(addr, False, False, ZERO_ADDRESS)
+    self._update_liquidity_limit(
+        addr, self._add_points(addr, _point_amount), self.totalSupply, ERC20(_voting_escrow).totalSupply()
+    )
+
+
+@external
+def kick_many(addrs: address[MAX_KICK]):
+    """
+    @notice Kick several addresses for abusing their boost
+    @dev The gauge is checkpointed and the voting escrow total supply read
+         once, then each address is kicked against them. Every address must
+         be kickable, see `kick`. The list ends at the first empty address.
+    @param addrs Addresses to kick
+    """
+    _voting_escrow: address = self.voting_escrow
+    _is_killed: bool = self.is_killed
+    self._checkpoint_point(ZERO_ADDRESS, _is_killed)
+    self._checkpoint_dao(ZERO_ADDRESS, 0, self.working_supply, _is_killed)
+
+    voting_total: uint256 = ERC20(_voting_escrow).totalSupply()
+    for addr in addrs:
+        if addr == ZERO_ADDRESS:
+            break
+        t_last: uint256 = self.integrate_checkpoint_of[addr]
+        t_ve: uint256 = VotingEscrow(_voting_escrow).user_point_history__ts(
+            addr, VotingEscrow(_voting_escrow).user_point_epoch(addr)
+        )
+        _balance: uint256 = self.lpBalanceOf[addr]
+
+        assert ERC20(_voting_escrow).balanceOf(addr) == 0 or t_ve > t_last # dev: kick not allowed
+        assert self.working_balances[addr] > _balance * TOKENLESS_PRODUCTION / 100  # dev: kick not needed
+
+        _point_amount: uint256 = self._checkpoint_user(addr, False)
+        self._update_liquidity_limit(addr, self._add_points(addr, _point_amount), self.totalSupply, voting_total)
 
 
 @internal
-def deposit(_value: uint256, _addr: address):
+def deposit(_value: uint256, _addr: address, _point_amount: uint256, _voting_total: uint256):
     """
     @notice Deposit `_value` LP tokens
     @dev Depositting also claims pending reward tokens
     @param _value Number of tokens to deposit
     @param _addr Address to deposit for
+    @param _point_amount Point amount accrued by `_addr`, from its checkpoint
+    @param _voting_total Voting escrow total supply, unused if `_value` is zero
     """
-
-    self._checkpoint(_addr)
-    self._checkpoint_dao(_addr)
-
     if _value != 0:
-        total_supply: uint256 = self.totalSupply
-        self._checkpoint_rewards(_addr, False, ZERO_ADDRESS)
+        total_supply: uint256 = self.totalSupply + _point_amount + _value
+        new_integrate_fraction: uint256 = self.point_integrate_fraction[_addr] + _point_amount
+        if _point_amount != 0:
+            self.point_integrate_fraction[_addr] = new_integrate_fraction
 
-        total_supply += _value
         new_balance: uint256 = self.lpBalanceOf[_addr] + _value
         self.lpBalanceOf[_addr] = new_balance
         self.totalSupply = total_supply
         self.lpTotalSupply += _value
 
-        self._update_liquidity_limit(_addr, new_balance + self.point_integrate_fraction[_addr], total_supply)
+        self._update_liquidity_limit(_addr, new_balance + new_integrate_fraction, total_supply, _voting_total)
+    else:
+        self._add_points(_addr, _point_amount)
 
     log Deposit(_addr, _value)
 
 
 @internal
-def withdraw(_value: uint256, _addr: address):
+def withdraw(_value: uint256, _addr: address, _point_amount: uint256, _voting_total: uint256):
     """
     @notice Withdraw `_value` LP tokens
     @dev Withdrawing also claims pending reward tokens
     @param _value Number of tokens to withdraw
+    @param _addr Address to withdraw for
+    @param _point_amount Point amount accrued by `_addr`, from its checkpoint
+    @param _voting_total Voting escrow total supply, unused if `_value` is zero
     """
-    self._checkpoint(_addr)
-    self._checkpoint_dao(_addr)
-
     if _value != 0:
-        total_supply: uint256 = self.totalSupply
-        self._checkpoint_rewards(_addr, False, ZERO_ADDRESS)
+        total_supply: uint256 = self.totalSupply + _point_amount
+        old_balance: uint256 = self.lpBalanceOf[_addr]
 
         # When user withdraws token, the points will be reduced in proportion to the withdrawal
-        old_integrate_fraction: uint256 = self.point_integrate_fraction[_addr]
+        old_integrate_fraction: uint256 = self.point_integrate_fraction[_addr] + _point_amount
         new_integrate_fraction: uint256 = 0
         if old_integrate_fraction > 0:
-            point_decrease: uint256 = old_integrate_fraction * _value / self.lpBalanceOf[_addr]
+            point_decrease: uint256 = old_integrate_fraction * _value / old_balance
             total_supply -= point_decrease
             new_integrate_fraction = old_integrate_fraction - point_decrease
             self.point_integrate_fraction[_addr] = new_integrate_fraction
 
         total_supply -= _value
-        new_balance: uint256 = self.lpBalanceOf[_addr] - _value
+        new_balance: uint256 = old_balance - _value
         self.lpBalanceOf[_addr] = new_balance
         self.totalSupply = total_supply
         self.lpTotalSupply -= _value
 
-        self._update_liquidity_limit(_addr, new_balance + new_integrate_fraction, total_supply)
+        self._update_liquidity_limit(_addr, new_balance + new_integrate_fraction, total_supply, _voting_total)
+    else:
+        self._add_points(_addr, _point_amount)
 
     log Withdraw(_addr, _value)
 
@@ -602,11 +822,7 @@ def balanceOf(_addr: address) -> uint256:
 @view
 @internal
 def _is_reward_token_exist(_reward_token: address) -> bool:
-    for i in range(MAX_REWARDS):
-        if self.reward_tokens[i] == _reward_token:
-            return True
-
-    return False
+    return self._reward_slot(_reward_token) != MAX_REWARDS
 
 @view
 @external
@@ -628,16 +844,15 @@ def add_reward_token(_reward_token: address, _token_per_second: uint256):
     assert msg.sender == self.admin  # dev: admin only
     assert not self._is_reward_token_exist(_reward_token) # dev: the reward token is added
 
-    token_length: uint256 = self.reward_token_length
+    token_length: uint256 = self.reward_state % 2 ** 128
     assert (_reward_token != ZERO_ADDRESS and token_length < MAX_REWARDS) # dev: reward token is zero or exceed max length
+    assert _token_per_second < 2 ** 96  # dev: reward rate too high
 
-    self._checkpoint_rewards(ZERO_ADDRESS, False, ZERO_ADDRESS)
-
-    self.reward_tokens[token_length] = _reward_token
-    self.reward_rate[_reward_token] = _token_per_second
-    token_length += 1
-    self.reward_token_length = token_length
+    self._checkpoint_rewards(ZERO_ADDRESS, False, ZERO_ADDRESS, 0, self.working_supply)
 
+    self.reward_data[token_length] = shift(_token_per_second, 160) + convert(_reward_token, uint256)
+    # also sets the reward timestamp when adding the first token
+    self.reward_state = shift(block.timestamp, 128) + token_length + 1
 
     log RewardTokenAdded(_reward_token, _token_per_second)
 
@@ -649,11 +864,13 @@ def set_reward_rate(_reward_token: address, _token_per_second: uint256):
     @param _token_per_second Reward rate in second
     """
     assert msg.sender == self.admin  # dev: admin only
-    assert self._is_reward_token_exist(_reward_token) # dev: the reward token must be added
+    slot: uint256 = self._reward_slot(_reward_token)
+    assert slot != MAX_REWARDS # dev: the reward token must be added
+    assert _token_per_second < 2 ** 96  # dev: reward rate too high
 
-    self._checkpoint_rewards(ZERO_ADDRESS, False, ZERO_ADDRESS)
+    self._checkpoint_rewards(ZERO_ADDRESS, False, ZERO_ADDRESS, 0, self.working_supply)
 
-    self.reward_rate[_reward_token] = _token_per_second
+    self.reward_data[slot] = shift(_token_per_second, 160) + convert(_reward_token, uint256)
 
     log RewardRateChanged(_reward_token, _token_per_second)
 
@@ -700,10 +917,44 @@ def notifySavingsChange(addr: address):
     """
     old_balance: uint256 = self.lpBalanceOf[addr]
     new_balance: uint256 = CErc20(self.lp_token).balanceOf(addr)
+    _point_amount: uint256 = self._checkpoint(addr, old_balance != new_balance, False, ZERO_ADDRESS)
+    voting_total: uint256 = 0
+    if old_balance != new_balance:
+        voting_total = ERC20(self.voting_escrow).totalSupply()
     if old_balance < new_balance:
-        self.deposit(new_balance - old_balance, addr)
+        self.deposit(new_balance - old_balance, addr, _point_amount, voting_total)
     else:
-        self.withdraw(old_balance - new_balance, addr)
+        self.withdraw(old_balance - new_balance, addr, _point_amount, voting_total)
+
+
+@external
+@nonreentrant('lock')
+def notifySavingsChanges(addrs: address[MAX_NOTIFY]):
+    """
+    @notice Notify the saving balances of several addresses changed
+    @dev The gauge is checkpointed and the voting escrow total supply read
+         once, then each address is checkpointed against them. The list ends
+         at the first empty address.
+    @param addrs Addresses whose saving balance changed
+    """
+    _is_killed: bool = self.is_killed
+    _working_supply: uint256 = self.working_supply
+    self._checkpoint_point(ZERO_ADDRESS, _is_killed)
+    self._checkpoint_dao(ZERO_ADDRESS, 0, _working_supply, _is_killed)
+    self._checkpoint_rewards(ZERO_ADDRESS, False, ZERO_ADDRESS, 0, _working_supply)
+
+    _lp_token: address = self.lp_token
+    voting_total: uint256 = ERC20(self.voting_escrow).totalSupply()
+    for addr in addrs:
+        if addr == ZERO_ADDRESS:
+            break
+        old_balance: uint256 = self.lpBalanceOf[addr]
+        new_balance: uint256 = CErc20(_lp_token).balanceOf(addr)
+        _point_amount: uint256 = self._checkpoint_user(addr, old_balance != new_balance)
+        if old_balance < new_balance:
+            self.deposit(new_balance - old_balance, addr, _point_amount, voting_total)
+        else:
+            self.withdraw(old_balance - new_balance, addr, _point_amount, voting_total)
 
 
 @external
@@ -713,7 +964,7 @@ def set_point_proportion(_point_proportion: uint256):
     """
     assert msg.sender == self.admin  # dev: admin only
 
-    self._checkpoint(ZERO_ADDRESS)
+    self._checkpoint_point(ZERO_ADDRESS, self.is_killed)
     self.point_proportion = _point_proportion
 
     log PointProportionChanged(_point_proportion)
@@ -728,5 +979,4 @@ def balance_of_write(_addr: address) -> uint256:
     @param _addr Account to get point amount for
     @return uint256 Point amount
     """
-    self._checkpoint(_addr)
-    return self._balance_of(_addr)
+    return self._add_points(_addr, self._checkpoint_point(_addr, self.is_killed))
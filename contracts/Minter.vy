@@ -22,6 +22,13 @@ event Minted:
     gauge: address
     minted: uint256
 
+event MintedBatch:
+    recipient: indexed(address)
+    n_gauges: uint256
+    amount: uint256
+
+
+MAX_BATCH: constant(int128) = 32
 
 treasury: public(address)
 controller: public(address)
@@ -40,7 +47,7 @@ def __init__(_treasury: address, _controller: address):
 
 
 @internal
-def _mint_for(gauge_addr: address, _for: address):
+def _update_minted(gauge_addr: address, _for: address) -> uint256:
     assert GaugeController(self.controller).gauge_types(gauge_addr) >= 0  # dev: gauge is not added
 
     LiquidityGauge(gauge_addr).user_checkpoint(_for)
@@ -48,10 +55,19 @@ def _mint_for(gauge_addr: address, _for: address):
     to_mint: uint256 = total_mint - self.minted[_for][gauge_addr]
 
     if to_mint != 0:
-        MERC20(self.treasury).mint(_for, to_mint)
         self.minted[_for][gauge_addr] = total_mint
 
-        log Minted(_for, gauge_addr, total_mint)
+    return to_mint
+
+
+@internal
+def _mint_for(gauge_addr: address, _for: address):
+    to_mint: uint256 = self._update_minted(gauge_addr, _for)
+
+    if to_mint != 0:
+        MERC20(self.treasury).mint(_for, to_mint)
+
+        log Minted(_for, gauge_addr, self.minted[_for][gauge_addr])
 
 
 @external
@@ -77,6 +93,35 @@ def mint_many(gauge_addrs: address[8]):
         self._mint_for(gauge_addrs[i], msg.sender)
 
 
+@external
+@nonreentrant('lock')
+def mint_batch(gauge_addrs: address[MAX_BATCH]):
+    """
+    @notice Mint everything which belongs to `msg.sender` across up to 32 gauges
+    @dev The amounts of all gauges are summed and sent with one treasury
+         transfer, logged as a single `MintedBatch`. Each gauge with a
+         non-zero amount still logs its own `Minted`. The list ends at the
+         first empty address.
+    @param gauge_addrs List of `LiquidityGauge` addresses
+    """
+    total: uint256 = 0
+    n_gauges: uint256 = 0
+    for i in range(MAX_BATCH):
+        gauge_addr: address = gauge_addrs[i]
+        if gauge_addr == ZERO_ADDRESS:
+            break
+        to_mint: uint256 = self._update_minted(gauge_addr, msg.sender)
+        if to_mint != 0:
+            total += to_mint
+            log Minted(msg.sender, gauge_addr, self.minted[msg.sender][gauge_addr])
+        n_gauges += 1
+
+    if total != 0:
+        MERC20(self.treasury).mint(msg.sender, total)
+
+        log MintedBatch(msg.sender, n_gauges, total)
+
+
 @external
 @nonreentrant('lock')
 def mint_for(gauge_addr: address, _for: address):
@@ -18,6 +18,9 @@ interface LiquidityGauge:
     def claim_rewards(_addr: address): nonpayable
 
 
+MAX_PAIRS: constant(int128) = 100
+MAX_CHECKED: constant(int128) = 32
+
 controller: public(address)
 minter: public(address)
 
@@ -45,3 +48,42 @@ def claim_rewards_for(_addr: address, _gauges: address[10]):
             LiquidityGauge(gauge).claim_rewards(_addr)
 
 
+@external
+def claim_rewards_for_many(_addrs: address[MAX_PAIRS], _gauges: address[MAX_PAIRS]):
+    """
+    @notice Claim available reward tokens for many (address, gauge) pairs
+    @dev Each gauge is checked in the controller once per call. The list of
+         pairs ends at the first empty address in `_addrs`.
+    @param _addrs Addresses to claim for
+    @param _gauges Gauge addresses to claim rewards, one for each address
+    """
+    controller: address = self.controller
+    minter: address = self.minter
+    checked: address[MAX_CHECKED] = empty(address[MAX_CHECKED])
+    n_checked: int128 = 0
+
+    for i in range(MAX_PAIRS):
+        addr: address = _addrs[i]
+        if addr == ZERO_ADDRESS:
+            break
+        gauge: address = _gauges[i]
+        if gauge == ZERO_ADDRESS:
+            continue
+
+        is_checked: bool = False
+        for j in range(MAX_CHECKED):
+            if j == n_checked:
+                break
+            if checked[j] == gauge:
+                is_checked = True
+                break
+
+        if not is_checked:
+            # check gauge is added
+            assert Controller(controller).gauge_types(gauge) >= 0  # dev: gauge is not added
+            if n_checked < MAX_CHECKED:
+                checked[n_checked] = gauge
+                n_checked += 1
+
+        Minter(minter).mint_for(gauge, addr)
+        LiquidityGauge(gauge).claim_rewards(addr)
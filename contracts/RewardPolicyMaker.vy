@@ -14,6 +14,9 @@ from vyper.interfaces import ERC20
 event SetAdmin:
     admin: address
 
+
+EPOCH_BATCH: constant(uint256) = 16
+
 admin: public(address)
 
 first_epoch_time: public(uint256)
@@ -100,6 +103,37 @@ def rate_at(_timestamp: uint256) -> uint256:
     return self.rewards[self._epoch_at(_timestamp)] / self.epoch_length
 
 
+@external
+@view
+def epoch_schedule(_timestamp: uint256) -> (uint256[EPOCH_BATCH], uint256[EPOCH_BATCH]):
+    """
+    @notice Get the next `EPOCH_BATCH` epoch boundaries and emission rates
+            starting from a timestamp
+    @dev Segment 0 runs from `_timestamp` to `ends[0]`, segment i from
+         `ends[i - 1]` to `ends[i]`. `rates[i]` is `rate_at` the start of
+         segment i, so one call replaces `EPOCH_BATCH` rounds of
+         `epoch_at`, `epoch_start_time` and `rate_at`
+    @param _timestamp Start of the range
+    @return (epoch end times, reward rates)
+    """
+    ends: uint256[EPOCH_BATCH] = empty(uint256[EPOCH_BATCH])
+    rates: uint256[EPOCH_BATCH] = empty(uint256[EPOCH_BATCH])
+
+    first_epoch_time: uint256 = self.first_epoch_time
+    epoch_length: uint256 = self.epoch_length
+    epoch: uint256 = self._epoch_at(_timestamp)
+
+    if _timestamp >= first_epoch_time:
+        rates[0] = self.rewards[epoch] / epoch_length
+    for i in range(EPOCH_BATCH):
+        epoch += 1
+        ends[i] = first_epoch_time + epoch * epoch_length
+        if i < EPOCH_BATCH - 1:
+            rates[i + 1] = self.rewards[epoch] / epoch_length
+
+    return ends, rates
+
+
 @external
 @view
 def current_epoch() -> uint256:
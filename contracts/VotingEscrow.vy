@@ -98,6 +98,7 @@ point_history: public(Point[100000000000000000000000000000])  # epoch -> unsigne
 user_point_history: public(HashMap[address, Point[1000000000]])  # user -> Point[user_epoch]
 user_point_epoch: public(HashMap[address, uint256])
 slope_changes: public(HashMap[uint256, int128])  # time -> signed slope change
+week_epoch: public(HashMap[uint256, uint256])  # week start time -> epoch of the point recorded at it
 
 # Aragon's view methods for compatibility
 controller: public(address)
@@ -305,9 +306,12 @@ def _checkpoint(addr: address, old_locked: LockedBalance, new_locked: LockedBala
         _epoch += 1
         if t_i == block.timestamp:
             last_point.blk = block.number
+            if t_i % WEEK == 0:
+                self.week_epoch[t_i] = _epoch
             break
         else:
             self.point_history[_epoch] = last_point
+            self.week_epoch[t_i] = _epoch
 
     self.epoch = _epoch
     # Now point_history is filled until t=now
@@ -598,6 +602,36 @@ def balanceOfAt(addr: address, _block: uint256) -> uint256:
         return 0
 
 
+@internal
+@view
+def find_timestamp_epoch(_t: uint256, max_epoch: uint256) -> uint256:
+    """
+    @notice Find the latest global epoch recorded at or before a timestamp
+    @dev `week_epoch` narrows the search down to the points of one week
+    @param _t Timestamp to find
+    @param max_epoch Don't go beyond this epoch
+    @return Epoch number
+    """
+    week: uint256 = _t / WEEK * WEEK
+    _min: uint256 = self.week_epoch[week]
+    _max: uint256 = max_epoch
+    next_epoch: uint256 = self.week_epoch[week + WEEK]
+    if next_epoch != 0:
+        # the point at the next week boundary is already after `_t`
+        _max = next_epoch - 1
+
+    # Binary search
+    for i in range(128):  # Will be always enough for 128-bit numbers
+        if _min >= _max:
+            break
+        _mid: uint256 = (_min + _max + 1) / 2
+        if self.point_history[_mid].ts <= _t:
+            _min = _mid
+        else:
+            _max = _mid - 1
+    return _min
+
+
 @internal
 @view
 def supply_at(point: Point, t: uint256) -> uint256:
@@ -632,11 +666,19 @@ def supply_at(point: Point, t: uint256) -> uint256:
 def totalSupply(t: uint256 = block.timestamp) -> uint256:
     """
     @notice Calculate total voting power
-    @dev Adheres to the ERC20 `totalSupply` interface for Aragon compatibility
+    @dev Adheres to the ERC20 `totalSupply` interface for Aragon compatibility.
+         Times before the last checkpoint start from the latest point at or
+         before `t`, so past queries never walk more than one week. Later
+         times walk `slope_changes` weekly from the last checkpoint
     @return Total voting power
     """
     _epoch: uint256 = self.epoch
     last_point: Point = self.point_history[_epoch]
+    if t < last_point.ts:
+        if t < self.point_history[0].ts:
+            # nothing was locked before the deployment
+            return 0
+        last_point = self.point_history[self.find_timestamp_epoch(t, _epoch)]
     return self.supply_at(last_point, t)
 
 
@@ -8,8 +8,11 @@ from vyper.interfaces import ERC20
 
 implements: ERC20
 
+MAX_NOTIFY: constant(int128) = 8  # must match LiquidityGaugeV3
+
 interface LiquidityGauge:
     def notifySavingsChange(addr: address):  nonpayable
+    def notifySavingsChanges(addrs: address[MAX_NOTIFY]):  nonpayable
 
 event Transfer:
     _from: indexed(address)
@@ -127,8 +130,10 @@ def transfer(_to : address, _value : uint256) -> bool:
     log Transfer(msg.sender, _to, _value)
 
     if self.gauge != ZERO_ADDRESS:
-        LiquidityGauge(self.gauge).notifySavingsChange(msg.sender)
-        LiquidityGauge(self.gauge).notifySavingsChange(_to)
+        users: address[MAX_NOTIFY] = empty(address[MAX_NOTIFY])
+        users[0] = msg.sender
+        users[1] = _to
+        LiquidityGauge(self.gauge).notifySavingsChanges(users)
 
     return True
 
@@ -151,8 +156,10 @@ def transferFrom(_from : address, _to : address, _value : uint256) -> bool:
     log Transfer(_from, _to, _value)
 
     if self.gauge != ZERO_ADDRESS:
-        LiquidityGauge(self.gauge).notifySavingsChange(_from)
-        LiquidityGauge(self.gauge).notifySavingsChange(_to)
+        users: address[MAX_NOTIFY] = empty(address[MAX_NOTIFY])
+        users[0] = _from
+        users[1] = _to
+        LiquidityGauge(self.gauge).notifySavingsChanges(users)
 
     return True
 
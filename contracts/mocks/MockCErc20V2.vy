@@ -8,8 +8,11 @@ from vyper.interfaces import ERC20
 
 implements: ERC20
 
+MAX_NOTIFY: constant(int128) = 8  # must match LiquidityGaugeV3
+
 interface Controller:
     def notifySavingsChange(addr: address):  nonpayable
+    def notifySavingsChanges(addrs: address[MAX_NOTIFY]):  nonpayable
 
 event Transfer:
     _from: indexed(address)
@@ -127,8 +130,10 @@ def transfer(_to : address, _value : uint256) -> bool:
     log Transfer(msg.sender, _to, _value)
 
     if self.controller != ZERO_ADDRESS:
-        Controller(self.controller).notifySavingsChange(msg.sender)
-        Controller(self.controller).notifySavingsChange(_to)
+        users: address[MAX_NOTIFY] = empty(address[MAX_NOTIFY])
+        users[0] = msg.sender
+        users[1] = _to
+        Controller(self.controller).notifySavingsChanges(users)
 
     return True
 
@@ -151,8 +156,10 @@ def transferFrom(_from : address, _to : address, _value : uint256) -> bool:
     log Transfer(_from, _to, _value)
 
     if self.controller != ZERO_ADDRESS:
-        Controller(self.controller).notifySavingsChange(_from)
-        Controller(self.controller).notifySavingsChange(_to)
+        users: address[MAX_NOTIFY] = empty(address[MAX_NOTIFY])
+        users[0] = _from
+        users[1] = _to
+        Controller(self.controller).notifySavingsChanges(users)
 
     return True
 
@@ -0,0 +1,235 @@
+"""
+Event indexer
+=============
+Incremental log indexer backed by SQLite.
+
+`EventIndexer` pages through a contract's logs in block ranges of
+`page_size`, decodes the events it was asked for and stores them with a
+per-contract resume cursor. After a restart, `sync` continues from the last
+indexed block and already stored events are replayed from the database
+without touching the node.
+
+Subclasses keep derived state by overriding `apply`. It is called once
+for every event, in chain order, both while replaying the database and while
+syncing new blocks. `flush` is called after each run of `apply` calls; the
+events of one transaction are always in the same run.
+
+Reorgs are not handled. Pass `confirmations` to stay that many blocks behind
+the head on networks where they matter.
+"""
+
+import json
+import sqlite3
+
+from eth_utils import event_abi_to_log_topic
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cursor (
+    address TEXT PRIMARY KEY,
+    block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    address TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (address, key)
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    number INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    address TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    event TEXT NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (address, block, log_index)
+);
+"""
+
+
+class Event(dict):
+    """Decoded event arguments with the log position as attributes."""
+
+    def __init__(self, name, block, log_index, tx_hash, args):
+        super().__init__(args)
+        self.name = name
+        self.block = block
+        self.log_index = log_index
+        self.tx_hash = tx_hash
+
+
+class EventIndexer:
+    #: names of the indexed events, all events in the ABI if empty
+    EVENTS = ()
+
+    def __init__(
+        self, web3, address, abi, database, start_block=0, page_size=2000, confirmations=0
+    ):
+        """
+        @param web3 `Web3` instance connected to the node
+        @param address Contract address
+        @param abi Contract ABI
+        @param database Path of the SQLite file, or an open `sqlite3.Connection`
+        @param start_block First block to index, usually the deployment block
+        @param page_size Number of blocks per `eth_getLogs` request
+        @param confirmations Number of blocks to stay behind the chain head
+        """
+        self.web3 = web3
+        self.address = web3.toChecksumAddress(address)
+        self.page_size = page_size
+        self.confirmations = confirmations
+
+        self.contract = web3.eth.contract(address=self.address, abi=abi)
+        self.topics = {}
+        for item in abi:
+            if item["type"] == "event" and (not self.EVENTS or item["name"] in self.EVENTS):
+                topic = "0x" + event_abi_to_log_topic(item).hex()
+                self.topics[topic] = item["name"]
+
+        if isinstance(database, sqlite3.Connection):
+            self.db = database
+        else:
+            self.db = sqlite3.connect(database)
+        self.db.executescript(SCHEMA)
+        self.db.execute(
+            "INSERT OR IGNORE INTO cursor (address, block) VALUES (?, ?)",
+            (self.address, start_block - 1),
+        )
+        self.db.commit()
+
+        self.initialize()
+        for event in self.events():
+            self.apply(event)
+        self.flush()
+
+    @classmethod
+    def from_contract(cls, contract, database, **kwargs):
+        """
+        Create an indexer for a brownie `Contract` on the active network.
+        """
+        from brownie import web3
+
+        return cls(web3, contract.address, contract.abi, database, **kwargs)
+
+    # hooks
+
+    def initialize(self):
+        """Set up derived state before the stored events are replayed."""
+
+    def apply(self, event):
+        """Update derived state with one event."""
+
+    def flush(self):
+        """Finish derived state updates held back by `apply`."""
+
+    # storage
+
+    @property
+    def cursor(self):
+        """Last block whose logs are fully indexed."""
+        return self.db.execute(
+            "SELECT block FROM cursor WHERE address = ?", (self.address,)
+        ).fetchone()[0]
+
+    def get_meta(self, key, default=None):
+        row = self.db.execute(
+            "SELECT value FROM meta WHERE address = ? AND key = ?", (self.address, key)
+        ).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def set_meta(self, key, value):
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta (address, key, value) VALUES (?, ?, ?)",
+            (self.address, key, json.dumps(value)),
+        )
+        self.db.commit()
+
+    def block_timestamp(self, block):
+        """Timestamp of `block`, fetched from the node once and then cached."""
+        row = self.db.execute("SELECT timestamp FROM blocks WHERE number = ?", (block,)).fetchone()
+        if row is not None:
+            return row[0]
+        timestamp = self.web3.eth.get_block(block)["timestamp"]
+        self.db.execute("INSERT OR IGNORE INTO blocks VALUES (?, ?)", (block, timestamp))
+        self.db.commit()
+        return timestamp
+
+    def events(self, names=None, from_block=0, to_block=None):
+        """
+        Iterate stored events in chain order.
+
+        @param names Only return these events
+        @param from_block, to_block Inclusive block range, up to the cursor if not given
+        """
+        if to_block is None:
+            to_block = self.cursor
+        query = "SELECT event, block, log_index, tx_hash, args FROM events "
+        query += "WHERE address = ? AND block >= ? AND block <= ?"
+        params = [self.address, from_block, to_block]
+        if names is not None:
+            names = list(names)
+            query += f" AND event IN ({', '.join('?' * len(names))})"
+            params += names
+        query += " ORDER BY block, log_index"
+        for name, block, log_index, tx_hash, args in self.db.execute(query, params):
+            yield Event(name, block, log_index, tx_hash, json.loads(args))
+
+    # indexing
+
+    def _decode(self, log):
+        name = self.topics.get(log["topics"][0].hex()) if log["topics"] else None
+        if name is None:
+            return None
+        decoded = self.contract.events[name]().processLog(log)
+        args = {}
+        for key, value in decoded["args"].items():
+            if isinstance(value, bytes):
+                value = "0x" + value.hex()
+            args[key] = value
+        return Event(
+            name, log["blockNumber"], log["logIndex"], log["transactionHash"].hex(), args
+        )
+
+    def sync(self, to_block=None):
+        """
+        Index all logs up to `to_block`, or up to the head minus `confirmations`.
+
+        Each page is committed together with the cursor, so an interrupted sync
+        resumes from the last completed page.
+
+        @return Number of new events
+        """
+        if to_block is None:
+            to_block = self.web3.eth.block_number - self.confirmations
+
+        count = 0
+        start = self.cursor + 1
+        while start <= to_block:
+            end = min(start + self.page_size - 1, to_block)
+            logs = self.web3.eth.get_logs(
+                {"address": self.address, "fromBlock": start, "toBlock": end}
+            )
+            events = [i for i in map(self._decode, logs) if i is not None]
+            events.sort(key=lambda i: (i.block, i.log_index))
+
+            with self.db:
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (self.address, i.block, i.log_index, i.tx_hash, i.name, json.dumps(i))
+                        for i in events
+                    ],
+                )
+                self.db.execute(
+                    "UPDATE cursor SET block = ? WHERE address = ?", (end, self.address)
+                )
+            for event in events:
+                self.apply(event)
+            self.flush()
+
+            count += len(events)
+            start = end + 1
+        return count
@@ -0,0 +1,240 @@
+"""
+GaugeController indexer
+=======================
+Streams `GaugeController` events into SQLite and keeps per-week weight tables.
+
+Events are replayed through `GaugeControllerModel`, so every vote or admin
+change is applied incrementally to the same storage the contract keeps. A
+vote needs the voter's `VotingEscrow` slope and lock end at that moment. Those
+come from a `VotingEscrowIndexer`, which is synced alongside.
+
+After each `sync`, the materialized tables `gauge_weight`, `type_weight` and
+`total_weight` hold, for every week up to the next one, the values of
+`points_weight`, `points_type_weight` and `points_total`, plus each gauge's
+relative weight. New events only change weeks after the earliest of them, so
+only those weeks are recomputed.
+
+The `VoteForGauge` events of one transaction are replayed together with
+`vote_for_many_gauge_weights`, so a batched vote that moves power between
+gauges is only checked against the power limit once, like in the contract.
+
+`add_type` with zero weight emits no event. Such types are created, unnamed,
+when a later event first refers to them. This does not change any weight.
+"""
+
+from scripts.event_indexer import EventIndexer
+from scripts.gauge_controller_model import WEEK, GaugeControllerModel
+
+VIEWS = """
+CREATE TABLE IF NOT EXISTS gauge_weight (
+    controller TEXT NOT NULL,
+    gauge TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    weight TEXT NOT NULL,
+    relative_weight TEXT NOT NULL,
+    PRIMARY KEY (controller, gauge, week)
+);
+CREATE TABLE IF NOT EXISTS type_weight (
+    controller TEXT NOT NULL,
+    type_id INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    weight TEXT NOT NULL,
+    PRIMARY KEY (controller, type_id, week)
+);
+CREATE TABLE IF NOT EXISTS total_weight (
+    controller TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    total TEXT NOT NULL,
+    PRIMARY KEY (controller, week)
+);
+"""
+
+
+class _EscrowAt:
+    """`VotingEscrow` reads as of the event being replayed."""
+
+    def __init__(self, indexer):
+        self.indexer = indexer
+        self.position = (0, 0)
+
+    def get_last_user_slope(self, addr):
+        return self.indexer.lock_at(addr, *self.position)[0]
+
+    def locked__end(self, addr):
+        return self.indexer.lock_at(addr, *self.position)[1]
+
+
+class GaugeControllerIndexer(EventIndexer):
+    EVENTS = ("AddType", "NewTypeWeight", "NewGauge", "NewGaugeWeight", "VoteForGauge")
+
+    def __init__(self, web3, address, abi, database, voting_escrow_indexer, **kwargs):
+        """
+        @param voting_escrow_indexer `VotingEscrowIndexer` of the controller's
+               `VotingEscrow`, sharing the same node
+        """
+        self.voting_escrow_indexer = voting_escrow_indexer
+        super().__init__(web3, address, abi, database, **kwargs)
+
+    @classmethod
+    def from_contract(cls, contract, database, voting_escrow_indexer, **kwargs):
+        from brownie import web3
+
+        return cls(web3, contract.address, contract.abi, database, voting_escrow_indexer, **kwargs)
+
+    def initialize(self):
+        self.db.executescript(VIEWS)
+        self.escrow = _EscrowAt(self.voting_escrow_indexer)
+        deployed = self.get_meta("deployed")
+        if deployed is None:
+            # the cursor starts right before the deployment block
+            deployed = self.block_timestamp(self.cursor + 1)
+            self.set_meta("deployed", deployed)
+        self.model = GaugeControllerModel(self.escrow, deployed)
+        self._materialized_block = self.get_meta("materialized_block", -1)
+        self._dirty = None
+        self._votes = []
+
+    def _add_types(self, type_id, timestamp):
+        while self.model.n_gauge_types <= type_id:
+            self.model.add_type(b"", 0, timestamp)
+
+    def _mark_dirty(self, block, timestamp):
+        if block > self._materialized_block:
+            # changes apply from the next week on
+            week = (timestamp + WEEK) // WEEK * WEEK
+            self._dirty = week if self._dirty is None else min(self._dirty, week)
+
+    def flush(self):
+        """Replay the held back votes of one transaction as a single batch."""
+        if not self._votes:
+            return
+        first = self._votes[0]
+        timestamp = self.block_timestamp(first.block)
+        self.escrow.position = (first.block, first.log_index)
+        self.model.vote_for_many_gauge_weights(
+            first["user"], [(i["gauge_addr"], i["weight"]) for i in self._votes], timestamp
+        )
+        self._votes = []
+        self._mark_dirty(first.block, timestamp)
+
+    def apply(self, event):
+        if self._votes and (
+            event.name != "VoteForGauge"
+            or event.tx_hash != self._votes[0].tx_hash
+            or event["user"] != self._votes[0]["user"]
+        ):
+            self.flush()
+        if event.name == "VoteForGauge":
+            self._votes.append(event)
+            return
+
+        model = self.model
+        timestamp = self.block_timestamp(event.block)
+        self.escrow.position = (event.block, event.log_index)
+
+        if event.name == "AddType":
+            self._add_types(event["type_id"], timestamp)
+            model.gauge_type_names[event["type_id"]] = event["name"]
+        elif event.name == "NewTypeWeight":
+            self._add_types(event["type_id"], timestamp)
+            model.change_type_weight(event["type_id"], event["weight"], timestamp)
+        elif event.name == "NewGauge":
+            self._add_types(event["gauge_type"], timestamp)
+            model.add_gauge(event["addr"], event["gauge_type"], event["weight"], timestamp)
+        elif event.name == "NewGaugeWeight":
+            model.change_gauge_weight(event["gauge_address"], event["weight"], timestamp)
+
+        self._mark_dirty(event.block, timestamp)
+
+    def sync(self, to_block=None):
+        """
+        Index new events, keeping the `VotingEscrow` indexer in step, then
+        refresh the weekly tables.
+
+        @return Number of new controller events
+        """
+        if to_block is None:
+            to_block = self.web3.eth.block_number - self.confirmations
+        self.voting_escrow_indexer.sync(to_block)
+        count = super().sync(to_block)
+        self.materialize()
+        return count
+
+    def materialize(self):
+        """
+        Recompute the weekly tables from the first week changed since the last
+        call up to the week after the cursor.
+        """
+        end = (self.block_timestamp(self.cursor) + WEEK) // WEEK * WEEK
+        start = self._dirty
+        done = self.get_meta("materialized")
+        if done is not None:
+            start = done + WEEK if start is None else min(start, done + WEEK)
+        if start is None or start > end:
+            return
+
+        schedule = self.model.weight_schedule(start, (end - start) // WEEK + 1)
+        address = self.address
+        with self.db:
+            for table in ("gauge_weight", "type_weight", "total_weight"):
+                self.db.execute(
+                    f"DELETE FROM {table} WHERE controller = ? AND week >= ?", (address, start)
+                )
+            self.db.executemany(
+                "INSERT INTO gauge_weight VALUES (?, ?, ?, ?, ?)",
+                [
+                    (address, gauge, week, str(weight), str(schedule.relative_weights[gauge][j]))
+                    for gauge, weights in schedule.gauge_weights.items()
+                    for j, (week, weight) in enumerate(zip(schedule.weeks, weights))
+                ],
+            )
+            self.db.executemany(
+                "INSERT INTO type_weight VALUES (?, ?, ?, ?)",
+                [
+                    (address, type_id, week, str(weight))
+                    for type_id, weights in schedule.type_weights.items()
+                    for week, weight in zip(schedule.weeks, weights)
+                ],
+            )
+            self.db.executemany(
+                "INSERT INTO total_weight VALUES (?, ?, ?)",
+                [
+                    (address, week, str(total))
+                    for week, total in zip(schedule.weeks, schedule.totals)
+                ],
+            )
+        self.set_meta("materialized", end)
+        self.set_meta("materialized_block", self.cursor)
+        self._materialized_block = self.cursor
+        self._dirty = None
+
+    # views
+
+    def gauge_weights(self, gauge, from_week=0, to_week=None):
+        """
+        Materialized weekly history of `gauge`.
+
+        @return list of (week, weight, relative weight)
+        """
+        query = "SELECT week, weight, relative_weight FROM gauge_weight "
+        query += "WHERE controller = ? AND gauge = ? AND week >= ? AND week <= ? ORDER BY week"
+        rows = self.db.execute(
+            query, (self.address, str(gauge), from_week, 2 ** 62 if to_week is None else to_week)
+        )
+        return [(week, int(weight), int(relative)) for week, weight, relative in rows]
+
+    def weights_at(self, timestamp):
+        """
+        Materialized weights of every gauge in the week containing `timestamp`.
+
+        @return (dict of gauge -> (weight, relative weight), total weight)
+        """
+        week = timestamp // WEEK * WEEK
+        query = "SELECT gauge, weight, relative_weight FROM gauge_weight "
+        query += "WHERE controller = ? AND week = ?"
+        rows = self.db.execute(query, (self.address, week))
+        weights = {gauge: (int(weight), int(relative)) for gauge, weight, relative in rows}
+        row = self.db.execute(
+            "SELECT total FROM total_weight WHERE controller = ? AND week = ?", (self.address, week)
+        ).fetchone()
+        return weights, 0 if row is None else int(row[0])
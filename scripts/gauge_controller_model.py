@@ -0,0 +1,501 @@
+"""
+GaugeController reference model
+===============================
+Pure-Python reproduction of `contracts/GaugeController.vy`.
+
+The model keeps the contract storage (`points_weight`, `changes_weight`,
+`points_sum`, `changes_sum`, `points_type_weight`, `points_total` and the
+`time_*` cursors) and replays `add_type`, `add_gauge`, `change_type_weight`,
+`change_gauge_weight`, `vote_for_gauge_weights` and `vote_for_many_gauge_weights`
+with the same uint256 arithmetic. Every state-changing method takes the `timestamp` of the
+transaction it mirrors; calls that would revert on-chain raise `Revert`.
+
+Gauges and users are keyed by `str(addr)`, the checksum address, so brownie
+`Contract` and `Account` objects and address strings all find the same entry.
+
+`weight_schedule` projects the values the contract would store for every
+gauge over a range of future weeks in a single pass over the weeks, instead of
+filling each gauge, type and total separately with the 500-iteration loops.
+"""
+
+import functools
+from collections import namedtuple
+
+from scripts.voting_escrow_model import Revert, uint256
+
+WEEK = 604800
+WEIGHT_VOTE_DELAY = 10 * 86400
+MULTIPLIER = 10 ** 18
+
+Point = namedtuple("Point", ["bias", "slope"])
+VotedSlope = namedtuple("VotedSlope", ["slope", "power", "end"])
+
+EMPTY_POINT = Point(0, 0)
+EMPTY_SLOPE = VotedSlope(0, 0, 0)
+
+WeightSchedule = namedtuple(
+    "WeightSchedule", ["weeks", "relative_weights", "gauge_weights", "type_weights", "totals"]
+)
+
+
+def _atomic(fn):
+    """Roll back every storage write of `fn` if it reverts, like a transaction."""
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        snapshot = {
+            k: {i: dict(j) if isinstance(j, dict) else j for i, j in v.items()}
+            if isinstance(v, dict)
+            else list(v) if isinstance(v, list) else v
+            for k, v in vars(self).items()
+            if k != "voting_escrow"
+        }
+        try:
+            return fn(self, *args, **kwargs)
+        except Revert:
+            vars(self).update(snapshot)
+            raise
+
+    return wrapper
+
+
+def _advance(pt, changes, t):
+    """One week of bias decay and scheduled slope changes, as in `_get_weight`."""
+    d_bias = pt.slope * WEEK
+    if pt.bias > d_bias:
+        return Point(pt.bias - d_bias, uint256(pt.slope - changes.get(t, 0)))
+    return EMPTY_POINT
+
+
+class GaugeControllerModel:
+    def __init__(self, voting_escrow, timestamp):
+        """
+        @param voting_escrow Object exposing `get_last_user_slope(addr)` and
+               `locked__end(addr)`, e.g. a `VotingEscrowModel` or the contract
+        @param timestamp Deployment timestamp
+        """
+        self.voting_escrow = voting_escrow
+
+        self.n_gauge_types = 0
+        self.n_gauges = 0
+        self.gauge_type_names = {}
+        self.gauges = []
+        self.gauge_types_ = {}
+        self.gauges_lptoken = {}
+
+        self.vote_user_slopes = {}
+        self.vote_user_power = {}
+        self.last_user_vote = {}
+
+        self.points_weight = {}
+        self.changes_weight = {}
+        self.time_weight = {}
+
+        self.points_sum = {}
+        self.changes_sum = {}
+        self.time_sum = {}
+
+        self.points_total = {}
+        self.time_total = timestamp // WEEK * WEEK
+
+        self.points_type_weight = {}
+        self.time_type_weight = {}
+
+    # storage helpers
+
+    def _point(self, points, key, t):
+        return points.get(key, {}).get(t, EMPTY_POINT)
+
+    def _set(self, mapping, key, t, value):
+        mapping.setdefault(key, {})[t] = value
+
+    def gauge_types(self, addr):
+        gauge_type = self.gauge_types_.get(str(addr), 0)
+        if gauge_type == 0:
+            raise Revert()
+        return gauge_type - 1
+
+    # week-over-week fills
+
+    def _get_type_weight(self, gauge_type, timestamp):
+        t = self.time_type_weight.get(gauge_type, 0)
+        if t > 0:
+            w = self.points_type_weight.get(gauge_type, {}).get(t, 0)
+            for _ in range(500):
+                if t > timestamp:
+                    break
+                t += WEEK
+                self._set(self.points_type_weight, gauge_type, t, w)
+                if t > timestamp:
+                    self.time_type_weight[gauge_type] = t
+            return w
+        return 0
+
+    def _get_sum(self, gauge_type, timestamp):
+        t = self.time_sum.get(gauge_type, 0)
+        if t > 0:
+            pt = self._point(self.points_sum, gauge_type, t)
+            changes = self.changes_sum.get(gauge_type, {})
+            for _ in range(500):
+                if t > timestamp:
+                    break
+                t += WEEK
+                pt = _advance(pt, changes, t)
+                self._set(self.points_sum, gauge_type, t, pt)
+                if t > timestamp:
+                    self.time_sum[gauge_type] = t
+            return pt.bias
+        return 0
+
+    def _get_total(self, timestamp):
+        t = self.time_total
+        if t > timestamp:
+            t -= WEEK
+        pt = self.points_total.get(t, 0)
+
+        for gauge_type in range(self.n_gauge_types):
+            self._get_sum(gauge_type, timestamp)
+            self._get_type_weight(gauge_type, timestamp)
+
+        for _ in range(500):
+            if t > timestamp:
+                break
+            t += WEEK
+            pt = 0
+            for gauge_type in range(self.n_gauge_types):
+                type_sum = self._point(self.points_sum, gauge_type, t).bias
+                type_weight = self.points_type_weight.get(gauge_type, {}).get(t, 0)
+                pt += type_sum * type_weight
+            self.points_total[t] = uint256(pt)
+            if t > timestamp:
+                self.time_total = t
+        return pt
+
+    def _get_weight(self, gauge_addr, timestamp):
+        t = self.time_weight.get(gauge_addr, 0)
+        if t > 0:
+            pt = self._point(self.points_weight, gauge_addr, t)
+            changes = self.changes_weight.get(gauge_addr, {})
+            for _ in range(500):
+                if t > timestamp:
+                    break
+                t += WEEK
+                pt = _advance(pt, changes, t)
+                self._set(self.points_weight, gauge_addr, t, pt)
+                if t > timestamp:
+                    self.time_weight[gauge_addr] = t
+            return pt.bias
+        return 0
+
+    # state changes
+
+    @_atomic
+    def add_gauge(self, addr, gauge_type, weight, timestamp, lp_token=None):
+        addr = str(addr)
+        if not 0 <= gauge_type < self.n_gauge_types:
+            raise Revert()
+        if self.gauge_types_.get(addr, 0) != 0:
+            raise Revert("dev: cannot add the same gauge twice")
+
+        self.n_gauges += 1
+        self.gauges.append(addr)
+        if lp_token is not None:
+            self.gauges_lptoken[str(lp_token)] = addr
+
+        self.gauge_types_[addr] = gauge_type + 1
+        next_time = (timestamp + WEEK) // WEEK * WEEK
+
+        if weight > 0:
+            _type_weight = self._get_type_weight(gauge_type, timestamp)
+            _old_sum = self._get_sum(gauge_type, timestamp)
+            _old_total = self._get_total(timestamp)
+
+            pt = self._point(self.points_sum, gauge_type, next_time)
+            self._set(self.points_sum, gauge_type, next_time, pt._replace(bias=weight + _old_sum))
+            self.time_sum[gauge_type] = next_time
+            self.points_total[next_time] = uint256(_old_total + _type_weight * weight)
+            self.time_total = next_time
+
+            pt = self._point(self.points_weight, addr, next_time)
+            self._set(self.points_weight, addr, next_time, pt._replace(bias=weight))
+
+        if self.time_sum.get(gauge_type, 0) == 0:
+            self.time_sum[gauge_type] = next_time
+        self.time_weight[addr] = next_time
+
+    @_atomic
+    def checkpoint(self, timestamp):
+        self._get_total(timestamp)
+
+    @_atomic
+    def checkpoint_gauge(self, addr, timestamp):
+        self._get_weight(str(addr), timestamp)
+        self._get_total(timestamp)
+
+    def _change_type_weight(self, type_id, weight, timestamp):
+        old_weight = self._get_type_weight(type_id, timestamp)
+        old_sum = self._get_sum(type_id, timestamp)
+        _total_weight = self._get_total(timestamp)
+        next_time = (timestamp + WEEK) // WEEK * WEEK
+
+        _total_weight = uint256(_total_weight + old_sum * weight - old_sum * old_weight)
+        self.points_total[next_time] = _total_weight
+        self._set(self.points_type_weight, type_id, next_time, weight)
+        self.time_total = next_time
+        self.time_type_weight[type_id] = next_time
+
+    @_atomic
+    def add_type(self, name, weight, timestamp):
+        type_id = self.n_gauge_types
+        self.gauge_type_names[type_id] = name
+        self.n_gauge_types = type_id + 1
+        if weight != 0:
+            self._change_type_weight(type_id, weight, timestamp)
+
+    @_atomic
+    def change_type_weight(self, type_id, weight, timestamp):
+        self._change_type_weight(type_id, weight, timestamp)
+
+    @_atomic
+    def change_gauge_weight(self, addr, weight, timestamp):
+        addr = str(addr)
+        gauge_type = self.gauge_types_.get(addr, 0) - 1
+        old_gauge_weight = self._get_weight(addr, timestamp)
+        type_weight = self._get_type_weight(gauge_type, timestamp)
+        old_sum = self._get_sum(gauge_type, timestamp)
+        _total_weight = self._get_total(timestamp)
+        next_time = (timestamp + WEEK) // WEEK * WEEK
+
+        pt = self._point(self.points_weight, addr, next_time)
+        self._set(self.points_weight, addr, next_time, pt._replace(bias=weight))
+        self.time_weight[addr] = next_time
+
+        new_sum = uint256(old_sum + weight - old_gauge_weight)
+        pt = self._point(self.points_sum, gauge_type, next_time)
+        self._set(self.points_sum, gauge_type, next_time, pt._replace(bias=new_sum))
+        self.time_sum[gauge_type] = next_time
+
+        _total_weight = uint256(_total_weight + new_sum * type_weight - old_sum * type_weight)
+        self.points_total[next_time] = _total_weight
+        self.time_total = next_time
+
+    def _vote_lock(self, user, timestamp):
+        slope = uint256(self.voting_escrow.get_last_user_slope(user))
+        lock_end = self.voting_escrow.locked__end(user)
+        next_time = (timestamp + WEEK) // WEEK * WEEK
+        if lock_end <= next_time:
+            raise Revert("Your token lock expires too soon")
+        return slope, lock_end, next_time
+
+    def _vote_for_gauge_weights(
+        self, user, gauge_addr, user_weight, slope, lock_end, next_time, power_used, timestamp
+    ):
+        if not 0 <= user_weight <= 10000:
+            raise Revert("You used all your voting power")
+
+        gauge_type = self.gauge_types_.get(gauge_addr, 0) - 1
+        if gauge_type < 0:
+            raise Revert("Gauge not added")
+
+        old_slope = self.vote_user_slopes.get(user, {}).get(gauge_addr, EMPTY_SLOPE)
+        old_dt = 0
+        if old_slope.end > next_time:
+            old_dt = old_slope.end - next_time
+        old_bias = old_slope.slope * old_dt
+        new_slope = VotedSlope(slope * user_weight // 10000, user_weight, lock_end)
+        new_dt = lock_end - next_time
+        new_bias = new_slope.slope * new_dt
+
+        old_weight_bias = self._get_weight(gauge_addr, timestamp)
+        old_weight_slope = self._point(self.points_weight, gauge_addr, next_time).slope
+        old_sum_bias = self._get_sum(gauge_type, timestamp)
+        old_sum_slope = self._point(self.points_sum, gauge_type, next_time).slope
+
+        weight_bias = max(old_weight_bias + new_bias, old_bias) - old_bias
+        sum_bias = max(old_sum_bias + new_bias, old_bias) - old_bias
+        if old_slope.end > next_time:
+            weight_slope = max(old_weight_slope + new_slope.slope, old_slope.slope) - old_slope.slope
+            sum_slope = max(old_sum_slope + new_slope.slope, old_slope.slope) - old_slope.slope
+        else:
+            weight_slope = old_weight_slope + new_slope.slope
+            sum_slope = old_sum_slope + new_slope.slope
+        self._set(self.points_weight, gauge_addr, next_time, Point(weight_bias, weight_slope))
+        self._set(self.points_sum, gauge_type, next_time, Point(sum_bias, sum_slope))
+
+        changes_weight = self.changes_weight.setdefault(gauge_addr, {})
+        changes_sum = self.changes_sum.setdefault(gauge_type, {})
+        if old_slope.end > timestamp:
+            changes_weight[old_slope.end] = uint256(
+                changes_weight.get(old_slope.end, 0) - old_slope.slope
+            )
+            changes_sum[old_slope.end] = uint256(changes_sum.get(old_slope.end, 0) - old_slope.slope)
+        changes_weight[new_slope.end] = changes_weight.get(new_slope.end, 0) + new_slope.slope
+        changes_sum[new_slope.end] = changes_sum.get(new_slope.end, 0) + new_slope.slope
+
+        self.vote_user_slopes.setdefault(user, {})[gauge_addr] = new_slope
+        self.last_user_vote.setdefault(user, {})[gauge_addr] = timestamp
+
+        return uint256(power_used + new_slope.power - old_slope.power)
+
+    def _set_power(self, user, power_used):
+        if power_used > 10000:
+            raise Revert("Used too much power")
+        self.vote_user_power[user] = power_used
+
+    @_atomic
+    def vote_for_gauge_weights(self, user, gauge_addr, user_weight, timestamp):
+        user, gauge_addr = str(user), str(gauge_addr)
+        slope, lock_end, next_time = self._vote_lock(user, timestamp)
+        power_used = self._vote_for_gauge_weights(
+            user,
+            gauge_addr,
+            user_weight,
+            slope,
+            lock_end,
+            next_time,
+            self.vote_user_power.get(user, 0),
+            timestamp,
+        )
+        self._set_power(user, power_used)
+        self._get_total(timestamp)
+
+    @_atomic
+    def vote_for_many_gauge_weights(self, user, votes, timestamp):
+        """
+        Apply `votes`, a list of (gauge, weight) pairs, as a single transaction.
+        Used power is validated once after all votes.
+        """
+        user = str(user)
+        slope, lock_end, next_time = self._vote_lock(user, timestamp)
+        power_used = self.vote_user_power.get(user, 0)
+        for gauge_addr, user_weight in votes:
+            power_used = self._vote_for_gauge_weights(
+                user,
+                str(gauge_addr),
+                user_weight,
+                slope,
+                lock_end,
+                next_time,
+                power_used,
+                timestamp,
+            )
+        self._set_power(user, power_used)
+        self._get_total(timestamp)
+
+    # views
+
+    def gauge_relative_weight(self, addr, time):
+        addr = str(addr)
+        t = time // WEEK * WEEK
+        _total_weight = self.points_total.get(t, 0)
+        if _total_weight > 0:
+            gauge_type = self.gauge_types_.get(addr, 0) - 1
+            _type_weight = self.points_type_weight.get(gauge_type, {}).get(t, 0)
+            _gauge_weight = self._point(self.points_weight, addr, t).bias
+            return MULTIPLIER * _type_weight * _gauge_weight // _total_weight
+        return 0
+
+    @_atomic
+    def gauge_relative_weight_write(self, addr, time, timestamp):
+        self._get_weight(str(addr), timestamp)
+        self._get_total(timestamp)
+        return self.gauge_relative_weight(addr, time)
+
+    def get_gauge_weight(self, addr):
+        addr = str(addr)
+        return self._point(self.points_weight, addr, self.time_weight.get(addr, 0)).bias
+
+    def get_type_weight(self, type_id):
+        return self.points_type_weight.get(type_id, {}).get(self.time_type_weight.get(type_id, 0), 0)
+
+    def get_total_weight(self):
+        return self.points_total.get(self.time_total, 0)
+
+    def get_weights_sum_per_type(self, type_id):
+        return self._point(self.points_sum, type_id, self.time_sum.get(type_id, 0)).bias
+
+    # batched projection
+
+    def weight_schedule(self, start, n_weeks):
+        """
+        Project the stored weights for `n_weeks` weeks starting at the week
+        containing `start`, assuming no further votes or admin changes.
+
+        Weeks that are already filled are read from storage; later weeks are
+        the values the `_get_*` fills would write, computed for all gauges,
+        types and the total in one pass over the weeks.
+
+        Raises `Revert` if one of the fills would underflow on-chain.
+
+        @return WeightSchedule with per-gauge lists of relative and absolute
+                weights, per-type lists of type weights, and the totals
+        """
+        weeks = [start // WEEK * WEEK + i * WEEK for i in range(n_weeks)]
+        types = range(self.n_gauge_types)
+
+        gauge_pts = {
+            addr: self._point(self.points_weight, addr, self.time_weight.get(addr, 0))
+            for addr in self.gauges
+        }
+        sum_pts = {i: self._point(self.points_sum, i, self.time_sum.get(i, 0)) for i in types}
+        type_w = {i: self.get_type_weight(i) for i in types}
+
+        gauge_weights = {addr: [] for addr in self.gauges}
+        type_weights = {i: [] for i in types}
+        sums = {i: [] for i in types}
+        totals = []
+
+        # advance the cursors up to the first requested week
+        for key, pts, changes, times in (
+            (self.gauges, gauge_pts, self.changes_weight, self.time_weight),
+            (types, sum_pts, self.changes_sum, self.time_sum),
+        ):
+            for k in key:
+                t = times.get(k, 0)
+                if t == 0:
+                    continue
+                while t < weeks[0]:
+                    t += WEEK
+                    pts[k] = _advance(pts[k], changes.get(k, {}), t)
+
+        for t in weeks:
+            for addr in self.gauges:
+                t_last = self.time_weight.get(addr, 0)
+                if t <= t_last:
+                    gauge_weights[addr].append(self._point(self.points_weight, addr, t).bias)
+                    continue
+                if t > weeks[0] and t_last != 0:
+                    gauge_pts[addr] = _advance(gauge_pts[addr], self.changes_weight.get(addr, {}), t)
+                gauge_weights[addr].append(gauge_pts[addr].bias if t_last else 0)
+
+            for i in types:
+                t_last = self.time_sum.get(i, 0)
+                if t <= t_last:
+                    sums[i].append(self._point(self.points_sum, i, t).bias)
+                else:
+                    if t > weeks[0] and t_last != 0:
+                        sum_pts[i] = _advance(sum_pts[i], self.changes_sum.get(i, {}), t)
+                    sums[i].append(sum_pts[i].bias if t_last else 0)
+
+                t_last = self.time_type_weight.get(i, 0)
+                if t <= t_last:
+                    type_weights[i].append(self.points_type_weight.get(i, {}).get(t, 0))
+                else:
+                    type_weights[i].append(type_w[i] if t_last else 0)
+
+            if t <= self.time_total:
+                totals.append(self.points_total.get(t, 0))
+            else:
+                totals.append(sum(sums[i][-1] * type_weights[i][-1] for i in types))
+
+        relative_weights = {}
+        for addr in self.gauges:
+            gauge_type = self.gauge_types_[addr] - 1
+            relative_weights[addr] = [
+                MULTIPLIER * type_weights[gauge_type][j] * gauge_weights[addr][j] // totals[j]
+                if totals[j] > 0
+                else 0
+                for j in range(n_weeks)
+            ]
+
+        return WeightSchedule(weeks, relative_weights, gauge_weights, type_weights, totals)
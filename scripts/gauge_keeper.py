@@ -0,0 +1,183 @@
+"""
+Gauge keeper
+============
+Keeps gauge and controller checkpoints current, so users do not pay for
+weeks of catch-up.
+
+A gauge that nobody touched for a while makes its next user fill every missed
+week in `LiquidityGaugeV3._checkpoint_dao` and `_checkpoint_point`, and in
+`GaugeController._get_weight` and `_get_total`. The keeper looks for:
+
+* gauges whose `integrate_checkpoint()` (`period_timestamp`) is behind, fixed
+  with `user_checkpoint(keeper)`, which also checkpoints the gauge in the
+  controller. `user_checkpoint` only accepts the caller or the minter as
+  `addr`, so the keeper checkpoints itself, which holds no deposit.
+* gauges whose controller `time_weight` is behind, fixed with
+  `GaugeController.checkpoint_gauge`
+* a controller `time_total` that is behind, fixed with `GaugeController.checkpoint`
+
+The gas of every call is estimated first. The stalest calls are sent within the
+gas budget, back to back with consecutive nonces, and then awaited together.
+
+Run it against a deployment with
+
+    brownie run scripts/gauge_keeper.py main deployments.json keeper --network mainnet
+"""
+
+import json
+import time
+from collections import namedtuple
+
+WEEK = 604800
+
+Checkpoint = namedtuple("Checkpoint", ["contract", "method", "args", "weeks", "gas"])
+
+
+def weeks_behind(next_time, now):
+    """
+    Number of weekly steps a checkpoint loop fills up to `now`, when the next
+    step it would fill is at `next_time`.
+    """
+    if next_time == 0 or next_time > now:
+        return 0
+    return (now - next_time) // WEEK + 1
+
+
+class GaugeKeeper:
+    def __init__(self, gauge_controller, gauges, account, min_weeks=1, max_gas=None, gas_buffer=1.2):
+        """
+        @param gauge_controller `GaugeController` contract object
+        @param gauges `LiquidityGaugeV3` contract objects to keep checkpointed
+        @param account Account sending the checkpoints
+        @param min_weeks Only checkpoint what is at least this many weeks behind
+        @param max_gas Total gas budget of one `run_once`, unlimited if not given
+        @param gas_buffer Multiplier applied to each estimate for the gas limit
+        """
+        self.gauge_controller = gauge_controller
+        self.gauges = list(gauges)
+        self.account = account
+        self.min_weeks = min_weeks
+        self.max_gas = max_gas
+        self.gas_buffer = gas_buffer
+
+    @classmethod
+    def from_controller(cls, gauge_controller, account, **kwargs):
+        """
+        Keep every gauge added to `gauge_controller` checkpointed.
+        """
+        from brownie import LiquidityGaugeV3
+
+        gauges = [
+            LiquidityGaugeV3.at(gauge_controller.gauges(i))
+            for i in range(gauge_controller.n_gauges())
+        ]
+        return cls(gauge_controller, gauges, account, **kwargs)
+
+    def stale(self, now):
+        """
+        Checkpoints due at `now`, without gas estimates, stalest first.
+
+        The controller `checkpoint` is listed whenever `time_total` is behind,
+        even though any gauge checkpoint also fills it; `plan` drops it when a
+        gauge checkpoint is sent.
+
+        @return list of `Checkpoint`
+        """
+        controller = self.gauge_controller
+        due = []
+        for gauge in self.gauges:
+            if gauge.is_killed():
+                continue
+            weeks = weeks_behind((gauge.integrate_checkpoint() // WEEK + 1) * WEEK, now)
+            if weeks >= self.min_weeks:
+                # also runs `checkpoint_gauge` for this gauge in the controller
+                due.append(Checkpoint(gauge, "user_checkpoint", (self.account,), weeks, None))
+                continue
+            weeks = weeks_behind(controller.time_weight(gauge), now)
+            if weeks >= self.min_weeks:
+                due.append(Checkpoint(controller, "checkpoint_gauge", (gauge,), weeks, None))
+
+        weeks = weeks_behind(controller.time_total(), now)
+        if weeks >= self.min_weeks:
+            due.append(Checkpoint(controller, "checkpoint", (), weeks, None))
+        return sorted(due, key=lambda i: -i.weeks)
+
+    def plan(self, now):
+        """
+        Estimate the due checkpoints and keep the stalest ones within `max_gas`.
+
+        Each estimate assumes none of the other checkpoints ran before it, so
+        it is an upper bound when several of them share the controller catch-up.
+        The controller `checkpoint` is only kept when no gauge checkpoint made
+        it into the plan.
+
+        @return list of `Checkpoint` with their gas estimates
+        """
+        planned = []
+        total = 0
+        # the controller checkpoint goes last, once the gauge checkpoints are decided
+        for item in sorted(self.stale(now), key=lambda i: i.method == "checkpoint"):
+            if item.method == "checkpoint" and planned:
+                continue
+            fn = getattr(item.contract, item.method)
+            try:
+                gas = fn.estimate_gas(*item.args, {"from": self.account})
+            except ValueError:
+                # would revert, e.g. more weeks behind than one call can fill
+                continue
+            if self.max_gas is not None and total + gas > self.max_gas:
+                continue
+            total += gas
+            planned.append(item._replace(gas=gas))
+        return planned
+
+    def run_once(self):
+        """
+        Send the planned checkpoints and wait for all of them.
+
+        @return list of transaction receipts
+        """
+        from brownie import chain, web3
+
+        planned = self.plan(chain[-1].timestamp)
+        nonce = web3.eth.get_transaction_count(str(self.account), "pending")
+        pending = []
+        for i, item in enumerate(planned):
+            fn = getattr(item.contract, item.method)
+            tx = fn(
+                *item.args,
+                {
+                    "from": self.account,
+                    "nonce": nonce + i,
+                    "gas_limit": int(item.gas * self.gas_buffer),
+                    "required_confs": 0,
+                },
+            )
+            pending.append(tx)
+        for tx in pending:
+            tx.wait(1)
+        return pending
+
+    def run(self, interval=3600, iterations=None):
+        """
+        Call `run_once` every `interval` seconds, forever or `iterations` times.
+        """
+        count = 0
+        while iterations is None or count < iterations:
+            for tx in self.run_once():
+                print(f"{tx.contract_name}.{tx.fn_name}: {tx.gas_used} gas, status {tx.status}")
+            count += 1
+            if iterations is None or count < iterations:
+                time.sleep(interval)
+
+
+def main(deployments_json, account_id="keeper", interval=3600):
+    from brownie import GaugeController, accounts
+
+    with open(deployments_json) as fp:
+        deployments = json.load(fp)
+
+    keeper = GaugeKeeper.from_controller(
+        GaugeController.at(deployments["GaugeController"]), accounts.load(account_id)
+    )
+    keeper.run(int(interval))
@@ -0,0 +1,613 @@
+"""
+LiquidityGaugeV3 reference model
+================================
+Pure-Python reproduction of the accounting in `contracts/LiquidityGaugeV3.vy`:
+the DAO token integral (`integrate_inv_supply`, `integrate_fraction`), the
+point integral (`point_integrate_inv_supply`, `point_integrate_fraction`), the
+reward token integrals (`reward_integral`, `reward_integral_for`, `claim_data`)
+and the boosted working balances.
+
+The model is started either empty at deployment or from a snapshot of the
+contract storage (`from_contract`), and then follows the gauge by replaying
+deposits, withdrawals and checkpoints. Every state-changing method takes the
+`timestamp` of the transaction it mirrors; calls that would revert on-chain
+raise `Revert`.
+
+`claimable_all` evaluates what `claimable_tokens`, `balance_of_write` and
+`claimable_reward_write` would return for every depositor at a given time,
+computing the global integrals once instead of once per user and call.
+
+Users, reward tokens and gauges are keyed by `str(addr)`, the checksum
+address, so brownie `Contract` and `Account` objects and address strings all
+find the same entry.
+
+External contracts are injected as duck-typed objects:
+
+* `policy` - `epoch_at(t)`, `epoch_start_time(epoch)` and `rate_at(t)`, e.g.
+  `RewardPolicyModel` or the deployed `RewardPolicyMaker`
+* `controller` - `checkpoint_gauge(addr, timestamp)` and
+  `gauge_relative_weight(addr, time)`, e.g. a `GaugeControllerModel` or
+  `RelativeWeights`
+* `voting_escrow` - `balanceOf(addr, t)` and `totalSupply(t)`, e.g. a
+  `VotingEscrowModel` or the deployed `VotingEscrow`
+"""
+
+from collections import namedtuple
+
+from scripts.voting_escrow_model import Revert, uint256
+
+MAX_REWARDS = 8
+TOKENLESS_PRODUCTION = 40
+WEEK = 604800
+
+Claimable = namedtuple("Claimable", ["tokens", "points", "rewards"])
+
+
+class RewardPolicyModel:
+    """In-memory copy of `RewardPolicyMaker`, avoiding one call per epoch."""
+
+    def __init__(self, first_epoch_time, epoch_length, rewards):
+        """
+        @param rewards Mapping or sequence of reward amounts per epoch
+        """
+        self.first_epoch_time = first_epoch_time
+        self.epoch_length = epoch_length
+        self.rewards = dict(enumerate(rewards)) if isinstance(rewards, (list, tuple)) else rewards
+
+    @classmethod
+    def from_contract(cls, policy, n_epochs):
+        """Read the first `n_epochs` reward amounts from a deployed `RewardPolicyMaker`."""
+        return cls(
+            policy.first_epoch_time(),
+            policy.epoch_length(),
+            [policy.rewards(i) for i in range(n_epochs)],
+        )
+
+    def epoch_at(self, timestamp):
+        if timestamp < self.first_epoch_time:
+            return 0
+        return (timestamp - self.first_epoch_time) // self.epoch_length
+
+    def epoch_start_time(self, epoch):
+        return self.first_epoch_time + epoch * self.epoch_length
+
+    def rate_at(self, timestamp):
+        if timestamp < self.first_epoch_time:
+            return 0
+        return self.rewards.get(self.epoch_at(timestamp), 0) // self.epoch_length
+
+
+class RelativeWeights:
+    """
+    Controller stand-in returning already known relative weights, e.g. values
+    read with `GaugeController.gauge_relative_weight` or taken from
+    `GaugeControllerModel.weight_schedule`.
+    """
+
+    def __init__(self, weights):
+        """
+        @param weights Mapping of gauge address to a {week: weight} mapping
+        """
+        self.weights = weights
+
+    @classmethod
+    def from_schedule(cls, schedule):
+        return cls(
+            {
+                str(addr): dict(zip(schedule.weeks, values))
+                for addr, values in schedule.relative_weights.items()
+            }
+        )
+
+    def checkpoint_gauge(self, addr, timestamp):
+        pass
+
+    def gauge_relative_weight(self, addr, time):
+        return self.weights.get(str(addr), {}).get(time // WEEK * WEEK, 0)
+
+
+class LiquidityGaugeModel:
+    def __init__(
+        self,
+        address,
+        policy,
+        controller,
+        voting_escrow,
+        timestamp,
+        default_point_rate=0,
+        point_proportion=0,
+    ):
+        """
+        @param address Gauge address, as passed to the controller
+        @param timestamp Deployment timestamp
+        """
+        self.address = str(address)
+        self.policy = policy
+        self.controller = controller
+        self.voting_escrow = voting_escrow
+
+        self.lpBalanceOf = {}
+        self.lpTotalSupply = 0
+        self.totalSupply = 0
+        self.working_balances = {}
+        self.working_supply = 0
+        self.is_killed = False
+
+        self.period = 0
+        self.period_timestamp = {0: timestamp}
+        self.integrate_inv_supply = {0: 0}
+        self.integrate_inv_supply_of = {}
+        self.integrate_checkpoint_of = {}
+        self.integrate_fraction = {}
+
+        self.reward_tokens = []
+        self.reward_rate = {}
+        self.reward_timestamp = 0
+        self.reward_integral = {}
+        self.reward_integral_for = {}
+        self.claim_data = {}
+
+        self.point_current_epoch_time = (timestamp + WEEK) // WEEK * WEEK - WEEK
+        self.point_rate = default_point_rate
+        self.point_proportion = point_proportion
+        self.point_period = 0
+        self.point_period_timestamp = {0: timestamp}
+        self.point_integrate_inv_supply = {0: 0}
+        self.point_integrate_inv_supply_of = {}
+        self.point_integrate_checkpoint_of = {}
+        self.point_integrate_fraction = {}
+
+    @classmethod
+    def from_contract(cls, gauge, users, policy, controller, voting_escrow):
+        """
+        Load the current state of a deployed gauge.
+
+        @param gauge Deployed `LiquidityGaugeV3`
+        @param users Every address holding a deposit or unclaimed rewards
+        """
+        model = cls(gauge.address, policy, controller, voting_escrow, 0)
+
+        model.period = gauge.period()
+        model.period_timestamp = {model.period: gauge.period_timestamp(model.period)}
+        model.integrate_inv_supply = {model.period: gauge.integrate_inv_supply(model.period)}
+        model.point_period = gauge.point_period()
+        model.point_period_timestamp = {
+            model.point_period: gauge.point_period_timestamp(model.point_period)
+        }
+        model.point_integrate_inv_supply = {
+            model.point_period: gauge.point_integrate_inv_supply(model.point_period)
+        }
+        model.point_current_epoch_time = gauge.point_current_epoch_time()
+        model.point_rate = gauge.point_rate()
+        model.point_proportion = gauge.point_proportion()
+
+        model.lpTotalSupply = gauge.lpTotalSupply()
+        model.totalSupply = gauge.totalSupply()
+        model.working_supply = gauge.working_supply()
+        model.is_killed = gauge.is_killed()
+
+        for i in range(gauge.reward_token_length()):
+            token = gauge.reward_tokens(i)
+            model.reward_tokens.append(token)
+            model.reward_rate[token] = gauge.reward_rate(token)
+            model.reward_integral[token] = gauge.reward_integral(token)
+        model.reward_timestamp = gauge.reward_timestamp()
+
+        for addr in map(str, users):
+            point_fraction = gauge.point_integrate_fraction(addr)
+            model.lpBalanceOf[addr] = gauge.balanceOf(addr) - point_fraction
+            model.point_integrate_fraction[addr] = point_fraction
+            model.point_integrate_inv_supply_of[addr] = gauge.point_integrate_inv_supply_of(addr)
+            model.point_integrate_checkpoint_of[addr] = gauge.point_integrate_checkpoint_of(addr)
+            model.working_balances[addr] = gauge.working_balances(addr)
+            model.integrate_inv_supply_of[addr] = gauge.integrate_inv_supply_of(addr)
+            model.integrate_checkpoint_of[addr] = gauge.integrate_checkpoint_of(addr)
+            model.integrate_fraction[addr] = gauge.integrate_fraction(addr)
+            for token in model.reward_tokens:
+                model.reward_integral_for.setdefault(token, {})[addr] = gauge.reward_integral_for(
+                    token, addr
+                )
+                model.claim_data.setdefault(addr, {})[token] = (
+                    gauge.claimable_reward(addr, token) << 128
+                ) + gauge.claimed_reward(addr, token)
+
+        return model
+
+    # global integrals, computed without writing storage
+
+    def _point_integral(self, timestamp):
+        """
+        @return (point_integrate_inv_supply, point_rate, point_current_epoch_time)
+                as `_checkpoint` leaves them at `timestamp`
+        """
+        _point_period_timestamp = self.point_period_timestamp[self.point_period]
+        _point_integrate_inv_supply = self.point_integrate_inv_supply[self.point_period]
+
+        rate = self.point_rate
+        prev_epoch = self.point_current_epoch_time
+        new_rate = rate
+        next_epoch = prev_epoch + WEEK
+        _totalSupply = self.lpTotalSupply
+
+        epoch_time = prev_epoch
+        if timestamp > next_epoch:
+            if _totalSupply > 0:
+                new_rate = self.point_proportion * _totalSupply // WEEK
+            epoch_time = next_epoch
+        stored_rate = new_rate
+
+        if timestamp > _point_period_timestamp and not self.is_killed:
+            prev_week_time = _point_period_timestamp
+            week_time = min((_point_period_timestamp + WEEK) // WEEK * WEEK, timestamp)
+
+            for _ in range(500):
+                dt = week_time - prev_week_time
+                if _totalSupply > 0:
+                    if next_epoch >= prev_week_time and next_epoch < week_time:
+                        _point_integrate_inv_supply += (
+                            rate * (next_epoch - prev_week_time) // _totalSupply
+                        )
+                        rate = new_rate
+                        _point_integrate_inv_supply += rate * (week_time - next_epoch) // _totalSupply
+                    else:
+                        _point_integrate_inv_supply += rate * dt // _totalSupply
+
+                if week_time == timestamp:
+                    break
+                prev_week_time = week_time
+                week_time = min(week_time + WEEK, timestamp)
+
+        return _point_integrate_inv_supply, stored_rate, epoch_time
+
+    def _dao_integral(self, timestamp):
+        """
+        @return `integrate_inv_supply` as `_checkpoint_dao` leaves it at `timestamp`
+        """
+        _period_time = self.period_timestamp[self.period]
+        _integrate_inv_supply = self.integrate_inv_supply[self.period]
+
+        if _period_time == 0:
+            _period_time = self.policy.epoch_start_time(self.policy.epoch_at(timestamp))
+
+        if timestamp > _period_time and not self.is_killed:
+            _working_supply = self.working_supply
+            self.controller.checkpoint_gauge(self.address, timestamp)
+            prev_week_time = _period_time
+
+            for _ in range(500):
+                _epoch = self.policy.epoch_at(prev_week_time)
+                week_time = min(self.policy.epoch_start_time(_epoch + 1), timestamp)
+
+                dt = uint256(week_time - prev_week_time)
+                w = self.controller.gauge_relative_weight(self.address, prev_week_time // WEEK * WEEK)
+
+                if _working_supply > 0:
+                    _integrate_inv_supply += (
+                        self.policy.rate_at(prev_week_time) * w * dt // _working_supply
+                    )
+
+                if week_time == timestamp:
+                    break
+                prev_week_time = week_time
+
+        return _integrate_inv_supply
+
+    def _reward_integrals(self, timestamp):
+        """
+        @return list of `reward_integral` values at `timestamp`, by token index
+        """
+        reward_timestamp = self.reward_timestamp or timestamp
+        integrals = [self.reward_integral.get(token, 0) for token in self.reward_tokens]
+        _working_supply = self.working_supply
+        if _working_supply != 0:
+            dt = uint256(timestamp - reward_timestamp)
+            for i, token in enumerate(self.reward_tokens):
+                integrals[i] += 10 ** 18 * self.reward_rate[token] * dt // _working_supply
+        return integrals
+
+    # checkpoints
+
+    def _checkpoint(self, addr, timestamp):
+        integral, rate, epoch_time = self._point_integral(timestamp)
+        self.point_rate = rate
+        self.point_current_epoch_time = epoch_time
+
+        if self.point_period_timestamp[self.point_period] != timestamp:
+            self.point_period += 1
+            self.point_period_timestamp[self.point_period] = timestamp
+            self.point_integrate_inv_supply[self.point_period] = integral
+
+        if addr is not None:
+            _balance = self.lpBalanceOf.get(addr, 0)
+            amount = (
+                _balance * uint256(integral - self.point_integrate_inv_supply_of.get(addr, 0)) // 10 ** 18
+            )
+            self.totalSupply += amount
+            self.point_integrate_fraction[addr] = self.point_integrate_fraction.get(addr, 0) + amount
+            self.point_integrate_inv_supply_of[addr] = integral
+            self.point_integrate_checkpoint_of[addr] = timestamp
+
+    def _checkpoint_dao(self, addr, timestamp):
+        integral = self._dao_integral(timestamp)
+
+        if self.period_timestamp[self.period] != timestamp:
+            self.period += 1
+            self.period_timestamp[self.period] = timestamp
+            self.integrate_inv_supply[self.period] = integral
+
+        if addr is not None:
+            _working_balance = self.working_balances.get(addr, 0)
+            self.integrate_fraction[addr] = self.integrate_fraction.get(addr, 0) + (
+                _working_balance * uint256(integral - self.integrate_inv_supply_of.get(addr, 0)) // 10 ** 18
+            )
+            self.integrate_inv_supply_of[addr] = integral
+            self.integrate_checkpoint_of[addr] = timestamp
+
+    def _checkpoint_rewards(self, user, claim, timestamp):
+        if not self.reward_tokens:
+            return
+        integrals = self._reward_integrals(timestamp)
+        self.reward_timestamp = timestamp
+        for token, integral in zip(self.reward_tokens, integrals):
+            self.reward_integral[token] = integral
+
+        if user is not None:
+            user_balance = self.working_balances.get(user, 0)
+            for token, integral in zip(self.reward_tokens, integrals):
+                integral_for = self.reward_integral_for.get(token, {}).get(user, 0)
+                new_claimable = 0
+                if integral_for < integral:
+                    self.reward_integral_for.setdefault(token, {})[user] = integral
+                    new_claimable = user_balance * (integral - integral_for) // 10 ** 18
+
+                claim_data = self.claim_data.get(user, {}).get(token, 0)
+                total_claimable = (claim_data >> 128) + new_claimable
+                if total_claimable > 0:
+                    total_claimed = claim_data % 2 ** 128
+                    if claim:
+                        self.claim_data.setdefault(user, {})[token] = total_claimed + total_claimable
+                    elif new_claimable > 0:
+                        self.claim_data.setdefault(user, {})[token] = total_claimed + (
+                            total_claimable << 128
+                        )
+
+    def _update_liquidity_limit(self, addr, l, L, timestamp):
+        voting_balance = self.voting_escrow.balanceOf(addr, timestamp)
+        voting_total = self.voting_escrow.totalSupply(timestamp)
+
+        lim = l * TOKENLESS_PRODUCTION // 100
+        if voting_total > 0:
+            lim += L * voting_balance // voting_total * (100 - TOKENLESS_PRODUCTION) // 100
+
+        lim = min(l, lim)
+        old_bal = self.working_balances.get(addr, 0)
+        self.working_balances[addr] = lim
+        self.working_supply = uint256(self.working_supply + lim - old_bal)
+
+    def _balance_of(self, addr):
+        return self.lpBalanceOf.get(addr, 0) + self.point_integrate_fraction.get(addr, 0)
+
+    # state changes
+
+    def deposit(self, addr, value, timestamp):
+        addr = str(addr)
+        self._checkpoint(addr, timestamp)
+        self._checkpoint_dao(addr, timestamp)
+
+        if value != 0:
+            total_supply = self.totalSupply
+            self._checkpoint_rewards(addr, False, timestamp)
+
+            total_supply += value
+            new_balance = self.lpBalanceOf.get(addr, 0) + value
+            self.lpBalanceOf[addr] = new_balance
+            self.totalSupply = total_supply
+            self.lpTotalSupply += value
+
+            self._update_liquidity_limit(
+                addr, new_balance + self.point_integrate_fraction.get(addr, 0), total_supply, timestamp
+            )
+
+    def withdraw(self, addr, value, timestamp):
+        addr = str(addr)
+        self._checkpoint(addr, timestamp)
+        self._checkpoint_dao(addr, timestamp)
+
+        if value != 0:
+            total_supply = self.totalSupply
+            self._checkpoint_rewards(addr, False, timestamp)
+
+            old_integrate_fraction = self.point_integrate_fraction.get(addr, 0)
+            new_integrate_fraction = 0
+            if old_integrate_fraction > 0:
+                point_decrease = old_integrate_fraction * value // self.lpBalanceOf[addr]
+                total_supply = uint256(total_supply - point_decrease)
+                new_integrate_fraction = old_integrate_fraction - point_decrease
+                self.point_integrate_fraction[addr] = new_integrate_fraction
+
+            total_supply = uint256(total_supply - value)
+            new_balance = uint256(self.lpBalanceOf.get(addr, 0) - value)
+            self.lpBalanceOf[addr] = new_balance
+            self.totalSupply = total_supply
+            self.lpTotalSupply = uint256(self.lpTotalSupply - value)
+
+            self._update_liquidity_limit(addr, new_balance + new_integrate_fraction, total_supply, timestamp)
+
+    def notifySavingsChange(self, addr, new_balance, timestamp):
+        """
+        @param new_balance LP token balance of `addr` after the change
+        """
+        addr = str(addr)
+        old_balance = self.lpBalanceOf.get(addr, 0)
+        if old_balance < new_balance:
+            self.deposit(addr, new_balance - old_balance, timestamp)
+        else:
+            self.withdraw(addr, old_balance - new_balance, timestamp)
+
+    def notifySavingsChanges(self, changes, timestamp):
+        """
+        Mirror `notifySavingsChanges`. The gauge is checkpointed once, and the
+        point epoch is not advanced again for each user.
+
+        @param changes list of (addr, new_balance), in call order
+        """
+        self._checkpoint(None, timestamp)
+        self._checkpoint_dao(None, timestamp)
+        self._checkpoint_rewards(None, False, timestamp)
+        point_rate, epoch_time = self.point_rate, self.point_current_epoch_time
+        for addr, new_balance in changes:
+            self.notifySavingsChange(addr, new_balance, timestamp)
+            self.point_rate, self.point_current_epoch_time = point_rate, epoch_time
+
+    def user_checkpoint(self, addr, timestamp):
+        addr = str(addr)
+        self._checkpoint(addr, timestamp)
+        self._checkpoint_dao(addr, timestamp)
+        self._checkpoint_rewards(addr, False, timestamp)
+        self._update_liquidity_limit(addr, self._balance_of(addr), self.totalSupply, timestamp)
+
+    def claimable_tokens(self, addr, timestamp, minted=0):
+        """
+        @param minted `Minter.minted(addr, gauge)`
+        """
+        addr = str(addr)
+        self._checkpoint(addr, timestamp)
+        self._checkpoint_dao(addr, timestamp)
+        return uint256(self.integrate_fraction.get(addr, 0) - minted)
+
+    def balance_of_write(self, addr, timestamp):
+        addr = str(addr)
+        self._checkpoint(addr, timestamp)
+        return self._balance_of(addr)
+
+    def claimable_reward_write(self, addr, token, timestamp):
+        addr, token = str(addr), str(token)
+        if self.reward_tokens:
+            self._checkpoint_rewards(addr, False, timestamp)
+        return self.claimable_reward(addr, token)
+
+    def claim_rewards(self, addr, timestamp):
+        addr = str(addr)
+        self._checkpoint_rewards(addr, True, timestamp)
+        self._checkpoint_dao(addr, timestamp)
+        self._checkpoint(addr, timestamp)
+        self._update_liquidity_limit(addr, self._balance_of(addr), self.totalSupply, timestamp)
+
+    def kick(self, addr, timestamp):
+        """Mirror a successful `kick`; the eligibility checks are not repeated."""
+        addr = str(addr)
+        self._checkpoint(addr, timestamp)
+        self._checkpoint_dao(addr, timestamp)
+        self._update_liquidity_limit(addr, self._balance_of(addr), self.totalSupply, timestamp)
+
+    def kick_many(self, addrs, timestamp):
+        """
+        Mirror a successful `kick_many`. The gauge is checkpointed once, and
+        the point epoch is not advanced again for each user.
+
+        @param addrs addresses to kick, in call order
+        """
+        self._checkpoint(None, timestamp)
+        self._checkpoint_dao(None, timestamp)
+        point_rate, epoch_time = self.point_rate, self.point_current_epoch_time
+        for addr in addrs:
+            self.kick(addr, timestamp)
+            self.point_rate, self.point_current_epoch_time = point_rate, epoch_time
+
+    def add_reward_token(self, token, rate, timestamp):
+        token = str(token)
+        if token in self.reward_tokens:
+            raise Revert("dev: the reward token is added")
+        if len(self.reward_tokens) >= MAX_REWARDS:
+            raise Revert("dev: reward token is zero or exceed max length")
+        if rate >= 2 ** 96:
+            raise Revert("dev: reward rate too high")
+        self._checkpoint_rewards(None, False, timestamp)
+        self.reward_tokens.append(token)
+        self.reward_rate[token] = rate
+        self.reward_timestamp = timestamp
+
+    def set_reward_rate(self, token, rate, timestamp):
+        token = str(token)
+        if token not in self.reward_tokens:
+            raise Revert("dev: the reward token must be added")
+        if rate >= 2 ** 96:
+            raise Revert("dev: reward rate too high")
+        self._checkpoint_rewards(None, False, timestamp)
+        self.reward_rate[token] = rate
+
+    def set_point_proportion(self, point_proportion, timestamp):
+        self._checkpoint(None, timestamp)
+        self.point_proportion = point_proportion
+
+    def set_killed(self, is_killed, timestamp):
+        self.is_killed = is_killed
+
+    def replay(self, actions):
+        """
+        Apply a stream of `(method, args, timestamp)` actions in order, e.g.
+        `("notifySavingsChange", (addr, new_balance), tx.timestamp)`.
+        """
+        for method, args, timestamp in actions:
+            getattr(self, method)(*args, timestamp)
+
+    # views
+
+    def balanceOf(self, addr):
+        addr = str(addr)
+        return self._balance_of(addr)
+
+    def integrate_checkpoint(self):
+        return self.period_timestamp[self.period]
+
+    def claimed_reward(self, addr, token):
+        return self.claim_data.get(str(addr), {}).get(str(token), 0) % 2 ** 128
+
+    def claimable_reward(self, addr, token):
+        return self.claim_data.get(str(addr), {}).get(str(token), 0) >> 128
+
+    def claimable_all(self, timestamp, minted=None):
+        """
+        Claimable amounts of every known user at `timestamp`, leaving the
+        gauge state untouched.
+
+        Equivalent to calling `claimable_tokens`, `balance_of_write` and
+        `claimable_reward_write` for each user, but the global integrals are
+        evaluated once for the whole batch.
+
+        @param timestamp Evaluation time, no earlier than the last applied action
+        @param minted Optional mapping of `Minter.minted(addr, gauge)` per user
+        @return dict of address -> Claimable(tokens, points, rewards), where
+                `rewards` maps each reward token to its claimable amount
+        """
+        minted = {str(addr): value for addr, value in (minted or {}).items()}
+        point_integral = self._point_integral(timestamp)[0]
+        dao_integral = self._dao_integral(timestamp)
+        reward_integrals = self._reward_integrals(timestamp)
+
+        users = set(self.lpBalanceOf) | set(self.working_balances) | set(self.claim_data)
+        result = {}
+        for addr in users:
+            balance = self.lpBalanceOf.get(addr, 0)
+            points = self._balance_of(addr) + (
+                balance * (point_integral - self.point_integrate_inv_supply_of.get(addr, 0)) // 10 ** 18
+            )
+
+            working_balance = self.working_balances.get(addr, 0)
+            tokens = uint256(
+                self.integrate_fraction.get(addr, 0)
+                + working_balance * (dao_integral - self.integrate_inv_supply_of.get(addr, 0)) // 10 ** 18
+                - minted.get(addr, 0)
+            )
+
+            rewards = {}
+            for token, integral in zip(self.reward_tokens, reward_integrals):
+                integral_for = self.reward_integral_for.get(token, {}).get(addr, 0)
+                claimable = self.claimable_reward(addr, token)
+                if integral_for < integral:
+                    claimable += working_balance * (integral - integral_for) // 10 ** 18
+                rewards[token] = claimable
+
+            result[addr] = Claimable(tokens, points, rewards)
+
+        return result
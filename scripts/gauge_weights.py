@@ -0,0 +1,84 @@
+"""
+Gauge weight history
+====================
+Client helper for `GaugeController.gauge_relative_weights`.
+
+The view returns a page of `WEIGHT_PAGE` gauges at up to `WEIGHT_TIMES`
+timestamps per call. `gauge_weights` pages through every gauge and every
+requested timestamp, so weights for `n` gauges over `m` weeks cost
+`ceil(n / 16) * ceil(m / 4)` calls instead of `n * m` calls to
+`gauge_relative_weight`.
+
+Gauges are keyed by their checksum address string, so look them up with
+`gauge.address` or `str(gauge)` rather than a brownie `Contract`.
+"""
+
+from collections import namedtuple
+
+WEEK = 604800
+WEIGHT_PAGE = 16
+WEIGHT_TIMES = 4
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+GaugeWeights = namedtuple(
+    "GaugeWeights", ["times", "relative_weights", "gauge_weights", "type_weights", "totals"]
+)
+
+
+def _pages(values, size):
+    for i in range(0, len(values), size):
+        yield values[i : i + size]
+
+
+def gauge_weights(gauge_controller, times, block_identifier=None):
+    """
+    Read relative weights, gauge weights, type weights and totals of all gauges.
+
+    @param gauge_controller `GaugeController` contract object
+    @param times Non-zero timestamps in the past or present
+    @param block_identifier Block to query at, latest if not given
+    @return `GaugeWeights` where `times` and `totals` are lists and the other
+            fields map each gauge checksum address string to a list with
+            one value per time
+    """
+    times = [int(t) for t in times]
+    if not all(times):
+        raise ValueError("Timestamps must be non-zero")
+
+    kwargs = {} if block_identifier is None else {"block_identifier": block_identifier}
+    n_gauges = gauge_controller.n_gauges(**kwargs)
+    relative_weights, weights, type_weights = {}, {}, {}
+    totals = []
+
+    for page in _pages(times, WEIGHT_TIMES):
+        query = page + [0] * (WEIGHT_TIMES - len(page))
+        for start in range(0, n_gauges, WEIGHT_PAGE):
+            gauges, relative, gauge, gauge_type, total = gauge_controller.gauge_relative_weights(
+                start, query, **kwargs
+            )
+            for i, addr in enumerate(gauges):
+                if addr == ZERO_ADDRESS:
+                    break
+                addr = str(addr)
+                relative_weights.setdefault(addr, []).extend(relative[i][: len(page)])
+                weights.setdefault(addr, []).extend(gauge[i][: len(page)])
+                type_weights.setdefault(addr, []).extend(gauge_type[i][: len(page)])
+        if not n_gauges:
+            total = gauge_controller.gauge_relative_weights(0, query, **kwargs)[-1]
+        totals.extend(total[: len(page)])
+
+    return GaugeWeights(times, relative_weights, weights, type_weights, totals)
+
+
+def weekly_weights(gauge_controller, start, n_weeks, block_identifier=None):
+    """
+    Weights of all gauges at the `n_weeks` week boundaries starting at `start`.
+
+    `start` is rounded down to a week, which must not be the zero week as the
+    controller reads a zero timestamp as padding.
+    """
+    first = int(start) // WEEK * WEEK
+    if not first:
+        raise ValueError("Start must be at least one week")
+    times = list(range(first, first + n_weeks * WEEK, WEEK))
+    return gauge_weights(gauge_controller, times, block_identifier)
@@ -0,0 +1,125 @@
+"""
+Reward sweeper
+==============
+Claims the rewards of many accounts through `RewardHelper.claim_rewards_for_many`.
+
+Every account is given with the gauges to claim from. Each (account, gauge) pair
+is one entry of the batch, and the pairs of one account are kept in the same
+batch. Accounts are packed into batches greedily, so that every batch stays
+within `MAX_PAIRS` pairs and within the gas limit:
+
+* the gas of an empty call is estimated once, as the fixed cost of a batch
+* the gas of each account alone is estimated, and the fixed cost subtracted
+* a batch is closed when the next account would go over `max_gas`
+
+An account estimated alone also pays for the gauge checks and the first touch
+of each contract, which a batch only pays once, so the sums are upper bounds.
+
+`mint_for` only mints for accounts that allowed the helper with
+`Minter.toggle_approve_mint`. Reward tokens are claimed for every account.
+
+The accounts are read from a JSON file mapping each address to its gauges, and
+the batches are sent with
+
+    brownie run scripts/reward_sweeper.py main claims.json deployments.json sweeper --network mainnet
+"""
+
+import json
+
+from brownie import ZERO_ADDRESS
+
+MAX_PAIRS = 100
+
+DEFAULT_MAX_GAS = 12_000_000
+
+
+def pad(pairs):
+    """
+    Split (account, gauge) pairs into the padded call arguments.
+
+    @return (addrs, gauges) lists of length `MAX_PAIRS`
+    """
+    padding = [ZERO_ADDRESS] * (MAX_PAIRS - len(pairs))
+    return [i[0] for i in pairs] + padding, [i[1] for i in pairs] + padding
+
+
+def chunk_claims(reward_helper, claims, sender, max_gas=DEFAULT_MAX_GAS):
+    """
+    Pack accounts into batches of (account, gauge) pairs.
+
+    @param reward_helper `RewardHelper` contract object
+    @param claims dict of account -> list of gauge addresses
+    @param sender Account the batches are estimated from
+    @param max_gas Gas limit of one batch
+    @return list of (pairs, gas) tuples, `gas` being the estimate of the batch
+    """
+    fn = reward_helper.claim_rewards_for_many
+    base = fn.estimate_gas(*pad([]), {"from": sender})
+
+    chunks = []
+    pairs = []
+    gas = base
+    for addr, gauges in claims.items():
+        user_pairs = [(addr, gauge) for gauge in gauges]
+        if not user_pairs:
+            continue
+        if len(user_pairs) > MAX_PAIRS:
+            raise ValueError(f"{addr} has more than {MAX_PAIRS} gauges")
+
+        user_gas = fn.estimate_gas(*pad(user_pairs), {"from": sender}) - base
+        if base + user_gas > max_gas:
+            raise ValueError(f"claiming for {addr} needs more than {max_gas} gas")
+
+        if len(pairs) + len(user_pairs) > MAX_PAIRS or gas + user_gas > max_gas:
+            chunks.append((pairs, gas))
+            pairs = []
+            gas = base
+        pairs += user_pairs
+        gas += user_gas
+
+    if pairs:
+        chunks.append((pairs, gas))
+    return chunks
+
+
+def sweep(reward_helper, claims, account, max_gas=DEFAULT_MAX_GAS, gas_buffer=1.2):
+    """
+    Claim for every account in `claims`, one transaction per batch.
+
+    The batches are sent back to back with consecutive nonces, and then awaited
+    together.
+
+    @return list of transaction receipts
+    """
+    from brownie import web3
+
+    chunks = chunk_claims(reward_helper, claims, account, max_gas)
+    nonce = web3.eth.get_transaction_count(str(account), "pending")
+    pending = []
+    for i, (pairs, gas) in enumerate(chunks):
+        tx = reward_helper.claim_rewards_for_many(
+            *pad(pairs),
+            {
+                "from": account,
+                "nonce": nonce + i,
+                "gas_limit": min(int(gas * gas_buffer), max_gas),
+                "required_confs": 0,
+            },
+        )
+        pending.append(tx)
+    for tx in pending:
+        tx.wait(1)
+    return pending
+
+
+def main(claims_json, deployments_json, account_id="sweeper", max_gas=DEFAULT_MAX_GAS):
+    from brownie import RewardHelper, accounts
+
+    with open(claims_json) as fp:
+        claims = json.load(fp)
+    with open(deployments_json) as fp:
+        deployments = json.load(fp)
+
+    reward_helper = RewardHelper.at(deployments["RewardHelper"])
+    for tx in sweep(reward_helper, claims, accounts.load(account_id), int(max_gas)):
+        print(f"{tx.txid}: {tx.gas_used} gas, status {tx.status}")
@@ -0,0 +1,97 @@
+"""
+veFYO balance projection
+========================
+Vectorized projection of `VotingEscrow.balanceOf(addr, t)` and
+`VotingEscrow.totalSupply(t)` for every lock holder over a grid of timestamps.
+
+Inputs are the `locked` (amount, end) pairs and the last `user_point_history`
+entry (bias, slope, ts) of each holder, plus the latest global `point_history`
+entry. Voting power exceeds the int64 range, so all arithmetic is done on
+integer arrays of dtype=object: values are exact and follow the contract's
+int128 semantics (no intermediate clamping in `supply_at`, the final value
+floored at zero, and the 255-week iteration cap).
+"""
+
+import numpy as np
+
+from scripts.voting_escrow_model import MAXTIME, WEEK
+
+
+def _int_array(values):
+    return np.array([int(i) for i in np.ravel(values)], dtype=object)
+
+
+def week_grid(start, n_weeks):
+    """
+    Timestamps of the next `n_weeks` week boundaries strictly after `start`.
+    """
+    first = (int(start) // WEEK + 1) * WEEK
+    return _int_array(range(first, first + n_weeks * WEEK, WEEK))
+
+
+def project_balances(bias, slope, ts, times):
+    """
+    Voting power of every user at every time, as `balanceOf(addr, t)`.
+
+    @param bias, slope, ts Last user point of each user (users with no lock
+           have a zero point)
+    @param times Timestamps to evaluate at, each no earlier than every `ts`
+    @return users x times array
+    """
+    bias, slope, ts, times = map(_int_array, (bias, slope, ts, times))
+    if len(ts) and len(times) and min(times) < max(ts):
+        raise ValueError("Cannot project balances before the last user checkpoint")
+
+    balances = bias[:, None] - slope[:, None] * (times[None, :] - ts[:, None])
+    return np.maximum(balances, 0)
+
+
+def slope_changes_from_locks(amount, end, after):
+    """
+    Rebuild the scheduled `slope_changes` from the active locks.
+
+    @param amount, end Locked amount and unlock time of every user
+    @param after Only changes strictly after this time are returned
+    @return (weeks, d_slope) arrays sorted by week
+    """
+    amount, end = _int_array(amount), _int_array(end)
+    active = (end > int(after)) & (amount > 0)
+    weeks, index = np.unique(end[active].astype(np.int64), return_inverse=True)
+    d_slope = np.zeros(len(weeks), dtype=object)
+    np.subtract.at(d_slope, index, amount[active] // MAXTIME)
+    return _int_array(weeks), d_slope
+
+
+def project_total_supply(point, weeks, d_slope, times):
+    """
+    Total voting power at every time, as `totalSupply(t)`.
+
+    @param point Latest global point as (bias, slope, ts)
+    @param weeks, d_slope Scheduled slope changes, see `slope_changes_from_locks`
+    @param times Timestamps to evaluate at, each no earlier than `point.ts`
+    @return array of total supply per time
+    """
+    bias, slope, ts = (int(i) for i in point[:3])
+    weeks, d_slope, times = map(_int_array, (weeks, d_slope, times))
+    if len(times) and min(times) < ts:
+        raise ValueError("Cannot project supply before the last global checkpoint")
+
+    # `supply_at` stops after 255 week boundaries
+    times = np.minimum(times, (ts // WEEK + 255) * WEEK)
+
+    # a slope change at week `w` applies to the bias from `w` onwards
+    applied = (weeks[None, :] > ts) & (weeks[None, :] < times[:, None])
+    elapsed = np.where(applied, times[:, None] - weeks[None, :], 0)
+    supply = bias - slope * (times - ts) - (elapsed * d_slope[None, :]).sum(axis=1)
+    return np.maximum(supply, 0)
+
+
+def project(locked_amount, locked_end, bias, slope, ts, point, times):
+    """
+    Project voting power for all holders and the total supply in one pass.
+
+    @return (users x times balances, total supply per time)
+    """
+    balances = project_balances(bias, slope, ts, times)
+    weeks, d_slope = slope_changes_from_locks(locked_amount, locked_end, point[2])
+    return balances, project_total_supply(point, weeks, d_slope, times)
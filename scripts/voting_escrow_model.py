@@ -0,0 +1,380 @@
+"""
+VotingEscrow reference model
+============================
+Pure-Python reproduction of `contracts/VotingEscrow.vy`.
+
+The model keeps the same storage layout as the contract (`point_history`,
+`user_point_history`, `slope_changes`, ...) and repeats the contract arithmetic
+step by step, including int128 / uint256 range checks, truncating division and
+the block-number extrapolation used by the `*At` methods. Every state-changing
+method takes the `timestamp` and `block` of the transaction it mirrors, and the
+block-based views take the current chain head as `now_timestamp` / `now_block`.
+
+Calls that would revert on-chain raise `Revert`.
+"""
+
+from collections import namedtuple
+
+WEEK = 7 * 86400
+MAXTIME = 4 * 365 * 86400
+MULTIPLIER = 10 ** 18
+
+DEPOSIT_FOR_TYPE = 0
+CREATE_LOCK_TYPE = 1
+INCREASE_LOCK_AMOUNT = 2
+INCREASE_UNLOCK_TIME = 3
+
+INT128_MIN = -(2 ** 127)
+INT128_MAX = 2 ** 127 - 1
+UINT256_MAX = 2 ** 256 - 1
+
+Point = namedtuple("Point", ["bias", "slope", "ts", "blk"])
+LockedBalance = namedtuple("LockedBalance", ["amount", "end"])
+
+EMPTY_POINT = Point(0, 0, 0, 0)
+EMPTY_LOCKED = LockedBalance(0, 0)
+
+
+class Revert(Exception):
+    """Raised where the contract call would revert."""
+
+
+def int128(value):
+    if not INT128_MIN <= value <= INT128_MAX:
+        raise Revert("int128 overflow")
+    return value
+
+
+def uint256(value):
+    if not 0 <= value <= UINT256_MAX:
+        raise Revert("uint256 overflow")
+    return value
+
+
+def sdiv(a, b):
+    """Signed division truncating towards zero, as the EVM `SDIV` opcode."""
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b > 0) else -q
+
+
+class VotingEscrowModel:
+    def __init__(self, timestamp, block):
+        self.supply = 0
+        self.locked = {}
+        self.epoch = 0
+        self.point_history = {0: Point(0, 0, timestamp, block)}
+        self.user_point_history = {}
+        self.user_point_epoch = {}
+        self.slope_changes = {}
+        self.week_epoch = {}
+
+    # storage accessors returning the zero value for unset keys
+
+    def get_locked(self, addr):
+        return self.locked.get(addr, EMPTY_LOCKED)
+
+    def get_point(self, epoch):
+        return self.point_history.get(epoch, EMPTY_POINT)
+
+    def get_user_point(self, addr, epoch):
+        return self.user_point_history.get(addr, {}).get(epoch, EMPTY_POINT)
+
+    def get_user_point_epoch(self, addr):
+        return self.user_point_epoch.get(addr, 0)
+
+    def get_slope_change(self, t):
+        return self.slope_changes.get(t, 0)
+
+    def get_last_user_slope(self, addr):
+        return self.get_user_point(addr, self.get_user_point_epoch(addr)).slope
+
+    def user_point_history__ts(self, addr, idx):
+        return self.get_user_point(addr, idx).ts
+
+    def locked__end(self, addr):
+        return self.get_locked(addr).end
+
+    # state changes
+
+    def _checkpoint(self, addr, old_locked, new_locked, timestamp, block):
+        u_old_slope = u_old_bias = 0
+        u_new_slope = u_new_bias = 0
+        old_dslope = new_dslope = 0
+        _epoch = self.epoch
+
+        if addr is not None:
+            if old_locked.end > timestamp and old_locked.amount > 0:
+                u_old_slope = sdiv(old_locked.amount, MAXTIME)
+                u_old_bias = int128(u_old_slope * int128(old_locked.end - timestamp))
+            if new_locked.end > timestamp and new_locked.amount > 0:
+                u_new_slope = sdiv(new_locked.amount, MAXTIME)
+                u_new_bias = int128(u_new_slope * int128(new_locked.end - timestamp))
+
+            old_dslope = self.get_slope_change(old_locked.end)
+            if new_locked.end != 0:
+                if new_locked.end == old_locked.end:
+                    new_dslope = old_dslope
+                else:
+                    new_dslope = self.get_slope_change(new_locked.end)
+
+        last_point = Point(0, 0, timestamp, block)
+        if _epoch > 0:
+            last_point = self.get_point(_epoch)
+        last_checkpoint = last_point.ts
+        initial_last_point = last_point
+        block_slope = 0
+        if timestamp > last_point.ts:
+            block_slope = MULTIPLIER * uint256(block - last_point.blk) // (timestamp - last_point.ts)
+
+        bias, slope = last_point.bias, last_point.slope
+        blk = last_point.blk
+        t_i = (last_checkpoint // WEEK) * WEEK
+        for _ in range(255):
+            t_i += WEEK
+            d_slope = 0
+            if t_i > timestamp:
+                t_i = timestamp
+            else:
+                d_slope = self.get_slope_change(t_i)
+            bias = int128(bias - int128(slope * int128(uint256(t_i - last_checkpoint))))
+            slope = int128(slope + d_slope)
+            if bias < 0:
+                bias = 0
+            if slope < 0:
+                slope = 0
+            last_checkpoint = t_i
+            blk = initial_last_point.blk + block_slope * uint256(t_i - initial_last_point.ts) // MULTIPLIER
+            _epoch += 1
+            if t_i == timestamp:
+                blk = block
+                if t_i % WEEK == 0:
+                    self.week_epoch[t_i] = _epoch
+                break
+            else:
+                self.point_history[_epoch] = Point(bias, slope, t_i, blk)
+                self.week_epoch[t_i] = _epoch
+
+        self.epoch = _epoch
+
+        if addr is not None:
+            slope = int128(slope + int128(u_new_slope - u_old_slope))
+            bias = int128(bias + int128(u_new_bias - u_old_bias))
+            if slope < 0:
+                slope = 0
+            if bias < 0:
+                bias = 0
+
+        self.point_history[_epoch] = Point(bias, slope, t_i, blk)
+
+        if addr is not None:
+            if old_locked.end > timestamp:
+                old_dslope = int128(old_dslope + u_old_slope)
+                if new_locked.end == old_locked.end:
+                    old_dslope = int128(old_dslope - u_new_slope)
+                self.slope_changes[old_locked.end] = old_dslope
+
+            if new_locked.end > timestamp:
+                if new_locked.end > old_locked.end:
+                    new_dslope = int128(new_dslope - u_new_slope)
+                    self.slope_changes[new_locked.end] = new_dslope
+
+            user_epoch = self.get_user_point_epoch(addr) + 1
+            self.user_point_epoch[addr] = user_epoch
+            self.user_point_history.setdefault(addr, {})[user_epoch] = Point(
+                u_new_bias, u_new_slope, timestamp, block
+            )
+
+    def _deposit_for(self, addr, value, unlock_time, locked_balance, timestamp, block):
+        supply_before = self.supply
+        self.supply = uint256(supply_before + value)
+        old_locked = locked_balance
+        _locked = LockedBalance(
+            int128(locked_balance.amount + int128(value)),
+            unlock_time if unlock_time != 0 else locked_balance.end,
+        )
+        self.locked[addr] = _locked
+        self._checkpoint(addr, old_locked, _locked, timestamp, block)
+
+    def checkpoint(self, timestamp, block):
+        self._checkpoint(None, EMPTY_LOCKED, EMPTY_LOCKED, timestamp, block)
+
+    def deposit_for(self, addr, value, timestamp, block):
+        _locked = self.get_locked(addr)
+        if value == 0:
+            raise Revert("dev: need non-zero value")
+        if _locked.amount <= 0:
+            raise Revert("No existing lock found")
+        if _locked.end <= timestamp:
+            raise Revert("Cannot add to expired lock. Withdraw")
+        self._deposit_for(addr, value, 0, _locked, timestamp, block)
+
+    def create_lock(self, addr, value, unlock_time, timestamp, block):
+        unlock_time = (unlock_time // WEEK) * WEEK
+        _locked = self.get_locked(addr)
+        if value == 0:
+            raise Revert("dev: need non-zero value")
+        if _locked.amount != 0:
+            raise Revert("Withdraw old tokens first")
+        if unlock_time <= timestamp:
+            raise Revert("Can only lock until time in the future")
+        if unlock_time > timestamp + MAXTIME:
+            raise Revert("Voting lock can be 4 years max")
+        self._deposit_for(addr, value, unlock_time, _locked, timestamp, block)
+
+    def increase_amount(self, addr, value, timestamp, block):
+        _locked = self.get_locked(addr)
+        if value == 0:
+            raise Revert("dev: need non-zero value")
+        if _locked.amount <= 0:
+            raise Revert("No existing lock found")
+        if _locked.end <= timestamp:
+            raise Revert("Cannot add to expired lock. Withdraw")
+        self._deposit_for(addr, value, 0, _locked, timestamp, block)
+
+    def increase_unlock_time(self, addr, unlock_time, timestamp, block):
+        _locked = self.get_locked(addr)
+        unlock_time = (unlock_time // WEEK) * WEEK
+        if _locked.end <= timestamp:
+            raise Revert("Lock expired")
+        if _locked.amount <= 0:
+            raise Revert("Nothing is locked")
+        if unlock_time <= _locked.end:
+            raise Revert("Can only increase lock duration")
+        if unlock_time > timestamp + MAXTIME:
+            raise Revert("Voting lock can be 4 years max")
+        self._deposit_for(addr, 0, unlock_time, _locked, timestamp, block)
+
+    def withdraw(self, addr, timestamp, block):
+        _locked = self.get_locked(addr)
+        if timestamp < _locked.end:
+            raise Revert("The lock didn't expire")
+        value = _locked.amount
+        self.locked[addr] = EMPTY_LOCKED
+        self.supply = uint256(self.supply - value)
+        self._checkpoint(addr, _locked, EMPTY_LOCKED, timestamp, block)
+        return value
+
+    # views
+
+    def find_block_epoch(self, block, max_epoch):
+        _min = 0
+        _max = max_epoch
+        for _ in range(128):
+            if _min >= _max:
+                break
+            _mid = (_min + _max + 1) // 2
+            if self.get_point(_mid).blk <= block:
+                _min = _mid
+            else:
+                _max = _mid - 1
+        return _min
+
+    def balanceOf(self, addr, t):
+        _epoch = self.get_user_point_epoch(addr)
+        if _epoch == 0:
+            return 0
+        last_point = self.get_user_point(addr, _epoch)
+        bias = int128(last_point.bias - int128(last_point.slope * int128(uint256(t - last_point.ts))))
+        return max(bias, 0)
+
+    def balanceOfAt(self, addr, block, now_timestamp, now_block):
+        if block > now_block:
+            raise Revert()
+
+        _min = 0
+        _max = self.get_user_point_epoch(addr)
+        for _ in range(128):
+            if _min >= _max:
+                break
+            _mid = (_min + _max + 1) // 2
+            if self.get_user_point(addr, _mid).blk <= block:
+                _min = _mid
+            else:
+                _max = _mid - 1
+
+        upoint = self.get_user_point(addr, _min)
+
+        max_epoch = self.epoch
+        _epoch = self.find_block_epoch(block, max_epoch)
+        point_0 = self.get_point(_epoch)
+        if _epoch < max_epoch:
+            point_1 = self.get_point(_epoch + 1)
+            d_block = uint256(point_1.blk - point_0.blk)
+            d_t = uint256(point_1.ts - point_0.ts)
+        else:
+            d_block = uint256(now_block - point_0.blk)
+            d_t = uint256(now_timestamp - point_0.ts)
+        block_time = point_0.ts
+        if d_block != 0:
+            block_time += d_t * uint256(block - point_0.blk) // d_block
+
+        bias = int128(upoint.bias - int128(upoint.slope * int128(uint256(block_time - upoint.ts))))
+        return max(bias, 0)
+
+    def find_timestamp_epoch(self, t, max_epoch):
+        week = t // WEEK * WEEK
+        _min = self.week_epoch.get(week, 0)
+        _max = max_epoch
+        next_epoch = self.week_epoch.get(week + WEEK, 0)
+        if next_epoch != 0:
+            _max = next_epoch - 1
+        for _ in range(128):
+            if _min >= _max:
+                break
+            _mid = (_min + _max + 1) // 2
+            if self.get_point(_mid).ts <= t:
+                _min = _mid
+            else:
+                _max = _mid - 1
+        return _min
+
+    def supply_at(self, point, t):
+        bias, slope, ts = point.bias, point.slope, point.ts
+        t_i = (ts // WEEK) * WEEK
+        for _ in range(255):
+            t_i += WEEK
+            d_slope = 0
+            if t_i > t:
+                t_i = t
+            else:
+                d_slope = self.get_slope_change(t_i)
+            bias = int128(bias - int128(slope * int128(uint256(t_i - ts))))
+            if t_i == t:
+                break
+            slope = int128(slope + d_slope)
+            ts = t_i
+        return max(bias, 0)
+
+    def totalSupply(self, t):
+        last_point = self.get_point(self.epoch)
+        if t < last_point.ts:
+            if t < self.get_point(0).ts:
+                return 0
+            last_point = self.get_point(self.find_timestamp_epoch(t, self.epoch))
+        return self.supply_at(last_point, t)
+
+    def totalSupplyAt(self, block, now_timestamp, now_block):
+        if block > now_block:
+            raise Revert()
+        _epoch = self.epoch
+        target_epoch = self.find_block_epoch(block, _epoch)
+
+        point = self.get_point(target_epoch)
+        dt = 0
+        if target_epoch < _epoch:
+            point_next = self.get_point(target_epoch + 1)
+            if point.blk != point_next.blk:
+                dt = (
+                    uint256(block - point.blk)
+                    * uint256(point_next.ts - point.ts)
+                    // uint256(point_next.blk - point.blk)
+                )
+        else:
+            if point.blk != now_block:
+                dt = (
+                    uint256(block - point.blk)
+                    * uint256(now_timestamp - point.ts)
+                    // uint256(now_block - point.blk)
+                )
+
+        return self.supply_at(point, point.ts + dt)
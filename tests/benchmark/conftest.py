@@ -0,0 +1,135 @@
+import json
+from pathlib import Path
+
+import pytest
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+RESULTS_PATH = Path(__file__).parents[2] / "reports" / "benchmark.json"
+PROFILE_PATH = RESULTS_PATH.with_suffix(".folded")
+
+
+def folded_stacks(tx, root=None):
+    """
+    Fold the trace of `tx` into call stacks with the gas spent in each frame.
+
+    Frames are the external and internal functions of the call tree, as in
+    `tx.call_trace()`. The gas of a step is the drop in remaining gas until the
+    next step in the same call. A `CALL` step is charged what the caller loses
+    over the whole call minus the gas used inside the callee. Gas not spent by
+    any step (intrinsic cost minus refunds) is reported as `[intrinsic]`.
+
+    @param root Optional frame prepended to every stack, e.g. the benchmark case
+    @return dict of `frame;frame;...` -> gas
+    """
+    trace = tx.trace
+    base = [root] if root else []
+    entry = trace[0].get("fn", tx._full_name())
+    frames = base + [entry]
+    keys = []
+    costs = []
+    calls = []  # [index of the call step, gas used inside the callee] per open external call
+
+    for i, step in enumerate(trace):
+        if i:
+            last = trace[i - 1]
+            if step["depth"] > last["depth"]:
+                frames.append(step.get("fn", "?"))
+            elif step["depth"] < last["depth"]:
+                frames = frames[: -(last["jumpDepth"] + 1)]
+            elif step["jumpDepth"] > last["jumpDepth"]:
+                frames.append(step.get("fn", "?"))
+            elif step["jumpDepth"] < last["jumpDepth"]:
+                frames.pop()
+
+            # a call returning to this step: charge the call step for what the callee did not use
+            while calls and trace[calls[-1][0]]["depth"] == step["depth"]:
+                idx, used = calls.pop()
+                costs[idx] = trace[idx]["gas"] - step["gas"] - used
+                if calls:
+                    calls[-1][1] += costs[idx] + used
+
+        keys.append(";".join(frames))
+        following = trace[i + 1] if i + 1 < len(trace) else None
+        if following is not None and following["depth"] > step["depth"]:
+            costs.append(0)
+            calls.append([i, 0])
+            continue
+        if following is not None and following["depth"] == step["depth"]:
+            costs.append(step["gas"] - following["gas"])
+        else:
+            costs.append(step["gasCost"])
+        if calls:
+            calls[-1][1] += costs[-1]
+
+    stacks = {}
+    for key, cost in zip(keys, costs):
+        stacks[key] = stacks.get(key, 0) + cost
+    intrinsic = tx.gas_used - sum(costs)
+    if intrinsic > 0:
+        stacks[";".join(base + [entry, "[intrinsic]"])] = intrinsic
+    return stacks
+
+
+class GasRecorder:
+    """
+    Collect `gas_used` per benchmark case and check it against the baseline.
+
+    Cases are keyed as `Contract.method[param=value,...]`. A case missing from
+    the baseline is only recorded. With `profile`, the folded call stacks of
+    each case are kept as well, rooted at the case key.
+    """
+
+    def __init__(self, baseline, tolerance, update, profile=False):
+        self.baseline = baseline
+        self.tolerance = tolerance
+        self.update = update
+        self.profile = profile
+        self.results = {}
+        self.stacks = {}
+
+    def record(self, name, tx, **params):
+        key = name
+        if params:
+            key += "[" + ",".join(f"{k}={v}" for k, v in sorted(params.items())) + "]"
+        gas_used = tx.gas_used
+        self.results[key] = gas_used
+        if self.profile:
+            self.stacks.update(folded_stacks(tx, root=key))
+
+        expected = self.baseline.get(key)
+        if not self.update and expected is not None:
+            assert gas_used <= expected * (1 + self.tolerance), (
+                f"{key}: {gas_used} gas, baseline {expected}"
+            )
+        return gas_used
+
+
+@pytest.fixture(scope="session")
+def gas_recorder(request):
+    config = request.config
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    recorder = GasRecorder(
+        baseline,
+        config.getoption("benchmark_tolerance"),
+        config.getoption("benchmark_update"),
+        config.getoption("gas_profile"),
+    )
+
+    yield recorder
+
+    RESULTS_PATH.parent.mkdir(exist_ok=True)
+    profile = "".join(f"{k} {v}\n" for k, v in sorted(recorder.stacks.items()))
+    if hasattr(config, "workerinput"):
+        # xdist worker: partial results are merged by `tests/conftest.py`
+        path = RESULTS_PATH.with_name(f"benchmark-{config.workerinput['workerid']}.json")
+        path.write_text(json.dumps(recorder.results))
+        if recorder.profile:
+            path.with_suffix(".folded").write_text(profile)
+        return
+
+    if recorder.profile:
+        PROFILE_PATH.write_text(profile)
+    RESULTS_PATH.write_text(json.dumps(recorder.results, indent=2, sort_keys=True))
+    if recorder.update:
+        baseline.update(recorder.results)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,69 @@
+import pytest
+from brownie import chain
+
+WEEK = 86400 * 7
+YEAR = 86400 * 365
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+WEEKS_IDLE = [0, 1, 10, 52, 104]
+GAUGE_TYPES = [1, 4, 8]
+
+# long catch-ups over several gauge types exceed the 12M block gas limit in one call
+VOTE_CASES = [
+    (w, n) for w in WEEKS_IDLE for n in GAUGE_TYPES if (w, n) not in [(52, 8), (104, 4), (104, 8)]
+]
+# a voted gauge, or a vote for three gauges, writes more per week: one type fits 52 weeks
+CHECKPOINT_CASES = [(w, n) for w in WEEKS_IDLE for n in GAUGE_TYPES if w < 52 or (w, n) == (52, 1)]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, token, voting_escrow):
+    token.mint(accounts[1], 10 ** 24, {"from": accounts[0]})
+    token.approve(voting_escrow, 10 ** 24, {"from": accounts[1]})
+    voting_escrow.create_lock(10 ** 21, chain.time() + 4 * YEAR - WEEK, {"from": accounts[1]})
+
+
+def _add_types_and_gauges(accounts, gauge_controller, three_gauges, n_types):
+    for i in range(n_types):
+        gauge_controller.add_type(b"Type", 10 ** 18, {"from": accounts[0]})
+    for i, gauge in enumerate(three_gauges):
+        gauge_controller.add_gauge(gauge, i % n_types, 10 ** 18, {"from": accounts[0]})
+
+
+@pytest.mark.parametrize("weeks,n_types", VOTE_CASES)
+def test_vote_for_gauge_weights(
+    accounts, gauge_controller, three_gauges, gas_recorder, weeks, n_types
+):
+    _add_types_and_gauges(accounts, gauge_controller, three_gauges, n_types)
+    chain.sleep(weeks * WEEK)
+    tx = gauge_controller.vote_for_gauge_weights(three_gauges[0], 5000, {"from": accounts[1]})
+    gas_recorder.record(
+        "GaugeController.vote_for_gauge_weights", tx, weeks=weeks, n_types=n_types
+    )
+
+
+@pytest.mark.parametrize("weeks,n_types", CHECKPOINT_CASES)
+def test_checkpoint_gauge(accounts, gauge_controller, three_gauges, gas_recorder, weeks, n_types):
+    _add_types_and_gauges(accounts, gauge_controller, three_gauges, n_types)
+    gauge_controller.vote_for_gauge_weights(three_gauges[0], 5000, {"from": accounts[1]})
+    chain.sleep(weeks * WEEK)
+    tx = gauge_controller.checkpoint_gauge(three_gauges[0], {"from": accounts[0]})
+    gas_recorder.record("GaugeController.checkpoint_gauge", tx, weeks=weeks, n_types=n_types)
+
+
+@pytest.mark.parametrize("weeks,n_types", CHECKPOINT_CASES)
+def test_vote_for_many_gauge_weights(
+    accounts, gauge_controller, three_gauges, gas_recorder, weeks, n_types
+):
+    _add_types_and_gauges(accounts, gauge_controller, three_gauges, n_types)
+    chain.sleep(weeks * WEEK)
+    gauges = list(three_gauges) + [ZERO_ADDRESS] * 17
+    weights = [3000, 3000, 4000] + [0] * 17
+    tx = gauge_controller.vote_for_many_gauge_weights(gauges, weights, {"from": accounts[1]})
+    gas_recorder.record(
+        "GaugeController.vote_for_many_gauge_weights",
+        tx,
+        weeks=weeks,
+        n_types=n_types,
+        n_gauges=len(three_gauges),
+    )
@@ -0,0 +1,133 @@
+import pytest
+from brownie import ZERO_ADDRESS, chain
+from brownie_tokens import ERC20
+
+WEEK = 86400 * 7
+YEAR = 86400 * 365
+
+WEEKS_IDLE = [0, 1, 10, 52, 104]
+REWARD_TOKENS = [0, 1, 4, 8]
+USERS = [1, 5]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, token, voting_escrow, gauge_controller, gauge_v3, coin_deposit, mock_lp_token):
+    gauge_controller.add_type(b"Liquidity", 10 ** 18, {"from": accounts[0]})
+    gauge_controller.add_gauge(gauge_v3, 0, 10 ** 18, {"from": accounts[0]})
+
+    for acct in accounts[:5]:
+        coin_deposit.mint(acct, 10 ** 24, {"from": accounts[0]})
+        coin_deposit.approve(mock_lp_token, 2 ** 256 - 1, {"from": acct})
+        token.mint(acct, 10 ** 22, {"from": accounts[0]})
+        token.approve(voting_escrow, 10 ** 22, {"from": acct})
+        voting_escrow.create_lock(10 ** 21, chain.time() + 4 * YEAR - WEEK, {"from": acct})
+
+
+# Every setup transaction is followed by a second, so rewards and integrals
+# accrue before the next one. Otherwise whether storage goes from zero to
+# non-zero, and with it the gas, depends on how fast the test runs.
+
+
+def _add_rewards(accounts, gauge_v3, n_rewards):
+    for i in range(n_rewards):
+        coin = ERC20()
+        coin._mint_for_testing(gauge_v3, 10 ** 30)
+        gauge_v3.add_reward_token(coin, 10 ** 15, {"from": accounts[0]})
+        chain.sleep(1)
+
+
+def _deposit(accounts, mock_lp_token, n_users):
+    for acct in accounts[:n_users]:
+        mock_lp_token.deposit(10 ** 21, {"from": acct})
+        chain.sleep(1)
+
+
+@pytest.mark.parametrize("n_users", USERS)
+@pytest.mark.parametrize("n_rewards", REWARD_TOKENS)
+@pytest.mark.parametrize("weeks", WEEKS_IDLE)
+def test_deposit(accounts, gauge_v3, mock_lp_token, gas_recorder, weeks, n_rewards, n_users):
+    _add_rewards(accounts, gauge_v3, n_rewards)
+    _deposit(accounts, mock_lp_token, n_users)
+    chain.sleep(weeks * WEEK)
+    tx = mock_lp_token.deposit(10 ** 21, {"from": accounts[0]})
+    gas_recorder.record(
+        "LiquidityGaugeV3.deposit", tx, weeks=weeks, n_rewards=n_rewards, n_users=n_users
+    )
+
+
+@pytest.mark.parametrize("n_rewards", REWARD_TOKENS)
+@pytest.mark.parametrize("weeks", WEEKS_IDLE)
+def test_withdraw(accounts, gauge_v3, mock_lp_token, gas_recorder, weeks, n_rewards):
+    _add_rewards(accounts, gauge_v3, n_rewards)
+    _deposit(accounts, mock_lp_token, 2)
+    chain.sleep(weeks * WEEK)
+    tx = mock_lp_token.withdraw(10 ** 20, {"from": accounts[0]})
+    gas_recorder.record("LiquidityGaugeV3.withdraw", tx, weeks=weeks, n_rewards=n_rewards)
+
+
+@pytest.mark.parametrize("n_rewards", REWARD_TOKENS)
+@pytest.mark.parametrize("weeks", WEEKS_IDLE)
+def test_transfer(accounts, gauge_v3, mock_lp_token, gas_recorder, weeks, n_rewards):
+    _add_rewards(accounts, gauge_v3, n_rewards)
+    _deposit(accounts, mock_lp_token, 2)
+    chain.sleep(weeks * WEEK)
+    tx = mock_lp_token.transfer(accounts[1], 10 ** 20, {"from": accounts[0]})
+    gas_recorder.record("LiquidityGaugeV3.transfer", tx, weeks=weeks, n_rewards=n_rewards)
+
+
+@pytest.mark.parametrize("n_rewards", REWARD_TOKENS)
+@pytest.mark.parametrize("weeks", WEEKS_IDLE)
+def test_user_checkpoint(accounts, gauge_v3, mock_lp_token, gas_recorder, weeks, n_rewards):
+    _add_rewards(accounts, gauge_v3, n_rewards)
+    _deposit(accounts, mock_lp_token, 2)
+    chain.sleep(weeks * WEEK)
+    tx = gauge_v3.user_checkpoint(accounts[0], {"from": accounts[0]})
+    gas_recorder.record("LiquidityGaugeV3.user_checkpoint", tx, weeks=weeks, n_rewards=n_rewards)
+
+
+@pytest.mark.parametrize("n_rewards", REWARD_TOKENS)
+@pytest.mark.parametrize("weeks", WEEKS_IDLE)
+def test_claim_rewards(accounts, gauge_v3, mock_lp_token, gas_recorder, weeks, n_rewards):
+    _add_rewards(accounts, gauge_v3, n_rewards)
+    _deposit(accounts, mock_lp_token, 2)
+    chain.sleep(weeks * WEEK)
+    tx = gauge_v3.claim_rewards({"from": accounts[0]})
+    gas_recorder.record("LiquidityGaugeV3.claim_rewards", tx, weeks=weeks, n_rewards=n_rewards)
+
+
+@pytest.mark.parametrize("n_rewards", [0, 1, 7])
+@pytest.mark.parametrize("weeks", WEEKS_IDLE)
+def test_add_reward_token(accounts, gauge_v3, mock_lp_token, gas_recorder, weeks, n_rewards):
+    _add_rewards(accounts, gauge_v3, n_rewards)
+    _deposit(accounts, mock_lp_token, 2)
+    chain.sleep(weeks * WEEK)
+    coin = ERC20()
+    tx = gauge_v3.add_reward_token(coin, 10 ** 15, {"from": accounts[0]})
+    gas_recorder.record("LiquidityGaugeV3.add_reward_token", tx, weeks=weeks, n_rewards=n_rewards)
+
+
+def _relock(accounts, voting_escrow, n_users):
+    # a new voting escrow point after the last gauge checkpoint allows a kick
+    chain.sleep(1)
+    for acct in accounts[:n_users]:
+        voting_escrow.increase_amount(10 ** 18, {"from": acct})
+
+
+@pytest.mark.parametrize("weeks", WEEKS_IDLE)
+def test_kick(accounts, gauge_v3, voting_escrow, mock_lp_token, gas_recorder, weeks):
+    _deposit(accounts, mock_lp_token, 2)
+    chain.sleep(weeks * WEEK)
+    _relock(accounts, voting_escrow, 1)
+    tx = gauge_v3.kick(accounts[0], {"from": accounts[1]})
+    gas_recorder.record("LiquidityGaugeV3.kick", tx, weeks=weeks)
+
+
+@pytest.mark.parametrize("n_users", USERS)
+@pytest.mark.parametrize("weeks", WEEKS_IDLE)
+def test_kick_many(accounts, gauge_v3, voting_escrow, mock_lp_token, gas_recorder, weeks, n_users):
+    _deposit(accounts, mock_lp_token, n_users)
+    chain.sleep(weeks * WEEK)
+    _relock(accounts, voting_escrow, n_users)
+    addrs = list(accounts[:n_users]) + [ZERO_ADDRESS] * (8 - n_users)
+    tx = gauge_v3.kick_many(addrs, {"from": accounts[5]})
+    gas_recorder.record("LiquidityGaugeV3.kick_many", tx, weeks=weeks, n_users=n_users)
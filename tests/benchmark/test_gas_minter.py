@@ -0,0 +1,60 @@
+import pytest
+from brownie import ZERO_ADDRESS, chain
+
+WEEK = 86400 * 7
+YEAR = 86400 * 365
+
+WEEKS_IDLE = [1, 10, 52, 104]
+# three gauges idle for 104 weeks need more than the 12M block gas limit in one call
+BATCH_CASES = [(w, n) for w in WEEKS_IDLE for n in (1, 3) if (w, n) != (104, 3)]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(
+    accounts,
+    token,
+    voting_escrow,
+    gauge_controller,
+    three_gauges,
+    mock_lp_token_A,
+    mock_lp_token_B,
+    mock_lp_token_C,
+    coin_a,
+    coin_b,
+    coin_c,
+):
+    gauge_controller.add_type(b"Liquidity", 10 ** 18, {"from": accounts[0]})
+    for gauge in three_gauges:
+        gauge_controller.add_gauge(gauge, 0, 10 ** 18, {"from": accounts[0]})
+
+    token.mint(accounts[0], 10 ** 22, {"from": accounts[0]})
+    token.approve(voting_escrow, 10 ** 22, {"from": accounts[0]})
+    voting_escrow.create_lock(10 ** 21, chain.time() + 4 * YEAR - WEEK, {"from": accounts[0]})
+
+    for coin, lp_token in zip((coin_a, coin_b, coin_c), (mock_lp_token_A, mock_lp_token_B, mock_lp_token_C)):
+        coin._mint_for_testing(accounts[0], 10 ** 24)
+        coin.approve(lp_token, 2 ** 256 - 1, {"from": accounts[0]})
+        lp_token.deposit(10 ** 21, {"from": accounts[0]})
+
+
+@pytest.mark.parametrize("weeks", WEEKS_IDLE)
+def test_mint(accounts, minter, three_gauges, gas_recorder, weeks):
+    chain.sleep(weeks * WEEK)
+    tx = minter.mint(three_gauges[0], {"from": accounts[0]})
+    gas_recorder.record("Minter.mint", tx, weeks=weeks)
+
+
+@pytest.mark.parametrize("weeks,n_gauges", BATCH_CASES)
+def test_mint_many(accounts, minter, three_gauges, gas_recorder, weeks, n_gauges):
+    chain.sleep(weeks * WEEK)
+    gauges = list(three_gauges[:n_gauges]) + [ZERO_ADDRESS] * (8 - n_gauges)
+    tx = minter.mint_many(gauges, {"from": accounts[0]})
+    gas_recorder.record("Minter.mint_many", tx, weeks=weeks, n_gauges=n_gauges)
+
+
+@pytest.mark.parametrize("weeks,n_gauges", BATCH_CASES)
+def test_mint_batch(accounts, minter, three_gauges, gas_recorder, weeks, n_gauges):
+    chain.sleep(weeks * WEEK)
+    gauges = list(three_gauges[:n_gauges]) + [ZERO_ADDRESS] * (32 - n_gauges)
+    tx = minter.mint_batch(gauges, {"from": accounts[0]})
+    gas_recorder.record("Minter.mint_batch", tx, weeks=weeks, n_gauges=n_gauges)
@@ -0,0 +1,57 @@
+import pytest
+from brownie import chain
+
+WEEK = 86400 * 7
+YEAR = 86400 * 365
+
+# 104 idle weeks cost about 11M gas, longer catch-ups exceed the 12M block gas limit
+WEEKS_IDLE = [0, 1, 10, 52, 104]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, token, voting_escrow):
+    for acct in accounts[:2]:
+        token.mint(acct, 10 ** 24, {"from": accounts[0]})
+        token.approve(voting_escrow, 10 ** 24, {"from": acct})
+
+    # a long lock keeps the global slope non-zero over the whole sweep
+    voting_escrow.create_lock(10 ** 21, chain.time() + 4 * YEAR - WEEK, {"from": accounts[1]})
+
+
+@pytest.mark.parametrize("weeks", WEEKS_IDLE)
+def test_create_lock(accounts, voting_escrow, gas_recorder, weeks):
+    chain.sleep(weeks * WEEK)
+    tx = voting_escrow.create_lock(10 ** 20, chain.time() + YEAR, {"from": accounts[0]})
+    gas_recorder.record("VotingEscrow.create_lock", tx, weeks=weeks)
+
+
+@pytest.mark.parametrize("weeks", WEEKS_IDLE)
+def test_increase_amount(accounts, voting_escrow, gas_recorder, weeks):
+    voting_escrow.create_lock(10 ** 20, chain.time() + 4 * YEAR - WEEK, {"from": accounts[0]})
+    chain.sleep(weeks * WEEK)
+    tx = voting_escrow.increase_amount(10 ** 20, {"from": accounts[0]})
+    gas_recorder.record("VotingEscrow.increase_amount", tx, weeks=weeks)
+
+
+@pytest.mark.parametrize("weeks", WEEKS_IDLE)
+def test_increase_unlock_time(accounts, voting_escrow, gas_recorder, weeks):
+    voting_escrow.create_lock(10 ** 20, chain.time() + (weeks + 2) * WEEK, {"from": accounts[0]})
+    chain.sleep(weeks * WEEK)
+    tx = voting_escrow.increase_unlock_time(chain.time() + 2 * YEAR, {"from": accounts[0]})
+    gas_recorder.record("VotingEscrow.increase_unlock_time", tx, weeks=weeks)
+
+
+@pytest.mark.parametrize("weeks", WEEKS_IDLE[1:])
+def test_withdraw(accounts, voting_escrow, gas_recorder, weeks):
+    voting_escrow.create_lock(10 ** 20, chain.time() + WEEK, {"from": accounts[0]})
+    chain.sleep(weeks * WEEK + WEEK)
+    tx = voting_escrow.withdraw({"from": accounts[0]})
+    gas_recorder.record("VotingEscrow.withdraw", tx, weeks=weeks)
+
+
+@pytest.mark.parametrize("weeks", WEEKS_IDLE[1:])
+def test_checkpoint(accounts, voting_escrow, gas_recorder, weeks):
+    # only the weekly catch-up of the global point, with its `week_epoch` writes
+    chain.sleep(weeks * WEEK)
+    tx = voting_escrow.checkpoint({"from": accounts[0]})
+    gas_recorder.record("VotingEscrow.checkpoint", tx, weeks=weeks)
@@ -1,12 +1,22 @@
+import json
+from pathlib import Path
+
 import pytest
 from brownie import (
+    chain,
     compile_source,
     convert,
+    web3,
 )
+from brownie._config import CONFIG
+from brownie.network import rpc
 from brownie_tokens import ERC20
 
 YEAR = 365 * 86400
 
+BENCHMARK_BASELINE = Path(__file__).parent / "benchmark" / "baseline.json"
+BENCHMARK_RESULTS = Path(__file__).parents[1] / "reports" / "benchmark.json"
+
 
 def approx(a, b, precision=1e-10):
     if a == b == 0:
@@ -20,6 +30,194 @@ def pack_values(values):
     return padded
 
 
+def time_travel(timestamp, blocks=1):
+    """
+    Move the chain head to exactly `timestamp`, mining `blocks` new blocks.
+
+    The blocks are evenly spaced after the current head, the last one at
+    `timestamp`, so the block/timestamp ratio `VotingEscrow` interpolates with
+    is the same as when mining them one `chain.sleep` / `chain.mine` at a time.
+    Only pass `blocks` when the intermediate blocks are actually queried;
+    a single block is enough to jump ahead.
+
+    Each block costs a single `evm_mine` call with an explicit timestamp,
+    without the `evm_increaseTime` and snapshot calls of `chain.sleep` and
+    `chain.mine`.
+
+    @param timestamp Timestamp of the new head
+    @param blocks Number of blocks to mine
+    @return Number of the new head block
+    """
+    head = chain[-1].timestamp
+    if timestamp <= head:
+        raise ValueError(f"Cannot travel back from {head} to {timestamp}")
+    span = timestamp - head
+    for i in range(1, blocks):
+        web3.provider.make_request("evm_mine", [head + span * i // blocks])
+    # the last block goes through brownie to keep its clock and snapshots in sync
+    return chain.mine(timestamp=timestamp)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark", action="store_true", help="run the gas benchmarks in tests/benchmark"
+    )
+    parser.addoption(
+        "--benchmark-update",
+        action="store_true",
+        help="overwrite the committed gas baseline with the benchmark results",
+    )
+    parser.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=0.01,
+        help="allowed relative gas increase over the baseline (default 0.01)",
+    )
+    parser.addoption(
+        "--gas-profile",
+        action="store_true",
+        help="trace each benchmark transaction and write folded call stacks with their gas",
+    )
+
+
+def _worker_index(config):
+    workerid = config.workerinput["workerid"]
+    return int("".join(i for i in workerid if i.isdigit()))
+
+
+def pytest_configure(config):
+    # with `-n`, brownie launches one local chain per xdist worker on
+    # `port + worker index`; give each of them its own chain id as well
+    if not hasattr(config, "workerinput"):
+        return
+    network = config.workerinput.get("network") or CONFIG.settings["networks"]["default"]
+    settings = CONFIG.networks[network]["cmd_settings"]
+    settings["chain_id"] = settings.get("chain_id", 1337) + _worker_index(config)
+
+
+def pytest_sessionfinish(session):
+    # merge the gas benchmark results written by each xdist worker
+    if hasattr(session.config, "workerinput"):
+        return
+    profiles = sorted(BENCHMARK_RESULTS.parent.glob("benchmark-gw*.folded"))
+    if profiles:
+        lines = sorted(line for path in profiles for line in path.read_text().splitlines())
+        BENCHMARK_RESULTS.with_suffix(".folded").write_text("".join(f"{i}\n" for i in lines))
+        for path in profiles:
+            path.unlink()
+
+    parts = sorted(BENCHMARK_RESULTS.parent.glob("benchmark-gw*.json"))
+    if not parts:
+        return
+
+    results = {}
+    for path in parts:
+        results.update(json.loads(path.read_text()))
+        path.unlink()
+    BENCHMARK_RESULTS.write_text(json.dumps(results, indent=2, sort_keys=True))
+    if session.config.getoption("benchmark_update"):
+        baseline = (
+            json.loads(BENCHMARK_BASELINE.read_text()) if BENCHMARK_BASELINE.exists() else {}
+        )
+        baseline.update(results)
+        BENCHMARK_BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    # list every benchmark case above its baseline, across all xdist workers
+    if not config.getoption("benchmark") or config.getoption("benchmark_update"):
+        return
+    if not BENCHMARK_RESULTS.exists() or not BENCHMARK_BASELINE.exists():
+        return
+    results = json.loads(BENCHMARK_RESULTS.read_text())
+    baseline = json.loads(BENCHMARK_BASELINE.read_text())
+    tolerance = config.getoption("benchmark_tolerance")
+
+    terminalreporter.section("gas benchmark")
+    regressions = 0
+    for key, gas_used in sorted(results.items()):
+        expected = baseline.get(key)
+        if expected is not None and gas_used > expected * (1 + tolerance):
+            regressions += 1
+            terminalreporter.write_line(
+                f"{key}: {gas_used} gas, baseline {expected} ({gas_used / expected - 1:+.2%})",
+                red=True,
+            )
+    missing = len([key for key in results if key not in baseline])
+    terminalreporter.write_line(
+        f"{len(results)} cases, {regressions} above the baseline by more than "
+        f"{tolerance:.0%}, {missing} not in the baseline"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("benchmark"):
+        return
+    skip = pytest.mark.skip(reason="gas benchmarks only run with --benchmark")
+    for item in items:
+        if "benchmark" in Path(item.fspath).parent.parts:
+            item.add_marker(skip)
+
+
+# chain isolation
+#
+# The contracts in `dao` are deployed once per session. These override
+# brownie's `module_isolation` and `fn_isolation`, which reset the chain for
+# every module, with snapshot layers: each module starts from the session
+# deployment and each test from the state left by its module fixtures.
+# There is no session-wide reset: session fixtures requested by a module's own
+# fixtures are deployed before `module_isolation` runs, and a reset would
+# wipe them.
+#
+# The layers need one snapshot id per level. `chain.snapshot` and
+# `chain.revert` keep a single id inside `chain`, so a test snapshot would
+# replace the module one. `_snapshot` and `_revert` therefore take ids from
+# `Rpc` and revert through `chain._revert`, which also rewinds brownie's
+# history and contract registry. Both are private to brownie 1.19, which is
+# pinned exactly in `requirements.in` for this reason.
+
+
+def _snapshot():
+    chain._undo_buffer.clear()
+    chain._redo_buffer.clear()
+    return rpc.Rpc().snapshot()
+
+
+def _revert(snapshot_id):
+    chain._undo_buffer.clear()
+    chain._redo_buffer.clear()
+    chain._revert(snapshot_id)
+
+
+@pytest.fixture(scope="session")
+def dao(
+    token,
+    voting_escrow,
+    gauge_controller,
+    minter,
+    reward_policy_maker,
+    reward_helper,
+    three_gauges,
+    mock_lp_token,
+    coin_reward,
+):
+    pass
+
+
+@pytest.fixture(scope="module")
+def module_isolation(dao):
+    snapshot_id = _snapshot()
+    yield
+    _revert(snapshot_id)
+
+
+@pytest.fixture
+def fn_isolation(module_isolation):
+    snapshot_id = _snapshot()
+    yield
+    _revert(snapshot_id)
+
+
 @pytest.fixture(autouse=True)
 def isolation_setup(fn_isolation):
     pass
@@ -51,24 +249,24 @@ def receiver(accounts):
 # core contracts
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def token(ERC20Impl, accounts):
     yield ERC20Impl.deploy("Fyllo DAO Token", "FYOTT", 18, 0, {"from": accounts[0]})
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def voting_escrow(VotingEscrow, accounts, token):
     yield VotingEscrow.deploy(
         token, "Voting-escrowed FYO", "veFYO", "veFYO_0.99", {"from": accounts[0]}
     )
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def gauge_controller(GaugeController, accounts, token, voting_escrow):
     yield GaugeController.deploy(token, voting_escrow, {"from": accounts[0]})
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def minter(Treasury, Minter, accounts, gauge_controller, token):
     treasury = Treasury.deploy(token, accounts[0], {"from": accounts[0]})
     token.mint(treasury, 100_000_000 * 10 ** 18, {"from": accounts[0]})
@@ -78,7 +276,7 @@ def minter(Treasury, Minter, accounts, gauge_controller, token):
 
     yield minter
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def reward_policy_maker(RewardPolicyMaker, accounts):
     reward = 100 * 10 ** 18
     contract = RewardPolicyMaker.deploy(604800, accounts[0], {"from": accounts[0]})
@@ -86,7 +284,7 @@ def reward_policy_maker(RewardPolicyMaker, accounts):
     contract.set_rewards_starting_at(contract.current_epoch() + 11, [reward, reward, reward, reward, reward, reward, reward, reward, reward, reward])
     yield contract
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def coin_reward():
     yield ERC20("YFIIIIII Funance", "YFIIIIII", 18)
 
@@ -107,7 +305,7 @@ def gauge_v3_point(LiquidityGaugeV3, alice, mock_lp_token, minter, reward_policy
     mock_lp_token.setGauge(gauge, {"from": alice})
     yield gauge
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def three_gauges(LiquidityGaugeV3, accounts, mock_lp_token_A, mock_lp_token_B, mock_lp_token_C, minter, reward_policy_maker):
     contracts = []
 
@@ -134,38 +332,38 @@ def three_gauges(LiquidityGaugeV3, accounts, mock_lp_token_A, mock_lp_token_B, m
 
 # testing contracts
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def coin_deposit(ERC20Impl, accounts):
     yield ERC20Impl.deploy("Coin deposit", "USD", 18, 0, {"from": accounts[0]})
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def coin_a():
     yield ERC20("Coin A", "USDA", 18)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def coin_b():
     yield ERC20("Coin B", "USDB", 18)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def coin_c():
     yield ERC20("Coin C", "mWBTC", 8)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def mock_lp_token(MockCErc20, coin_deposit, accounts):  # Not using the actual Curve contract
     yield MockCErc20.deploy("Fyllo C deposit token", "cUSD", 18, coin_deposit, {"from": accounts[0]})
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def mock_lp_token_A(MockCErc20, coin_a, accounts):  # Not using the actual Curve contract
     yield MockCErc20.deploy("Fyllo C A token", "cUSDA", 18, coin_a, {"from": accounts[0]})
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def mock_lp_token_B(MockCErc20, coin_b, accounts):  # Not using the actual Curve contract
     yield MockCErc20.deploy("Fyllo C B token", "cUSDB", 18, coin_b, {"from": accounts[0]})
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def mock_lp_token_C(MockCErc20, coin_c, accounts):  # Not using the actual Curve contract
     yield MockCErc20.deploy("Fyllo C C token", "cWBTC", 18, coin_c, {"from": accounts[0]})
 
@@ -182,6 +380,6 @@ def mock_lp_token_v2(MockCErc20V2, coin_deposit, accounts, gauge_controller):  #
     cerc20v2.setController(gauge_controller)
     yield cerc20v2
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def reward_helper(RewardHelper, minter, accounts):
     yield RewardHelper.deploy(minter, {"from": accounts[0]})
@@ -0,0 +1,141 @@
+import sqlite3
+
+import brownie
+from brownie import chain
+from brownie.test import given, strategy
+from hypothesis import settings
+
+from scripts.gauge_controller_indexer import GaugeControllerIndexer
+from scripts.voting_escrow_indexer import VotingEscrowIndexer
+
+WEEK = 86400 * 7
+GAS_LIMIT = 4_000_000
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+@given(
+    st_actions=strategy("uint8[15]", max_value=2),
+    st_accounts=strategy("uint8[15]", max_value=2),
+    st_gauges=strategy("uint8[15]", max_value=2),
+    st_values=strategy("uint8[15]", max_value=10),
+    st_sleeps=strategy("uint32[15]", max_value=3 * WEEK),
+)
+@settings(max_examples=5)
+def test_weekly_weights_match_contract(
+    accounts,
+    gauge_controller,
+    three_gauges,
+    token,
+    voting_escrow,
+    st_actions,
+    st_accounts,
+    st_gauges,
+    st_values,
+    st_sleeps,
+):
+    """
+    Index votes and admin weight changes in two syncs and compare the weekly
+    tables with the stored contract points.
+    """
+    # hypothesis reuses function fixtures across examples, keep the database per example
+    database = sqlite3.connect(":memory:")
+    ve_indexer = VotingEscrowIndexer.from_contract(
+        voting_escrow, database, start_block=voting_escrow.tx.block_number
+    )
+    indexer = GaugeControllerIndexer.from_contract(
+        gauge_controller, database, ve_indexer, start_block=gauge_controller.tx.block_number
+    )
+
+    gauge_controller.add_type(b"Liquidity", 10 ** 18, {"from": accounts[0]})
+    gauge_controller.add_type(b"Insurance", {"from": accounts[0]})
+    for i, gauge in enumerate(three_gauges):
+        gauge_controller.add_gauge(gauge, i % 2, i * 10 ** 18, {"from": accounts[0]})
+    gauge_controller.change_type_weight(1, 2 * 10 ** 18, {"from": accounts[0]})
+    for i, acct in enumerate(accounts[:3]):
+        token.mint(acct, 10 ** 24, {"from": accounts[0]})
+        token.approve(voting_escrow, 10 ** 24, {"from": acct})
+        voting_escrow.create_lock(10 ** 23 * (i + 1), chain.time() + (i + 1) * 50 * WEEK, {"from": acct})
+
+    for i in range(15):
+        if i == 8:
+            # the second sync only recomputes weeks touched by the new events
+            indexer.sync()
+        chain.sleep(st_sleeps[i])
+        gauge = three_gauges[st_gauges[i]]
+        try:
+            if st_actions[i] == 0:
+                gauge_controller.vote_for_gauge_weights(
+                    gauge, st_values[i] * 1000, {"from": accounts[st_accounts[i]], "gas": GAS_LIMIT}
+                )
+            elif st_actions[i] == 1:
+                gauge_controller.change_gauge_weight(
+                    gauge, st_values[i] * 10 ** 18, {"from": accounts[0], "gas": GAS_LIMIT}
+                )
+            else:
+                voting_escrow.increase_unlock_time(
+                    chain.time() + 200 * WEEK, {"from": accounts[st_accounts[i]], "gas": GAS_LIMIT}
+                )
+        except brownie.exceptions.VirtualMachineError:
+            pass
+
+    indexer.sync()
+    gauge_controller.checkpoint({"from": accounts[0]})
+    for gauge in three_gauges:
+        gauge_controller.checkpoint_gauge(gauge, {"from": accounts[0]})
+
+    for gauge in three_gauges:
+        history = indexer.gauge_weights(gauge)
+        assert history
+        for week, weight, relative_weight in history:
+            assert weight == gauge_controller.points_weight(gauge, week)[0]
+            assert relative_weight == gauge_controller.gauge_relative_weight(gauge, week)
+
+    weights, total = indexer.weights_at(chain.time())
+    assert total == gauge_controller.points_total(chain.time() // WEEK * WEEK)
+    assert set(weights) == set(three_gauges)
+
+
+def test_batched_vote_moving_power(accounts, gauge_controller, three_gauges, token, voting_escrow):
+    """
+    A batched vote may go over the power limit between two of its votes, the
+    indexer must only check it at the end of the transaction.
+    """
+    database = sqlite3.connect(":memory:")
+    ve_indexer = VotingEscrowIndexer.from_contract(
+        voting_escrow, database, start_block=voting_escrow.tx.block_number
+    )
+    indexer = GaugeControllerIndexer.from_contract(
+        gauge_controller, database, ve_indexer, start_block=gauge_controller.tx.block_number
+    )
+
+    gauge_controller.add_type(b"Liquidity", 10 ** 18, {"from": accounts[0]})
+    for gauge in three_gauges[:2]:
+        gauge_controller.add_gauge(gauge, 0, {"from": accounts[0]})
+    token.mint(accounts[1], 10 ** 24, {"from": accounts[0]})
+    token.approve(voting_escrow, 10 ** 24, {"from": accounts[1]})
+    voting_escrow.create_lock(10 ** 24, chain.time() + 50 * WEEK, {"from": accounts[1]})
+
+    gauge_a, gauge_b = three_gauges[:2]
+    gauge_controller.vote_for_gauge_weights(gauge_a, 10000, {"from": accounts[1]})
+    indexer.sync()
+
+    chain.sleep(WEEK)
+    gauges = [gauge_b, gauge_a] + [ZERO_ADDRESS] * 18
+    weights = [10000, 0] + [0] * 18
+    gauge_controller.vote_for_many_gauge_weights(gauges, weights, {"from": accounts[1]})
+    indexer.sync()
+
+    assert indexer.model.vote_user_power[accounts[1].address] == 10000
+    chain.sleep(WEEK)
+    gauge_controller.checkpoint_gauge(gauge_a, {"from": accounts[0]})
+    gauge_controller.checkpoint_gauge(gauge_b, {"from": accounts[0]})
+    for gauge in (gauge_a, gauge_b):
+        for week, weight, _ in indexer.gauge_weights(gauge):
+            assert weight == gauge_controller.points_weight(gauge, week)[0]
+
+    # a restart replays the stored batch the same way
+    restarted = GaugeControllerIndexer.from_contract(
+        gauge_controller, database, ve_indexer, start_block=gauge_controller.tx.block_number
+    )
+    assert restarted.model.vote_user_slopes[accounts[1].address][gauge_a.address].power == 0
+    assert restarted.model.vote_user_slopes[accounts[1].address][gauge_b.address].power == 10000
@@ -0,0 +1,118 @@
+import brownie
+from brownie import chain, history
+from brownie.test import given, strategy
+from hypothesis import settings
+
+from scripts.gauge_controller_model import GaugeControllerModel, Revert
+
+WEEK = 86400 * 7
+GAS_LIMIT = 4_000_000
+
+
+def _apply(model, gauge_controller, accounts, gauges, action, acct_idx, gauge_idx, value):
+    acct = accounts[acct_idx]
+    gauge = gauges[gauge_idx]
+    if action == 0:
+        fn, args = gauge_controller.vote_for_gauge_weights, (gauge, value * 1000, {"from": acct})
+    elif action == 1:
+        fn, args = gauge_controller.change_gauge_weight, (gauge, value * 10 ** 18, {"from": accounts[0]})
+    elif action == 2:
+        fn, args = gauge_controller.change_type_weight, (gauge_idx % 2, value * 10 ** 18, {"from": accounts[0]})
+    else:
+        fn, args = gauge_controller.checkpoint_gauge, (gauge, {"from": acct})
+
+    args[-1]["gas"] = GAS_LIMIT
+    try:
+        fn(*args)
+    except brownie.exceptions.VirtualMachineError:
+        pass
+    tx = history[-1]
+
+    try:
+        if action == 0:
+            model.vote_for_gauge_weights(acct, gauge, value * 1000, tx.timestamp)
+        elif action == 1:
+            model.change_gauge_weight(gauge, value * 10 ** 18, tx.timestamp)
+        elif action == 2:
+            model.change_type_weight(gauge_idx % 2, value * 10 ** 18, tx.timestamp)
+        else:
+            model.checkpoint_gauge(gauge, tx.timestamp)
+        reverted = False
+    except Revert:
+        reverted = True
+
+    assert reverted == (tx.status == 0)
+
+
+@given(
+    st_actions=strategy("uint8[15]", max_value=3),
+    st_accounts=strategy("uint8[15]", max_value=2),
+    st_gauges=strategy("uint8[15]", max_value=2),
+    st_values=strategy("uint8[15]", max_value=10),
+    st_sleeps=strategy("uint32[15]", max_value=4 * WEEK),
+)
+@settings(max_examples=10)
+def test_model_matches_contract(
+    accounts,
+    gauge_controller,
+    three_gauges,
+    token,
+    voting_escrow,
+    st_actions,
+    st_accounts,
+    st_gauges,
+    st_values,
+    st_sleeps,
+):
+    """
+    Run random votes and admin weight changes against both the contract and the
+    Python model, then check the stored weights and the projected schedule.
+    """
+    model = GaugeControllerModel(voting_escrow, gauge_controller.time_total())
+
+    for weight in (10 ** 18, 2 * 10 ** 18):
+        tx = gauge_controller.add_type(b"Type", weight, {"from": accounts[0]})
+        model.add_type(b"Type", weight, tx.timestamp)
+    for i, gauge in enumerate(three_gauges):
+        tx = gauge_controller.add_gauge(gauge, i % 2, i * 10 ** 18, {"from": accounts[0]})
+        model.add_gauge(gauge, i % 2, i * 10 ** 18, tx.timestamp)
+
+    for i, acct in enumerate(accounts[:3]):
+        token.mint(acct, 10 ** 24, {"from": accounts[0]})
+        token.approve(voting_escrow, 10 ** 24, {"from": acct})
+        voting_escrow.create_lock(10 ** 23 * (i + 1), chain.time() + (i + 1) * 50 * WEEK, {"from": acct})
+
+    for i in range(15):
+        chain.sleep(st_sleeps[i])
+        _apply(
+            model,
+            gauge_controller,
+            accounts,
+            three_gauges,
+            st_actions[i],
+            st_accounts[i],
+            st_gauges[i],
+            st_values[i],
+        )
+
+    assert gauge_controller.time_total() == model.time_total
+    assert gauge_controller.get_total_weight() == model.get_total_weight()
+    for i, gauge in enumerate(three_gauges):
+        assert gauge_controller.time_weight(gauge) == model.time_weight[gauge.address]
+        assert gauge_controller.get_gauge_weight(gauge) == model.get_gauge_weight(gauge)
+        assert gauge_controller.get_type_weight(i % 2) == model.get_type_weight(i % 2)
+
+    try:
+        schedule = model.weight_schedule(chain.time() - 4 * WEEK, 20)
+    except Revert:
+        # a fill underflows on-chain as well, nothing left to project
+        return
+
+    for j, t in enumerate(schedule.weeks):
+        if t > chain.time():
+            chain.mine(timestamp=t + 1)
+        for gauge in three_gauges:
+            gauge_controller.checkpoint_gauge(gauge, {"from": accounts[0]})
+            assert gauge_controller.points_weight(gauge, t)[0] == schedule.gauge_weights[gauge.address][j]
+            assert gauge_controller.gauge_relative_weight(gauge, t) == schedule.relative_weights[gauge.address][j]
+        assert gauge_controller.points_total(t) == schedule.totals[j]
@@ -0,0 +1,199 @@
+import brownie
+from brownie import ZERO_ADDRESS, chain, history
+from brownie.test import strategy
+
+from scripts.gauge_controller_model import GaugeControllerModel, Revert
+
+WEEK = 86400 * 7
+YEAR = 86400 * 365
+GAS_LIMIT = 4_000_000
+MAX_VOTES = 20
+
+# compare the contract views with the model every `CHECK_EVERY` steps
+CHECK_EVERY = 5
+
+
+class StateMachine:
+    """
+    Follow `GaugeController` with `GaugeControllerModel` over random votes and
+    admin weight changes.
+
+    Every step is applied to the model, and must revert on-chain exactly when
+    it reverts in the model. The contract views are compared with the model
+    every `CHECK_EVERY` steps and at the end of each run.
+
+    Strategies
+    ----------
+    st_account : Account
+        Account to vote from
+    st_gauge : int
+        Index of the gauge to vote for or change
+    st_weight : int
+        Vote weight in thousandths of the voting power
+    st_weights : int[3]
+        Vote weight for each gauge in a batched vote
+    st_value : int
+        Gauge or type weight, in units of 10 ** 18
+    st_sleep : int
+        Number of seconds to advance the clock
+    """
+
+    st_account = strategy("address", length=3)
+    st_gauge = strategy("uint", max_value=2)
+    st_weight = strategy("uint", max_value=10)
+    st_weights = strategy("uint[3]", max_value=5)
+    st_value = strategy("uint", max_value=10)
+    st_sleep = strategy("uint32", max_value=4 * WEEK)
+
+    def __init__(self, accounts, token, voting_escrow, gauge_controller, gauges):
+        self.accounts = accounts
+        self.voting_escrow = voting_escrow
+        self.controller = gauge_controller
+        self.gauges = gauges
+
+        # controller setup, replayed into a new model for each run
+        self.actions = []
+        self.deployed = gauge_controller.time_total()
+        for weight in (10 ** 18, 2 * 10 ** 18):
+            tx = gauge_controller.add_type(b"Type", weight, {"from": accounts[0]})
+            self.actions.append(("add_type", (b"Type", weight, tx.timestamp)))
+        for i, gauge in enumerate(gauges):
+            tx = gauge_controller.add_gauge(gauge, i % 2, i * 10 ** 18, {"from": accounts[0]})
+            self.actions.append(("add_gauge", (gauge, i % 2, i * 10 ** 18, tx.timestamp)))
+
+        for i, acct in enumerate(accounts):
+            token.mint(acct, 10 ** 24, {"from": accounts[0]})
+            token.approve(voting_escrow, 10 ** 24, {"from": acct})
+            voting_escrow.create_lock(10 ** 23 * (i + 1), chain.time() + YEAR, {"from": acct})
+
+    def setup(self):
+        self.model = GaugeControllerModel(self.voting_escrow, self.deployed)
+        for method, args in self.actions:
+            getattr(self.model, method)(*args)
+        self.steps = 0
+
+    def _apply(self, fn, args, model_fn, model_args):
+        args[-1]["gas"] = GAS_LIMIT
+        try:
+            fn(*args)
+        except brownie.exceptions.VirtualMachineError:
+            pass
+        tx = history[-1]
+
+        try:
+            model_fn(*model_args, tx.timestamp)
+            reverted = False
+        except Revert:
+            reverted = True
+
+        assert reverted == (tx.status == 0)
+
+    def rule_vote(self, st_account, st_gauge, st_weight):
+        gauge = self.gauges[st_gauge]
+        self._apply(
+            self.controller.vote_for_gauge_weights,
+            (gauge, st_weight * 1000, {"from": st_account}),
+            self.model.vote_for_gauge_weights,
+            (st_account, gauge, st_weight * 1000),
+        )
+
+    def rule_vote_many(self, st_account, st_weights):
+        votes = [(gauge, weight * 1000) for gauge, weight in zip(self.gauges, st_weights)]
+        padding = MAX_VOTES - len(votes)
+        self._apply(
+            self.controller.vote_for_many_gauge_weights,
+            (
+                [i[0] for i in votes] + [ZERO_ADDRESS] * padding,
+                [i[1] for i in votes] + [0] * padding,
+                {"from": st_account},
+            ),
+            self.model.vote_for_many_gauge_weights,
+            (st_account, votes),
+        )
+
+    def rule_change_gauge_weight(self, st_gauge, st_value):
+        gauge = self.gauges[st_gauge]
+        self._apply(
+            self.controller.change_gauge_weight,
+            (gauge, st_value * 10 ** 18, {"from": self.accounts[0]}),
+            self.model.change_gauge_weight,
+            (gauge, st_value * 10 ** 18),
+        )
+
+    def rule_change_type_weight(self, st_gauge, st_value):
+        type_id = st_gauge % 2
+        self._apply(
+            self.controller.change_type_weight,
+            (type_id, st_value * 10 ** 18, {"from": self.accounts[0]}),
+            self.model.change_type_weight,
+            (type_id, st_value * 10 ** 18),
+        )
+
+    def rule_checkpoint_gauge(self, st_gauge):
+        gauge = self.gauges[st_gauge]
+        self._apply(
+            self.controller.checkpoint_gauge,
+            (gauge, {"from": self.accounts[0]}),
+            self.model.checkpoint_gauge,
+            (gauge,),
+        )
+
+    def rule_advance_time(self, st_sleep):
+        chain.sleep(st_sleep)
+
+    def invariant_model(self):
+        """
+        Check the model on its own, after every step.
+        """
+        model = self.model
+        for acct in self.accounts:
+            slopes = model.vote_user_slopes.get(acct, {}).values()
+            assert model.vote_user_power.get(acct, 0) == sum(i.power for i in slopes) <= 10000
+
+        self.steps += 1
+        if self.steps % CHECK_EVERY == 0:
+            self._check_contract()
+
+    def teardown(self):
+        self._check_contract()
+
+    def _check_contract(self):
+        """
+        Compare the contract views with the model.
+        """
+        model = self.model
+        controller = self.controller
+        week = chain[-1].timestamp // WEEK * WEEK
+
+        assert controller.time_total() == model.time_total
+        assert controller.get_total_weight() == model.get_total_weight()
+        assert controller.points_total(week) == model.points_total.get(week, 0)
+        for type_id in range(2):
+            assert controller.get_type_weight(type_id) == model.get_type_weight(type_id)
+            assert controller.get_weights_sum_per_type(type_id) == model.get_weights_sum_per_type(
+                type_id
+            )
+        for gauge in self.gauges:
+            assert controller.time_weight(gauge) == model.time_weight[gauge.address]
+            assert controller.get_gauge_weight(gauge) == model.get_gauge_weight(gauge)
+            assert controller.gauge_relative_weight(gauge, week) == model.gauge_relative_weight(
+                gauge, week
+            )
+        for acct in self.accounts:
+            assert controller.vote_user_power(acct) == model.vote_user_power.get(acct, 0)
+            for gauge in self.gauges:
+                slope = model.vote_user_slopes.get(acct, {}).get(gauge)
+                if slope is not None:
+                    assert controller.vote_user_slopes(acct, gauge) == tuple(slope)
+
+
+def test_state_machine(state_machine, accounts, token, voting_escrow, gauge_controller, three_gauges):
+    state_machine(
+        StateMachine,
+        accounts[:3],
+        token,
+        voting_escrow,
+        gauge_controller,
+        three_gauges,
+        settings={"max_examples": 20, "stateful_step_count": 40},
+    )
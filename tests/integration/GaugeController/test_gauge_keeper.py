@@ -0,0 +1,85 @@
+import pytest
+from brownie import chain
+
+from scripts.gauge_keeper import GaugeKeeper
+from tests.conftest import time_travel
+
+WEEK = 86400 * 7
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(accounts, gauge_controller, three_gauges):
+    gauge_controller.add_type(b"Liquidity", 10 ** 18, {"from": accounts[0]})
+    for gauge in three_gauges:
+        gauge_controller.add_gauge(gauge, 0, 10 ** 18, {"from": accounts[0]})
+
+
+@pytest.fixture(scope="module")
+def keeper(accounts, gauge_controller, three_gauges):
+    keeper = GaugeKeeper(gauge_controller, three_gauges, accounts[5])
+    keeper.run_once()
+    yield keeper
+
+
+def test_nothing_due(keeper):
+    assert keeper.plan(chain[-1].timestamp) == []
+    assert keeper.run_once() == []
+
+
+def test_checkpoints_stale_gauges(keeper, gauge_controller, three_gauges):
+    time_travel(chain[-1].timestamp + 5 * WEEK)
+
+    due = keeper.plan(chain[-1].timestamp)
+    assert [i.method for i in due] == ["user_checkpoint"] * 3
+    assert {i.contract.address for i in due} == {i.address for i in three_gauges}
+    assert all(i.weeks >= 5 and i.gas > 0 for i in due)
+
+    txs = keeper.run_once()
+    assert [tx.status for tx in txs] == [1, 1, 1]
+    assert [tx.nonce for tx in txs] == [txs[0].nonce + i for i in range(3)]
+
+    now = chain[-1].timestamp
+    assert gauge_controller.time_total() > now
+    for item, tx in zip(due, txs):
+        assert item.contract.integrate_checkpoint() == tx.timestamp
+        assert gauge_controller.time_weight(item.contract) > now
+    assert keeper.plan(now) == []
+
+
+def test_controller_checkpoint(accounts, gauge_controller, keeper):
+    controller_keeper = GaugeKeeper(gauge_controller, [], accounts[5])
+    time_travel(chain[-1].timestamp + 3 * WEEK)
+
+    due = controller_keeper.plan(chain[-1].timestamp)
+    assert [(i.method, i.weeks) for i in due] == [("checkpoint", 3)]
+
+    controller_keeper.run_once()
+    assert gauge_controller.time_total() > chain[-1].timestamp
+
+
+def test_min_weeks(accounts, gauge_controller, three_gauges, keeper):
+    lazy_keeper = GaugeKeeper(gauge_controller, three_gauges, accounts[5], min_weeks=4)
+    time_travel(chain[-1].timestamp + 2 * WEEK)
+
+    assert lazy_keeper.plan(chain[-1].timestamp) == []
+    assert len(keeper.plan(chain[-1].timestamp)) == 3
+
+
+def test_gas_budget(accounts, gauge_controller, three_gauges, keeper):
+    time_travel(chain[-1].timestamp + 2 * WEEK)
+    gas = min(i.gas for i in keeper.plan(chain[-1].timestamp))
+
+    budget_keeper = GaugeKeeper(
+        gauge_controller, three_gauges, accounts[5], max_gas=gas * 3 // 2
+    )
+    assert len(budget_keeper.plan(chain[-1].timestamp)) == 1
+
+
+def test_gas_budget_controller_checkpoint(accounts, gauge_controller, three_gauges, keeper):
+    time_travel(chain[-1].timestamp + 2 * WEEK)
+    gas = gauge_controller.checkpoint.estimate_gas({"from": accounts[5]})
+    assert gas < min(i.gas for i in keeper.plan(chain[-1].timestamp))
+
+    budget_keeper = GaugeKeeper(gauge_controller, three_gauges, accounts[5], max_gas=gas)
+    due = budget_keeper.plan(chain[-1].timestamp)
+    assert [(i.method, i.weeks) for i in due] == [("checkpoint", 2)]
@@ -0,0 +1,101 @@
+from brownie import chain, history
+from brownie.test import given, strategy
+from hypothesis import settings
+
+from scripts.gauge_controller_model import GaugeControllerModel
+from scripts.gauge_model import LiquidityGaugeModel, RewardPolicyModel
+
+WEEK = 7 * 86400
+
+
+@given(
+    st_actions=strategy("uint8[10]", max_value=3),
+    st_accounts=strategy("uint8[10]", max_value=2),
+    st_values=strategy("uint64[10]", min_value=10 ** 10),
+    st_sleeps=strategy("uint32[10]", max_value=3 * WEEK),
+)
+@settings(max_examples=10)
+def test_claimable_all_matches_contract(
+    accounts,
+    token,
+    voting_escrow,
+    gauge_controller,
+    minter,
+    reward_policy_maker,
+    gauge_v3_point,
+    mock_lp_token,
+    coin_deposit,
+    coin_reward,
+    st_actions,
+    st_accounts,
+    st_values,
+    st_sleeps,
+):
+    """
+    Replay random deposits, withdrawals and checkpoints through the model and
+    compare the batched claimables with the per-user contract calls.
+    """
+    gauge = gauge_v3_point
+    controller = GaugeControllerModel(voting_escrow, gauge_controller.time_total())
+    tx = gauge_controller.add_type(b"Liquidity", 10 ** 18, {"from": accounts[0]})
+    controller.add_type(b"Liquidity", 10 ** 18, tx.timestamp)
+    tx = gauge_controller.add_gauge(gauge, 0, 10 ** 18, {"from": accounts[0]})
+    controller.add_gauge(gauge.address, 0, 10 ** 18, tx.timestamp)
+
+    policy = RewardPolicyModel.from_contract(reward_policy_maker, 30)
+    model = LiquidityGaugeModel(
+        gauge.address,
+        policy,
+        controller,
+        voting_escrow,
+        gauge.period_timestamp(0),
+        gauge.point_rate(),
+        gauge.point_proportion(),
+    )
+
+    coin_reward._mint_for_testing(gauge, 10 ** 30)
+    tx = gauge.add_reward_token(coin_reward, 10 ** 17, {"from": accounts[0]})
+    model.add_reward_token(coin_reward.address, 10 ** 17, tx.timestamp)
+
+    for i, acct in enumerate(accounts[:3]):
+        coin_deposit.mint(acct, 10 ** 21, {"from": accounts[0]})
+        coin_deposit.approve(mock_lp_token, 2 ** 256 - 1, {"from": acct})
+        token.mint(acct, 10 ** 22, {"from": accounts[0]})
+        token.approve(voting_escrow, 10 ** 22, {"from": acct})
+        if i:
+            voting_escrow.create_lock(10 ** 21 * i, chain.time() + i * 30 * WEEK, {"from": acct})
+
+    for i in range(10):
+        chain.sleep(st_sleeps[i])
+        acct = accounts[st_accounts[i]]
+        action = st_actions[i]
+        if action == 0:
+            mock_lp_token.deposit(st_values[i], {"from": acct})
+            model.notifySavingsChange(acct, mock_lp_token.balanceOf(acct), history[-1].timestamp)
+        elif action == 1:
+            value = min(st_values[i], mock_lp_token.balanceOf(acct))
+            mock_lp_token.withdraw(value, {"from": acct})
+            model.notifySavingsChange(acct, mock_lp_token.balanceOf(acct), history[-1].timestamp)
+        elif action == 2:
+            tx = gauge.user_checkpoint(acct, {"from": acct})
+            model.user_checkpoint(acct, tx.timestamp)
+        else:
+            tx = gauge.claim_rewards({"from": acct})
+            model.claim_rewards(acct, tx.timestamp)
+
+    chain.sleep(WEEK)
+    minted = {acct: minter.minted(acct, gauge) for acct in accounts[:3]}
+
+    for acct in model.lpBalanceOf:
+        tx = gauge.claimable_tokens(acct, {"from": acct})
+        assert tx.return_value == model.claimable_all(tx.timestamp, minted)[acct].tokens
+        model.claimable_tokens(acct, tx.timestamp, minted[acct])
+
+        tx = gauge.balance_of_write(acct, {"from": acct})
+        assert tx.return_value == model.claimable_all(tx.timestamp, minted)[acct].points
+        model.balance_of_write(acct, tx.timestamp)
+
+        tx = gauge.claimable_reward_write(acct, coin_reward, {"from": acct})
+        expected = model.claimable_all(tx.timestamp, minted)[acct].rewards[coin_reward.address]
+        assert tx.return_value == expected
+        model.claimable_reward_write(acct, coin_reward.address, tx.timestamp)
@@ -0,0 +1,200 @@
+from brownie import chain, history
+from brownie.test import strategy
+
+from scripts.gauge_controller_model import GaugeControllerModel
+from scripts.gauge_model import LiquidityGaugeModel, RewardPolicyModel
+
+WEEK = 7 * 86400
+
+# compare the contract views with the model every `CHECK_EVERY` steps
+CHECK_EVERY = 5
+
+
+class StateMachine:
+    """
+    Follow `LiquidityGaugeV3` with `LiquidityGaugeModel` over random deposits,
+    withdrawals, transfers, checkpoints and reward claims.
+
+    Every step is applied to the model. The gauge storage and the token
+    balances are compared with the model every `CHECK_EVERY` steps and at the
+    end of each run.
+
+    Strategies
+    ----------
+    st_account : Account
+        Account to perform the action from
+    st_receiver : Account
+        Account to transfer LP tokens to
+    st_value : int
+        Amount to deposit or withdraw
+    st_sleep : int
+        Number of seconds to advance the clock
+    """
+
+    st_account = strategy("address", length=3)
+    st_receiver = strategy("address", length=3)
+    st_value = strategy("uint64", min_value=10 ** 10)
+    st_sleep = strategy("uint32", max_value=3 * WEEK)
+
+    def __init__(
+        self,
+        accounts,
+        token,
+        voting_escrow,
+        gauge_controller,
+        reward_policy_maker,
+        gauge,
+        mock_lp_token,
+        coin_deposit,
+        coin_reward,
+    ):
+        self.accounts = accounts
+        self.voting_escrow = voting_escrow
+        self.gauge = gauge
+        self.lp_token = mock_lp_token
+        self.coin_reward = coin_reward
+
+        # setup, replayed into new models for each run
+        self.deployed = gauge_controller.time_total()
+        self.controller_actions = []
+        tx = gauge_controller.add_type(b"Liquidity", 10 ** 18, {"from": accounts[0]})
+        self.controller_actions.append(("add_type", (b"Liquidity", 10 ** 18, tx.timestamp)))
+        tx = gauge_controller.add_gauge(gauge, 0, 10 ** 18, {"from": accounts[0]})
+        self.controller_actions.append(("add_gauge", (gauge.address, 0, 10 ** 18, tx.timestamp)))
+
+        self.policy = RewardPolicyModel.from_contract(reward_policy_maker, 30)
+        self.gauge_args = (gauge.period_timestamp(0), gauge.point_rate(), gauge.point_proportion())
+
+        coin_reward._mint_for_testing(gauge, 10 ** 30)
+        tx = gauge.add_reward_token(coin_reward, 10 ** 17, {"from": accounts[0]})
+        self.gauge_actions = [("add_reward_token", (coin_reward.address, 10 ** 17), tx.timestamp)]
+
+        for i, acct in enumerate(accounts):
+            coin_deposit.mint(acct, 10 ** 21, {"from": accounts[0]})
+            coin_deposit.approve(mock_lp_token, 2 ** 256 - 1, {"from": acct})
+            token.mint(acct, 10 ** 22, {"from": accounts[0]})
+            token.approve(voting_escrow, 10 ** 22, {"from": acct})
+            if i:
+                voting_escrow.create_lock(10 ** 21 * i, chain.time() + i * 30 * WEEK, {"from": acct})
+        self.reward_balances = {i: coin_reward.balanceOf(i) for i in accounts}
+
+    def setup(self):
+        controller = GaugeControllerModel(self.voting_escrow, self.deployed)
+        for method, args in self.controller_actions:
+            getattr(controller, method)(*args)
+        self.model = LiquidityGaugeModel(
+            self.gauge.address, self.policy, controller, self.voting_escrow, *self.gauge_args
+        )
+        self.model.replay(self.gauge_actions)
+        self.steps = 0
+
+    def rule_deposit(self, st_account, st_value):
+        self.lp_token.deposit(st_value, {"from": st_account})
+        self.model.notifySavingsChange(
+            st_account, self.lp_token.balanceOf(st_account), history[-1].timestamp
+        )
+
+    def rule_withdraw(self, st_account, st_value):
+        value = min(st_value, self.lp_token.balanceOf(st_account))
+        self.lp_token.withdraw(value, {"from": st_account})
+        self.model.notifySavingsChange(
+            st_account, self.lp_token.balanceOf(st_account), history[-1].timestamp
+        )
+
+    def rule_transfer(self, st_account, st_receiver, st_value):
+        value = min(st_value, self.lp_token.balanceOf(st_account))
+        tx = self.lp_token.transfer(st_receiver, value, {"from": st_account})
+        self.model.notifySavingsChanges(
+            [
+                (st_account, self.lp_token.balanceOf(st_account)),
+                (st_receiver, self.lp_token.balanceOf(st_receiver)),
+            ],
+            tx.timestamp,
+        )
+
+    def rule_checkpoint(self, st_account):
+        tx = self.gauge.user_checkpoint(st_account, {"from": st_account})
+        self.model.user_checkpoint(st_account, tx.timestamp)
+
+    def rule_claim_rewards(self, st_account):
+        tx = self.gauge.claim_rewards({"from": st_account})
+        self.model.claim_rewards(st_account, tx.timestamp)
+
+    def rule_advance_time(self, st_sleep):
+        chain.sleep(st_sleep)
+
+    def invariant_model(self):
+        """
+        Check the model on its own, after every step.
+        """
+        model = self.model
+        assert model.lpTotalSupply == sum(model.lpBalanceOf.values())
+        assert model.totalSupply == model.lpTotalSupply + sum(
+            model.point_integrate_fraction.values()
+        )
+        assert model.working_supply == sum(model.working_balances.values())
+
+        self.steps += 1
+        if self.steps % CHECK_EVERY == 0:
+            self._check_contract()
+
+    def teardown(self):
+        self._check_contract()
+
+    def _check_contract(self):
+        """
+        Compare the gauge storage and token balances with the model.
+        """
+        model = self.model
+        gauge = self.gauge
+        reward = self.coin_reward.address
+
+        assert gauge.totalSupply() == model.totalSupply
+        assert gauge.lpTotalSupply() == model.lpTotalSupply
+        assert gauge.working_supply() == model.working_supply
+        assert gauge.period() == model.period
+        assert gauge.integrate_inv_supply(model.period) == model.integrate_inv_supply[model.period]
+        assert gauge.point_period() == model.point_period
+        assert (
+            gauge.point_integrate_inv_supply(model.point_period)
+            == model.point_integrate_inv_supply[model.point_period]
+        )
+        assert gauge.reward_integral(reward) == model.reward_integral.get(reward, 0)
+
+        for acct in self.accounts:
+            assert self.lp_token.balanceOf(acct) == model.lpBalanceOf.get(acct, 0)
+            assert gauge.balanceOf(acct) == model.balanceOf(acct)
+            assert gauge.working_balances(acct) == model.working_balances.get(acct, 0)
+            assert gauge.integrate_fraction(acct) == model.integrate_fraction.get(acct, 0)
+            assert gauge.claimable_reward(acct, reward) == model.claimable_reward(acct, reward)
+            assert gauge.claimed_reward(acct, reward) == model.claimed_reward(acct, reward)
+            assert self.coin_reward.balanceOf(acct) == (
+                self.reward_balances[acct] + model.claimed_reward(acct, reward)
+            )
+
+
+def test_state_machine(
+    state_machine,
+    accounts,
+    token,
+    voting_escrow,
+    gauge_controller,
+    reward_policy_maker,
+    gauge_v3_point,
+    mock_lp_token,
+    coin_deposit,
+    coin_reward,
+):
+    state_machine(
+        StateMachine,
+        accounts[:3],
+        token,
+        voting_escrow,
+        gauge_controller,
+        reward_policy_maker,
+        gauge_v3_point,
+        mock_lp_token,
+        coin_deposit,
+        coin_reward,
+        settings={"max_examples": 15, "stateful_step_count": 30},
+    )
@@ -0,0 +1,80 @@
+import pytest
+from brownie import chain
+
+from scripts.reward_sweeper import MAX_PAIRS, chunk_claims, sweep
+
+LP_AMOUNT = 10 ** 18
+MONTH = 86400 * 30
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup(
+    accounts,
+    gauge_controller,
+    three_gauges,
+    minter,
+    reward_helper,
+    coin_a,
+    coin_b,
+    mock_lp_token_A,
+    mock_lp_token_B,
+):
+    gauge_controller.add_type(b"Liquidity", 10 ** 18, {"from": accounts[0]})
+    for gauge in three_gauges:
+        gauge_controller.add_gauge(gauge, 0, 10 ** 18, {"from": accounts[0]})
+
+    for acct in accounts[1:7]:
+        for coin, lp_token in ((coin_a, mock_lp_token_A), (coin_b, mock_lp_token_B)):
+            coin._mint_for_testing(acct, LP_AMOUNT)
+            coin.approve(lp_token, LP_AMOUNT, {"from": acct})
+            lp_token.deposit(LP_AMOUNT, {"from": acct})
+        minter.toggle_approve_mint(reward_helper, {"from": acct})
+
+    chain.sleep(MONTH)
+    chain.mine()
+
+
+@pytest.fixture(scope="module")
+def claims(accounts, three_gauges):
+    yield {acct.address: [three_gauges[0].address, three_gauges[1].address] for acct in accounts[1:7]}
+
+
+def test_single_chunk(accounts, reward_helper, claims):
+    chunks = chunk_claims(reward_helper, claims, accounts[0])
+
+    assert len(chunks) == 1
+    pairs, gas = chunks[0]
+    assert len(pairs) == 12
+    assert [i[0] for i in pairs[::2]] == list(claims)
+
+
+def test_chunks_by_gas(accounts, reward_helper, claims):
+    gas = chunk_claims(reward_helper, claims, accounts[0])[0][1]
+    chunks = chunk_claims(reward_helper, claims, accounts[0], max_gas=gas // 2)
+
+    assert len(chunks) > 1
+    assert sum(len(pairs) for pairs, _ in chunks) == 12
+    for pairs, chunk_gas in chunks:
+        assert chunk_gas <= gas // 2
+        # pairs of one account stay together
+        assert len(pairs) % 2 == 0
+        assert pairs[0][0] == pairs[1][0]
+
+
+def test_account_too_large(accounts, reward_helper, three_gauges):
+    claims = {accounts[1].address: [three_gauges[0].address] * (MAX_PAIRS + 1)}
+
+    with pytest.raises(ValueError):
+        chunk_claims(reward_helper, claims, accounts[0])
+
+
+def test_sweep(accounts, reward_helper, claims, three_gauges, token):
+    gas = chunk_claims(reward_helper, claims, accounts[0])[0][1]
+    txs = sweep(reward_helper, claims, accounts[0], max_gas=gas // 2)
+
+    assert len(txs) > 1
+    assert all(tx.status == 1 for tx in txs)
+    for acct in accounts[1:7]:
+        expected = three_gauges[0].integrate_fraction(acct) + three_gauges[1].integrate_fraction(acct)
+        assert expected > 0
+        assert token.balanceOf(acct) == expected
@@ -0,0 +1,48 @@
+from brownie import chain
+
+from scripts.ve_projection import project, week_grid
+
+WEEK = 86400 * 7
+N_WEEKS = 60
+
+
+def test_projection_matches_contract(accounts, token, voting_escrow):
+    """
+    Project balances and supply for a set of locks with different durations and
+    compare every cell with `balanceOf(addr, t)` / `totalSupply(t)`.
+    """
+    holders = accounts[:5]
+    for i, acct in enumerate(holders):
+        token.mint(acct, 10 ** 24, {"from": accounts[0]})
+        token.approve(voting_escrow, 10 ** 24, {"from": acct})
+        voting_escrow.create_lock(
+            (i + 1) * 10 ** 23, chain.time() + (i + 1) * 10 * WEEK, {"from": acct}
+        )
+        chain.sleep(86400)
+
+    voting_escrow.increase_amount(10 ** 23, {"from": holders[0]})
+    voting_escrow.increase_unlock_time(chain.time() + 80 * WEEK, {"from": holders[1]})
+
+    locked = [voting_escrow.locked(acct) for acct in holders]
+    points = [
+        voting_escrow.user_point_history(acct, voting_escrow.user_point_epoch(acct))
+        for acct in holders
+    ]
+    point = voting_escrow.point_history(voting_escrow.epoch())
+    times = week_grid(chain.time(), N_WEEKS)
+
+    balances, supply = project(
+        [i["amount"] for i in locked],
+        [i["end"] for i in locked],
+        [i["bias"] for i in points],
+        [i["slope"] for i in points],
+        [i["ts"] for i in points],
+        (point["bias"], point["slope"], point["ts"]),
+        times,
+    )
+
+    assert balances.shape == (len(holders), N_WEEKS)
+    for j, t in enumerate(times):
+        for i, acct in enumerate(holders):
+            assert balances[i, j] == voting_escrow.balanceOf(acct, t)
+        assert supply[j] == voting_escrow.totalSupply(t)
@@ -1,4 +1,4 @@
-from tests.conftest import approx
+from tests.conftest import approx, time_travel
 
 H = 3600
 DAY = 86400
@@ -49,8 +49,7 @@ def test_voting_powers(web3, chain, accounts, token, voting_escrow):
     assert voting_escrow.balanceOf(bob) == 0
 
     # Move to timing which is good for testing - beginning of a UTC week
-    chain.sleep((chain[-1].timestamp // WEEK + 1) * WEEK - chain[-1].timestamp)
-    chain.mine()
+    time_travel((chain[-1].timestamp // WEEK + 1) * WEEK)
 
     chain.sleep(H)
 
@@ -59,8 +58,7 @@ def test_voting_powers(web3, chain, accounts, token, voting_escrow):
     voting_escrow.create_lock(amount, chain[-1].timestamp + WEEK, {"from": alice})
     stages["alice_deposit"] = (web3.eth.blockNumber, chain[-1].timestamp)
 
-    chain.sleep(H)
-    chain.mine()
+    time_travel(chain[-1].timestamp + H)
 
     assert approx(voting_escrow.totalSupply(), amount // MAXTIME * (WEEK - 2 * H), TOL)
     assert approx(voting_escrow.balanceOf(alice), amount // MAXTIME * (WEEK - 2 * H), TOL)
@@ -70,9 +68,7 @@ def test_voting_powers(web3, chain, accounts, token, voting_escrow):
     stages["alice_in_0"] = []
     stages["alice_in_0"].append((web3.eth.blockNumber, chain[-1].timestamp))
     for i in range(7):
-        for _ in range(24):
-            chain.sleep(H)
-            chain.mine()
+        time_travel(chain[-1].timestamp + DAY, blocks=24)
         dt = chain[-1].timestamp - t0
         assert approx(
             voting_escrow.totalSupply(),
@@ -96,12 +92,10 @@ def test_voting_powers(web3, chain, accounts, token, voting_escrow):
     assert voting_escrow.balanceOf(alice) == 0
     assert voting_escrow.balanceOf(bob) == 0
 
-    chain.sleep(H)
-    chain.mine()
+    time_travel(chain[-1].timestamp + H)
 
     # Next week (for round counting)
-    chain.sleep((chain[-1].timestamp // WEEK + 1) * WEEK - chain[-1].timestamp)
-    chain.mine()
+    time_travel((chain[-1].timestamp // WEEK + 1) * WEEK)
 
     voting_escrow.create_lock(amount, chain[-1].timestamp + 2 * WEEK, {"from": alice})
     stages["alice_deposit_2"] = (web3.eth.blockNumber, chain[-1].timestamp)
@@ -118,16 +112,13 @@ def test_voting_powers(web3, chain, accounts, token, voting_escrow):
     assert approx(voting_escrow.balanceOf(bob), amount // MAXTIME * WEEK, TOL)
 
     t0 = chain[-1].timestamp
-    chain.sleep(H)
-    chain.mine()
+    time_travel(chain[-1].timestamp + H)
 
     stages["alice_bob_in_2"] = []
     # Beginning of week: weight 3
     # End of week: weight 1
     for i in range(7):
-        for _ in range(24):
-            chain.sleep(H)
-            chain.mine()
+        time_travel(chain[-1].timestamp + DAY, blocks=24)
         dt = chain[-1].timestamp - t0
         w_total = voting_escrow.totalSupply()
         w_alice = voting_escrow.balanceOf(alice)
@@ -137,8 +128,7 @@ def test_voting_powers(web3, chain, accounts, token, voting_escrow):
         assert approx(w_bob, amount // MAXTIME * max(WEEK - dt, 0), TOL)
         stages["alice_bob_in_2"].append((web3.eth.blockNumber, chain[-1].timestamp))
 
-    chain.sleep(H)
-    chain.mine()
+    time_travel(chain[-1].timestamp + H)
 
     voting_escrow.withdraw({"from": bob})
     t0 = chain[-1].timestamp
@@ -149,14 +139,11 @@ def test_voting_powers(web3, chain, accounts, token, voting_escrow):
     assert approx(w_total, amount // MAXTIME * (WEEK - 2 * H), TOL)
     assert voting_escrow.balanceOf(bob) == 0
 
-    chain.sleep(H)
-    chain.mine()
+    time_travel(chain[-1].timestamp + H)
 
     stages["alice_in_2"] = []
     for i in range(7):
-        for _ in range(24):
-            chain.sleep(H)
-            chain.mine()
+        time_travel(chain[-1].timestamp + DAY, blocks=24)
         dt = chain[-1].timestamp - t0
         w_total = voting_escrow.totalSupply()
         w_alice = voting_escrow.balanceOf(alice)
@@ -168,8 +155,7 @@ def test_voting_powers(web3, chain, accounts, token, voting_escrow):
     voting_escrow.withdraw({"from": alice})
     stages["alice_withdraw_2"] = (web3.eth.blockNumber, chain[-1].timestamp)
 
-    chain.sleep(H)
-    chain.mine()
+    time_travel(chain[-1].timestamp + H)
 
     voting_escrow.withdraw({"from": bob})
     stages["bob_withdraw_2"] = (web3.eth.blockNumber, chain[-1].timestamp)
@@ -0,0 +1,113 @@
+import sqlite3
+
+import brownie
+import pytest
+from brownie import chain
+from brownie.test import given, strategy
+from hypothesis import settings
+
+from scripts.voting_escrow_indexer import VotingEscrowIndexer
+
+WEEK = 86400 * 7
+MAXTIME = 86400 * 365 * 4
+GAS_LIMIT = 4_000_000
+
+
+@given(
+    st_actions=strategy("uint8[20]", max_value=3),
+    st_accounts=strategy("uint8[20]", max_value=3),
+    st_values=strategy("uint256[20]", min_value=10 ** 18, max_value=10 ** 23),
+    st_durations=strategy("uint8[20]", min_value=1, max_value=208),
+    st_sleeps=strategy("uint32[20]", max_value=8 * WEEK),
+)
+@settings(max_examples=5)
+def test_indexer_matches_contract(
+    accounts,
+    token,
+    voting_escrow,
+    st_actions,
+    st_accounts,
+    st_values,
+    st_durations,
+    st_sleeps,
+):
+    """
+    Index a random sequence of lock operations in small pages and compare the
+    locally rebuilt voting power with the contract at every block.
+    """
+    for acct in accounts[:4]:
+        token.mint(acct, 10 ** 25, {"from": accounts[0]})
+        token.approve(voting_escrow, 10 ** 25, {"from": acct})
+
+    expected = []
+    for i in range(20):
+        chain.sleep(st_sleeps[i])
+        acct = accounts[st_accounts[i]]
+        unlock_time = chain.time() + st_durations[i] * WEEK
+        try:
+            if st_actions[i] == 0:
+                tx = voting_escrow.create_lock(
+                    st_values[i], unlock_time, {"from": acct, "gas": GAS_LIMIT}
+                )
+            elif st_actions[i] == 1:
+                tx = voting_escrow.increase_amount(st_values[i], {"from": acct, "gas": GAS_LIMIT})
+            elif st_actions[i] == 2:
+                tx = voting_escrow.increase_unlock_time(unlock_time, {"from": acct, "gas": GAS_LIMIT})
+            else:
+                tx = voting_escrow.withdraw({"from": acct, "gas": GAS_LIMIT})
+        except brownie.exceptions.VirtualMachineError:
+            continue
+        balances = {a: voting_escrow.balanceOf(a, tx.timestamp) for a in accounts[:4]}
+        expected.append((tx.block_number, balances, voting_escrow.totalSupply(tx.timestamp)))
+
+    # hypothesis reuses function fixtures across examples, keep the database per example
+    database = sqlite3.connect(":memory:")
+    start_block = voting_escrow.tx.block_number
+    indexer = VotingEscrowIndexer.from_contract(
+        voting_escrow, database, start_block=start_block, page_size=7
+    )
+    indexer.sync()
+
+    assert indexer.cursor == chain.height
+    for acct in accounts[:4]:
+        assert tuple(indexer.locked(acct)) == tuple(voting_escrow.locked(acct))
+    assert indexer.model.supply == voting_escrow.supply()
+    assert indexer.model.slope_changes == {
+        t: voting_escrow.slope_changes(t) for t in indexer.model.slope_changes
+    }
+
+    for block, balances, supply in expected:
+        powers = indexer.voting_powers(block)
+        for acct, balance in balances.items():
+            assert powers.get(acct, 0) == balance
+        assert indexer.total_supply(block) == supply
+
+    # a fresh indexer on the same database resumes from the stored cursor
+    resumed = VotingEscrowIndexer.from_contract(voting_escrow, database, start_block=start_block)
+    assert resumed.sync() == 0
+    for block, balances, supply in expected[-3:]:
+        assert resumed.voting_powers(block) == indexer.voting_powers(block)
+        assert resumed.total_supply(block) == supply
+
+
+def test_indexer_resumes(tmp_path, accounts, token, voting_escrow):
+    token.mint(accounts[1], 10 ** 21, {"from": accounts[0]})
+    token.approve(voting_escrow, 10 ** 21, {"from": accounts[1]})
+    database = tmp_path / "voting_escrow.db"
+    start_block = voting_escrow.tx.block_number
+
+    tx = voting_escrow.create_lock(10 ** 20, chain.time() + 52 * WEEK, {"from": accounts[1]})
+    indexer = VotingEscrowIndexer.from_contract(voting_escrow, database, start_block=start_block)
+    assert indexer.sync() == 2
+    assert indexer.cursor == tx.block_number
+
+    chain.sleep(WEEK)
+    tx = voting_escrow.increase_amount(10 ** 20, {"from": accounts[1]})
+    with pytest.raises(ValueError):
+        indexer.voting_power(accounts[1], tx.block_number)
+
+    assert indexer.sync() == 2
+    assert indexer.voting_power(accounts[1], tx.block_number) == voting_escrow.balanceOf(
+        accounts[1], tx.timestamp
+    )
+    assert [i.name for i in indexer.events()] == ["Deposit", "Supply", "Deposit", "Supply"]
@@ -0,0 +1,110 @@
+import brownie
+from brownie import chain, history
+from brownie.test import given, strategy
+from hypothesis import settings
+
+from scripts.voting_escrow_model import Revert, VotingEscrowModel
+
+WEEK = 86400 * 7
+MAXTIME = 86400 * 365 * 4
+GAS_LIMIT = 4_000_000
+
+
+def _model_from_chain(voting_escrow):
+    point = voting_escrow.point_history(0)
+    return VotingEscrowModel(point["ts"], point["blk"])
+
+
+def _apply(model, voting_escrow, acct, action, value, duration):
+    unlock_time = chain.time() + duration * WEEK
+    if action == 0:
+        fn, args = voting_escrow.create_lock, (value, unlock_time)
+    elif action == 1:
+        fn, args = voting_escrow.increase_amount, (value,)
+    elif action == 2:
+        fn, args = voting_escrow.increase_unlock_time, (unlock_time,)
+    else:
+        fn, args = voting_escrow.withdraw, ()
+
+    try:
+        fn(*args, {"from": acct, "gas": GAS_LIMIT})
+    except brownie.exceptions.VirtualMachineError:
+        pass
+    tx = history[-1]
+
+    model_args = (tx.timestamp, tx.block_number)
+    try:
+        if action == 0:
+            model.create_lock(acct, value, unlock_time, *model_args)
+        elif action == 1:
+            model.increase_amount(acct, value, *model_args)
+        elif action == 2:
+            model.increase_unlock_time(acct, unlock_time, *model_args)
+        else:
+            model.withdraw(acct, *model_args)
+        reverted = False
+    except Revert:
+        reverted = True
+
+    assert reverted == (tx.status == 0)
+    return tx
+
+
+@given(
+    st_actions=strategy("uint8[12]", max_value=3),
+    st_accounts=strategy("uint8[12]", max_value=2),
+    st_values=strategy("uint256[12]", min_value=10 ** 18, max_value=10 ** 24),
+    st_durations=strategy("uint8[12]", max_value=220),
+    st_sleeps=strategy("uint32[12]", max_value=6 * WEEK),
+)
+@settings(max_examples=10)
+def test_model_matches_contract(
+    accounts, token, voting_escrow, st_actions, st_accounts, st_values, st_durations, st_sleeps
+):
+    """
+    Run a random sequence of lock operations against both the contract and
+    the Python model, comparing every balance and supply view along the way.
+    """
+    for acct in accounts[:3]:
+        token.mint(acct, 10 ** 26, {"from": accounts[0]})
+        token.approve(voting_escrow, 10 ** 26, {"from": acct})
+
+    model = _model_from_chain(voting_escrow)
+    blocks = []
+    supplies = []
+
+    for i in range(12):
+        chain.sleep(st_sleeps[i])
+        acct = accounts[st_accounts[i]]
+        tx = _apply(model, voting_escrow, acct, st_actions[i], st_values[i], st_durations[i])
+        if tx.status == 0:
+            continue
+        blocks.append(tx.block_number)
+
+        t = tx.timestamp
+        for a in accounts[:3]:
+            assert voting_escrow.balanceOf(a, t) == model.balanceOf(a, t)
+        for dt in (0, WEEK, 10 * WEEK, 100 * WEEK):
+            assert voting_escrow.totalSupply(t + dt) == model.totalSupply(t + dt)
+        supplies.append((t, voting_escrow.totalSupply(t)))
+
+    chain.mine()
+    head = chain[-1]
+    assert voting_escrow.epoch() == model.epoch
+    deployed = voting_escrow.point_history(0)["ts"]
+    assert voting_escrow.totalSupply(deployed - 1) == model.totalSupply(deployed - 1) == 0
+    for t, supply in supplies:
+        # past supply reads the week-indexed history and must not change later
+        assert voting_escrow.totalSupply(t) == supply == model.totalSupply(t)
+        assert voting_escrow.totalSupply(t - 3600) == model.totalSupply(t - 3600)
+        week = t // WEEK * WEEK
+        assert voting_escrow.week_epoch(week) == model.week_epoch.get(week, 0)
+    for block in blocks:
+        for b in (block - 1, block):
+            assert voting_escrow.totalSupplyAt(b) == model.totalSupplyAt(
+                b, head.timestamp, head.number
+            )
+            for a in accounts[:3]:
+                assert voting_escrow.balanceOfAt(a, b) == model.balanceOfAt(
+                    a, b, head.timestamp, head.number
+                )
@@ -0,0 +1,166 @@
+import brownie
+from brownie import chain, history
+from brownie.test import strategy
+
+from scripts.voting_escrow_model import Revert, VotingEscrowModel
+
+WEEK = 86400 * 7
+GAS_LIMIT = 4_000_000
+
+# compare the contract views with the model every `CHECK_EVERY` steps
+CHECK_EVERY = 5
+
+
+class StateMachine:
+    """
+    Follow `VotingEscrow` with `VotingEscrowModel` over random lock operations.
+
+    Every step is applied to the model, and must revert on-chain exactly when
+    it reverts in the model. The contract views are compared with the model
+    every `CHECK_EVERY` steps and at the end of each run.
+
+    Strategies
+    ----------
+    st_account : Account
+        Account to perform the action from
+    st_value : int
+        Amount to lock
+    st_weeks : int
+        Lock duration in weeks, from the current time
+    st_sleep : int
+        Number of seconds to advance the clock
+    """
+
+    st_account = strategy("address", length=3)
+    st_value = strategy("uint256", min_value=10 ** 18, max_value=10 ** 24)
+    st_weeks = strategy("uint8", max_value=220)
+    st_sleep = strategy("uint32", max_value=6 * WEEK)
+
+    def __init__(self, accounts, token, voting_escrow):
+        self.accounts = accounts
+        self.token = token
+        self.voting_escrow = voting_escrow
+
+        for acct in accounts:
+            token.mint(acct, 10 ** 28, {"from": accounts[0]})
+            token.approve(voting_escrow, 2 ** 256 - 1, {"from": acct})
+
+    def setup(self):
+        point = self.voting_escrow.point_history(0)
+        self.model = VotingEscrowModel(point["ts"], point["blk"])
+        self.blocks = []
+        self.steps = 0
+
+    def _apply(self, acct, fn, args, model_fn, model_args):
+        try:
+            fn(*args, {"from": acct, "gas": GAS_LIMIT})
+        except brownie.exceptions.VirtualMachineError:
+            pass
+        tx = history[-1]
+
+        try:
+            model_fn(*model_args, tx.timestamp, tx.block_number)
+            reverted = False
+        except Revert:
+            reverted = True
+
+        assert reverted == (tx.status == 0)
+        if not reverted:
+            self.blocks.append(tx.block_number)
+
+    def rule_create_lock(self, st_account, st_value, st_weeks):
+        unlock_time = chain.time() + st_weeks * WEEK
+        self._apply(
+            st_account,
+            self.voting_escrow.create_lock,
+            (st_value, unlock_time),
+            self.model.create_lock,
+            (st_account, st_value, unlock_time),
+        )
+
+    def rule_increase_amount(self, st_account, st_value):
+        self._apply(
+            st_account,
+            self.voting_escrow.increase_amount,
+            (st_value,),
+            self.model.increase_amount,
+            (st_account, st_value),
+        )
+
+    def rule_increase_unlock_time(self, st_account, st_weeks):
+        unlock_time = chain.time() + st_weeks * WEEK
+        self._apply(
+            st_account,
+            self.voting_escrow.increase_unlock_time,
+            (unlock_time,),
+            self.model.increase_unlock_time,
+            (st_account, unlock_time),
+        )
+
+    def rule_withdraw(self, st_account):
+        self._apply(
+            st_account, self.voting_escrow.withdraw, (), self.model.withdraw, (st_account,)
+        )
+
+    def rule_checkpoint(self, st_account):
+        self._apply(st_account, self.voting_escrow.checkpoint, (), self.model.checkpoint, ())
+
+    def rule_advance_time(self, st_sleep):
+        chain.sleep(st_sleep)
+
+    def invariant_model(self):
+        """
+        Check the model on its own, after every step.
+        """
+        model = self.model
+        t = model.get_point(model.epoch).ts
+        assert model.supply == sum(model.get_locked(i).amount for i in self.accounts)
+        assert model.totalSupply(t) == sum(model.balanceOf(i, t) for i in self.accounts)
+
+        self.steps += 1
+        if self.steps % CHECK_EVERY == 0:
+            self._check_contract()
+
+    def teardown(self):
+        self._check_contract()
+
+    def _check_contract(self):
+        """
+        Compare the contract views with the model.
+        """
+        model = self.model
+        voting_escrow = self.voting_escrow
+        head = chain[-1]
+
+        assert voting_escrow.epoch() == model.epoch
+        assert voting_escrow.supply() == model.supply
+        assert self.token.balanceOf(voting_escrow) == model.supply
+        for acct in self.accounts:
+            assert voting_escrow.locked(acct) == tuple(model.get_locked(acct))
+            assert voting_escrow.user_point_epoch(acct) == model.get_user_point_epoch(acct)
+            assert voting_escrow.balanceOf(acct, head.timestamp) == model.balanceOf(
+                acct, head.timestamp
+            )
+        for dt in (0, WEEK, 10 * WEEK, 100 * WEEK):
+            assert voting_escrow.totalSupply(head.timestamp + dt) == model.totalSupply(
+                head.timestamp + dt
+            )
+
+        for block in self.blocks[-3:]:
+            assert voting_escrow.totalSupplyAt(block) == model.totalSupplyAt(
+                block, head.timestamp, head.number
+            )
+            for acct in self.accounts:
+                assert voting_escrow.balanceOfAt(acct, block) == model.balanceOfAt(
+                    acct, block, head.timestamp, head.number
+                )
+
+
+def test_state_machine(state_machine, accounts, token, voting_escrow):
+    state_machine(
+        StateMachine,
+        accounts[:3],
+        token,
+        voting_escrow,
+        settings={"max_examples": 30, "stateful_step_count": 40},
+    )
@@ -19,3 +19,25 @@ def test_gauge_notify(gauge_controller, accounts, gauge_for_mock_v2, mock_lp_tok
 
     mock_lp_token_v2.deposit(LP_AMOUNT, {"from": accounts[0]})
     assert gauge_for_mock_v2.balanceOf(accounts[0]) == LP_AMOUNT
+
+
+def test_gauge_notify_many(gauge_controller, accounts, gauge_for_mock_v2, mock_lp_token_v2):
+    gauge_controller.add_gauge(gauge_for_mock_v2, 0, {"from": accounts[0]})
+    mock_lp_token_v2.deposit(LP_AMOUNT, {"from": accounts[0]})
+
+    tx = mock_lp_token_v2.transfer(accounts[1], LP_AMOUNT // 4, {"from": accounts[0]})
+    assert gauge_for_mock_v2.balanceOf(accounts[0]) == LP_AMOUNT - LP_AMOUNT // 4
+    assert gauge_for_mock_v2.balanceOf(accounts[1]) == LP_AMOUNT // 4
+    assert gauge_for_mock_v2.lpTotalSupply() == LP_AMOUNT
+    assert tx.events["Withdraw"] == {"provider": accounts[0], "value": LP_AMOUNT // 4}
+    assert tx.events["Deposit"] == {"provider": accounts[1], "value": LP_AMOUNT // 4}
+
+
+def test_gauge_notify_many_not_added(gauge_controller, accounts, mock_lp_token_v2):
+    mock_lp_token_v2.deposit(LP_AMOUNT, {"from": accounts[0]})
+    mock_lp_token_v2.transfer(accounts[1], LP_AMOUNT // 4, {"from": accounts[0]})
+
+
+def test_gauge_notify_many_empty(gauge_controller, accounts):
+    with brownie.reverts("dev: invalid parameter"):
+        gauge_controller.notifySavingsChanges([brownie.ZERO_ADDRESS] * 8, {"from": accounts[0]})
@@ -0,0 +1,101 @@
+import pytest
+
+from scripts.gauge_weights import gauge_weights, weekly_weights
+
+WEEK = 86400 * 7
+TYPE_WEIGHTS = [5 * 10 ** 17, 2 * 10 ** 18]
+GAUGE_WEIGHTS = [2 * 10 ** 18, 10 ** 18, 5 * 10 ** 17]
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+@pytest.fixture(scope="module")
+def weight_times(accounts, chain, gauge_controller, three_gauges):
+    gauge_controller.add_type(b"Insurance", TYPE_WEIGHTS[1], {"from": accounts[0]})
+    for i, gauge in enumerate(three_gauges):
+        gauge_controller.add_gauge(gauge, i % 2, GAUGE_WEIGHTS[i], {"from": accounts[0]})
+
+    times = []
+    for i in range(5):
+        chain.sleep(WEEK)
+        gauge_controller.change_gauge_weight(three_gauges[0], (i + 1) * 10 ** 18, {"from": accounts[0]})
+        times.append(chain.time())
+    chain.sleep(WEEK)
+    gauge_controller.checkpoint({"from": accounts[0]})
+
+    yield times
+
+
+def test_gauge_relative_weights(gauge_controller, three_gauges, weight_times):
+    gauges, relative, weights, type_weights, totals = gauge_controller.gauge_relative_weights(
+        0, weight_times[:3] + [0]
+    )
+
+    assert gauges[:3] == list(three_gauges)
+    assert set(gauges[3:]) == {ZERO_ADDRESS}
+    for j, t in enumerate(weight_times[:3]):
+        week = t // WEEK * WEEK
+        assert totals[j] == gauge_controller.points_total(week)
+        for i, gauge in enumerate(three_gauges):
+            assert relative[i][j] == gauge_controller.gauge_relative_weight(gauge, t)
+            assert weights[i][j] == gauge_controller.points_weight(gauge, week)[0]
+            assert type_weights[i][j] == gauge_controller.points_type_weight(i % 2, week)
+    assert totals[3] == 0
+    assert [row[3] for row in relative] == [0] * len(relative)
+
+
+def test_gauge_relative_weights_page_offset(gauge_controller, three_gauges, weight_times):
+    gauges, relative = gauge_controller.gauge_relative_weights(1, weight_times[:4])[:2]
+
+    assert gauges[:2] == list(three_gauges[1:])
+    for j, t in enumerate(weight_times[:4]):
+        assert relative[0][j] == gauge_controller.gauge_relative_weight(three_gauges[1], t)
+
+
+def test_gauge_weights_helper(gauge_controller, three_gauges, weight_times):
+    result = gauge_weights(gauge_controller, weight_times)
+
+    assert result.times == weight_times
+    assert len(result.totals) == len(weight_times)
+    for gauge in three_gauges:
+        assert result.relative_weights[gauge.address] == [
+            gauge_controller.gauge_relative_weight(gauge, t) for t in weight_times
+        ]
+    for j, t in enumerate(weight_times):
+        assert sum(result.relative_weights[gauge.address][j] for gauge in three_gauges) <= 10 ** 18
+        assert result.totals[j] == gauge_controller.points_total(t // WEEK * WEEK)
+
+
+@pytest.mark.parametrize("n_weeks", [1, 5, 7])
+def test_weekly_weights_helper(gauge_controller, three_gauges, weight_times, n_weeks):
+    start = weight_times[0] + 1
+    result = weekly_weights(gauge_controller, start, n_weeks)
+
+    first = start // WEEK * WEEK
+    assert result.times == [first + i * WEEK for i in range(n_weeks)]
+    for gauge in three_gauges:
+        assert result.relative_weights[gauge.address] == [
+            gauge_controller.gauge_relative_weight(gauge, t) for t in result.times
+        ]
+        assert result.gauge_weights[gauge.address] == [
+            gauge_controller.points_weight(gauge, t)[0] for t in result.times
+        ]
+    assert result.totals == [gauge_controller.points_total(t) for t in result.times]
+
+
+@pytest.mark.parametrize("start", [0, 1, WEEK - 1])
+def test_weekly_weights_zero_week(gauge_controller, weight_times, start):
+    with pytest.raises(ValueError):
+        weekly_weights(gauge_controller, start, 2)
+
+
+@pytest.mark.parametrize("n_weeks", [1, 3, 6, 16])
+def test_gauge_relative_weight_weeks(gauge_controller, three_gauges, weight_times, n_weeks):
+    start = weight_times[0] - WEEK
+    for gauge in three_gauges:
+        weights = gauge_controller.gauge_relative_weight_weeks(gauge, start, n_weeks)
+
+        assert len(weights) == 16
+        assert weights[:n_weeks] == [
+            gauge_controller.gauge_relative_weight(gauge, start + i * WEEK) for i in range(n_weeks)
+        ]
+        assert set(weights[n_weeks:]) <= {0}
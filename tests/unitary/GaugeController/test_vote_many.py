@@ -0,0 +1,102 @@
+import brownie
+import pytest
+
+YEAR = 86400 * 365
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def _pad(gauges, weights):
+    return (
+        list(gauges) + [ZERO_ADDRESS] * (20 - len(gauges)),
+        list(weights) + [0] * (20 - len(weights)),
+    )
+
+
+@pytest.fixture(scope="module", autouse=True)
+def gauge_vote_setup(accounts, chain, gauge_controller, three_gauges, voting_escrow, token):
+    gauge_controller.add_type(b"Insurance", {"from": accounts[0]})
+    gauge_controller.add_gauge(three_gauges[0], 0, {"from": accounts[0]})
+    gauge_controller.add_gauge(three_gauges[1], 1, {"from": accounts[0]})
+    gauge_controller.add_gauge(three_gauges[2], 1, {"from": accounts[0]})
+
+    for acct in accounts[:2]:
+        token.mint(acct, 10 ** 24, {"from": accounts[0]})
+        token.approve(voting_escrow, 10 ** 24, {"from": acct})
+        voting_escrow.create_lock(10 ** 24, chain.time() + YEAR, {"from": acct})
+
+
+def test_vote_many(accounts, gauge_controller, three_gauges):
+    gauge_controller.vote_for_many_gauge_weights(
+        *_pad(three_gauges, [2000, 3000, 5000]), {"from": accounts[0]}
+    )
+
+    assert gauge_controller.vote_user_power(accounts[0]) == 10000
+    for gauge, weight in zip(three_gauges, [2000, 3000, 5000]):
+        assert gauge_controller.vote_user_slopes(accounts[0], gauge)["power"] == weight
+
+
+def test_vote_many_matches_single_votes(chain, accounts, gauge_controller, three_gauges):
+    weights = [1000, 4000, 5000]
+    chain.mine(timestamp=(chain.time() // 604800 + 1) * 604800 + 3600)
+    gauge_controller.vote_for_many_gauge_weights(*_pad(three_gauges, weights), {"from": accounts[0]})
+    for gauge, weight in zip(three_gauges, weights):
+        gauge_controller.vote_for_gauge_weights(gauge, weight, {"from": accounts[1]})
+
+    batched = accounts[0]
+    single = accounts[1]
+    assert gauge_controller.vote_user_power(batched) == gauge_controller.vote_user_power(single)
+    for gauge in three_gauges:
+        assert gauge_controller.vote_user_slopes(batched, gauge) == gauge_controller.vote_user_slopes(
+            single, gauge
+        )
+
+    total = gauge_controller.get_total_weight()
+    chain.sleep(604800)
+    gauge_controller.checkpoint({"from": accounts[0]})
+    for gauge in three_gauges:
+        assert gauge_controller.get_gauge_weight(gauge) > 0
+    assert gauge_controller.get_total_weight() <= total
+
+
+def test_vote_many_moves_power(accounts, gauge_controller, three_gauges):
+    gauge_controller.vote_for_gauge_weights(three_gauges[0], 10000, {"from": accounts[0]})
+
+    # power moves from the first gauge to the others, only the final total is checked
+    gauge_controller.vote_for_many_gauge_weights(
+        *_pad([three_gauges[1], three_gauges[0], three_gauges[2]], [6000, 0, 4000]),
+        {"from": accounts[0]},
+    )
+
+    assert gauge_controller.vote_user_power(accounts[0]) == 10000
+    assert gauge_controller.vote_user_slopes(accounts[0], three_gauges[0])["power"] == 0
+
+
+def test_vote_many_stops_at_zero_address(accounts, gauge_controller, three_gauges):
+    gauges, weights = _pad(three_gauges[:1], [3000])
+    gauges[2] = three_gauges[2]
+    weights[2] = 7000
+    gauge_controller.vote_for_many_gauge_weights(gauges, weights, {"from": accounts[0]})
+
+    assert gauge_controller.vote_user_power(accounts[0]) == 3000
+    assert gauge_controller.vote_user_slopes(accounts[0], three_gauges[2])["power"] == 0
+
+
+def test_vote_many_over_weight(accounts, gauge_controller, three_gauges):
+    with brownie.reverts("Used too much power"):
+        gauge_controller.vote_for_many_gauge_weights(
+            *_pad(three_gauges, [4000, 4000, 4000]), {"from": accounts[0]}
+        )
+
+
+def test_vote_many_invalid_gauge(accounts, gauge_controller, three_gauges):
+    with brownie.reverts("Gauge not added"):
+        gauge_controller.vote_for_many_gauge_weights(
+            *_pad([three_gauges[0], accounts[3]], [1000, 1000]), {"from": accounts[0]}
+        )
+
+
+def test_vote_many_no_lock(accounts, gauge_controller, three_gauges):
+    with brownie.reverts("Your token lock expires too soon"):
+        gauge_controller.vote_for_many_gauge_weights(
+            *_pad(three_gauges, [1000, 1000, 1000]), {"from": accounts[2]}
+        )
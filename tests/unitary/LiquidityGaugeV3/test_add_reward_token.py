@@ -62,3 +62,52 @@ def test_add_exist_reward_token(alice, gauge_v3, coin_reward):
 def test_add_admin_only(bob, gauge_v3, coin_reward):
     with brownie.reverts("dev: admin only"):
         gauge_v3.add_reward_token(coin_reward, REWARD, {"from": bob})
+
+def test_add_rate_too_high(alice, gauge_v3, coin_reward):
+    with brownie.reverts("dev: reward rate too high"):
+        gauge_v3.add_reward_token(coin_reward, 2 ** 96, {"from": alice})
+
+def test_add_max_rate(alice, gauge_v3, coin_reward, coin_a):
+    gauge_v3.add_reward_token(coin_reward, 2 ** 96 - 1, {"from": alice})
+    gauge_v3.add_reward_token(coin_a, REWARD, {"from": alice})
+
+    assert gauge_v3.reward_tokens(0) == coin_reward
+    assert gauge_v3.reward_tokens(1) == coin_a
+    assert gauge_v3.reward_rate(coin_reward) == 2 ** 96 - 1
+    assert gauge_v3.reward_rate(coin_a) == REWARD
+
+def test_not_added_token_views(alice, gauge_v3, coin_reward, coin_a):
+    gauge_v3.add_reward_token(coin_reward, REWARD, {"from": alice})
+
+    assert gauge_v3.reward_rate(coin_a) == 0
+    assert gauge_v3.reward_integral(coin_a) == 0
+    assert not gauge_v3.is_reward_token_exist(coin_a)
+    assert not gauge_v3.is_reward_token_exist(ZERO_ADDRESS)
+
+def test_no_reward_checkpoint(alice, chain, gauge_v3, mock_lp_token):
+    mock_lp_token.deposit(LP_AMOUNT, {"from": alice})
+    chain.sleep(86400)
+    tx = gauge_v3.claim_rewards({"from": alice})
+
+    assert gauge_v3.reward_timestamp() == 0
+    assert "Transfer" not in tx.events
+
+def test_add_first_token_sets_timestamp(alice, chain, gauge_v3, mock_lp_token, coin_reward):
+    mock_lp_token.deposit(LP_AMOUNT, {"from": alice})
+    chain.sleep(86400)
+    tx = gauge_v3.add_reward_token(coin_reward, REWARD, {"from": alice})
+
+    assert gauge_v3.reward_timestamp() == tx.timestamp
+    assert gauge_v3.reward_integral(coin_reward) == 0
+
+def test_rewards_start_when_added(alice, chain, gauge_v3, mock_lp_token, coin_reward):
+    coin_reward._mint_for_testing(gauge_v3, REWARD * 86400 * 3)
+    mock_lp_token.deposit(LP_AMOUNT, {"from": alice})
+    chain.sleep(86400)
+    add_tx = gauge_v3.add_reward_token(coin_reward, REWARD, {"from": alice})
+    chain.sleep(86400)
+    claim_tx = gauge_v3.claim_rewards({"from": alice})
+
+    # the day before the token was added earns nothing
+    expected = REWARD * (claim_tx.timestamp - add_tx.timestamp)
+    assert abs(coin_reward.balanceOf(alice) - expected) <= 10 ** 8
@@ -1,4 +1,5 @@
 import brownie
+from brownie import ZERO_ADDRESS
 
 MAX_UINT256 = 2 ** 256 - 1
 WEEK = 7 * 86400
@@ -30,3 +31,46 @@ def test_kick(chain, accounts, gauge_v3, voting_escrow, token, coin_deposit, moc
 
     with brownie.reverts("dev: kick not needed"):
         gauge_v3.kick(alice, {"from": bob})
+
+
+def _padded(addrs):
+    return list(addrs) + [ZERO_ADDRESS] * (8 - len(addrs))
+
+
+def _lock_and_deposit(chain, admin, acct, voting_escrow, token, coin_deposit, mock_lp_token):
+    token.mint(acct, 10 ** 20, {"from": admin})
+    token.approve(voting_escrow, MAX_UINT256, {"from": acct})
+    voting_escrow.create_lock(10 ** 20, chain.time() + 4 * WEEK, {"from": acct})
+
+    coin_deposit.mint(acct, 10 ** 21, {"from": admin})
+    coin_deposit.approve(mock_lp_token, MAX_UINT256, {"from": acct})
+    mock_lp_token.deposit(10 ** 21, {"from": acct})
+
+
+def test_kick_many(chain, accounts, gauge_v3, voting_escrow, token, coin_deposit, mock_lp_token):
+    alice, bob, charlie = accounts[:3]
+    chain.sleep(2 * WEEK + 5)
+
+    for acct in (alice, bob):
+        _lock_and_deposit(chain, alice, acct, voting_escrow, token, coin_deposit, mock_lp_token)
+
+    chain.sleep(WEEK)
+
+    with brownie.reverts("dev: kick not allowed"):
+        gauge_v3.kick_many(_padded([alice, bob]), {"from": charlie})
+
+    chain.sleep(4 * WEEK)
+
+    period = gauge_v3.period()
+    tx = gauge_v3.kick_many(_padded([alice, bob]), {"from": charlie})
+
+    # the gauge is checkpointed once for both users
+    assert gauge_v3.period() == period + 1
+    for acct in (alice, bob):
+        assert gauge_v3.integrate_checkpoint_of(acct) == tx.timestamp
+        assert gauge_v3.working_balances(acct) == 4 * 10 ** 20
+    assert gauge_v3.working_supply() == 8 * 10 ** 20
+
+    with brownie.reverts("dev: kick not needed"):
+        gauge_v3.kick_many(_padded([alice]), {"from": charlie})
+
@@ -0,0 +1,92 @@
+from brownie import ZERO_ADDRESS
+
+WEEK = 7 * 86400
+LP_AMOUNT = 10 ** 20
+
+
+def _padded(addrs):
+    return list(addrs) + [ZERO_ADDRESS] * (8 - len(addrs))
+
+
+def test_transfer(alice, bob, chain, gauge_v3_point, mock_lp_token, coin_deposit):
+    coin_deposit.mint(alice, LP_AMOUNT, {"from": alice})
+    coin_deposit.approve(mock_lp_token, LP_AMOUNT, {"from": alice})
+    mock_lp_token.deposit(LP_AMOUNT, {"from": alice})
+    chain.sleep(WEEK)
+
+    period = gauge_v3_point.period()
+    point_period = gauge_v3_point.point_period()
+    tx = mock_lp_token.transfer(bob, LP_AMOUNT // 4, {"from": alice})
+
+    # the gauge is checkpointed once for both users
+    assert gauge_v3_point.period() == period + 1
+    assert gauge_v3_point.point_period() == point_period + 1
+    for acct in (alice, bob):
+        assert gauge_v3_point.integrate_checkpoint_of(acct) == tx.timestamp
+        assert gauge_v3_point.point_integrate_checkpoint_of(acct) == tx.timestamp
+        assert gauge_v3_point.working_balances(acct) > 0
+
+    assert gauge_v3_point.lpTotalSupply() == LP_AMOUNT
+    assert gauge_v3_point.working_supply() == sum(
+        gauge_v3_point.working_balances(i) for i in (alice, bob)
+    )
+    assert gauge_v3_point.integrate_fraction(alice) > 0
+    assert gauge_v3_point.integrate_fraction(bob) == 0
+
+
+def test_notify_many(alice, bob, charlie, chain, gauge_v3_point, mock_lp_token, coin_deposit):
+    for acct in (alice, bob):
+        coin_deposit.mint(acct, LP_AMOUNT, {"from": alice})
+        coin_deposit.approve(mock_lp_token, LP_AMOUNT, {"from": acct})
+        mock_lp_token.deposit(LP_AMOUNT, {"from": acct})
+
+    # change the balances without notifying the gauge
+    mock_lp_token.setGauge(ZERO_ADDRESS, {"from": alice})
+    mock_lp_token.withdraw(LP_AMOUNT // 2, {"from": alice})
+    mock_lp_token.transfer(charlie, LP_AMOUNT // 4, {"from": bob})
+    mock_lp_token.setGauge(gauge_v3_point, {"from": alice})
+    chain.sleep(WEEK)
+
+    tx = gauge_v3_point.notifySavingsChanges(_padded([alice, bob, charlie]), {"from": charlie})
+
+    for acct in (alice, bob, charlie):
+        assert gauge_v3_point.integrate_checkpoint_of(acct) == tx.timestamp
+    assert gauge_v3_point.lpTotalSupply() == mock_lp_token.totalSupply()
+    assert gauge_v3_point.balanceOf(charlie) == LP_AMOUNT // 4
+
+
+def test_notify_many_unchanged(alice, gauge_v3_point):
+    tx = gauge_v3_point.notifySavingsChanges(_padded([alice]), {"from": alice})
+
+    assert tx.events["Withdraw"] == {"provider": alice, "value": 0}
+    assert gauge_v3_point.lpTotalSupply() == 0
+
+
+def test_notify_many_stops_at_empty_address(alice, bob, gauge_v3_point, mock_lp_token, coin_deposit):
+    coin_deposit.mint(bob, LP_AMOUNT, {"from": alice})
+    coin_deposit.approve(mock_lp_token, LP_AMOUNT, {"from": bob})
+    mock_lp_token.setGauge(ZERO_ADDRESS, {"from": alice})
+    mock_lp_token.deposit(LP_AMOUNT, {"from": bob})
+    mock_lp_token.setGauge(gauge_v3_point, {"from": alice})
+
+    gauge_v3_point.notifySavingsChanges([alice, ZERO_ADDRESS, bob] + [ZERO_ADDRESS] * 5, {"from": alice})
+
+    assert gauge_v3_point.balanceOf(bob) == 0
+
+
+def _inputs(container, name):
+    abi = next(i for i in container.abi if i.get("name") == name)
+    return [i["type"] for i in abi["inputs"]]
+
+
+def test_notify_length_matches(LiquidityGaugeV3, GaugeController, MockCErc20, MockCErc20V2):
+    """
+    `MAX_NOTIFY` is copied into every contract calling the gauge, and the
+    array length is part of the selector, so they must all accept the same.
+    """
+    assert _inputs(LiquidityGaugeV3, "notifySavingsChanges") == ["address[8]"]
+    assert _inputs(GaugeController, "notifySavingsChanges") == ["address[8]"]
+
+    selector = LiquidityGaugeV3.signatures["notifySavingsChanges"][2:]
+    for caller in (GaugeController, MockCErc20, MockCErc20V2):
+        assert selector in caller.bytecode
@@ -64,3 +64,7 @@ def test_set_not_exist_token_rate(alice, gauge_v3, coin_a):
 def test_set_admin_only(bob, gauge_v3, coin_reward):
     with brownie.reverts("dev: admin only"):
         gauge_v3.set_reward_rate(coin_reward, REWARD, {"from": bob})
+
+def test_set_rate_too_high(alice, gauge_v3, coin_reward):
+    with brownie.reverts("dev: reward rate too high"):
+        gauge_v3.set_reward_rate(coin_reward, 2 ** 96, {"from": alice})
@@ -0,0 +1,63 @@
+MAX_UINT256 = 2 ** 256 - 1
+WEEK = 7 * 86400
+
+
+def _expected_working_balance(gauge, voting_escrow, acct, tx, total=None):
+    if total is None:
+        total = gauge.totalSupply()
+    balance = gauge.balanceOf(acct)
+    voting_balance = voting_escrow.balanceOf(acct, tx.timestamp)
+    voting_total = voting_escrow.totalSupply(tx.timestamp)
+    lim = balance * 40 // 100
+    if voting_total > 0:
+        lim += total * voting_balance // voting_total * 60 // 100
+    return min(balance, lim)
+
+
+def test_boost_follows_new_locks(chain, accounts, gauge_v3, voting_escrow, token, coin_deposit, mock_lp_token):
+    alice, bob = accounts[:2]
+
+    for acct in (alice, bob):
+        token.mint(acct, 10 ** 21, {"from": alice})
+        token.approve(voting_escrow, MAX_UINT256, {"from": acct})
+        coin_deposit.mint(acct, 10 ** 21, {"from": alice})
+        coin_deposit.approve(mock_lp_token, MAX_UINT256, {"from": acct})
+
+    voting_escrow.create_lock(10 ** 20, chain.time() + 52 * WEEK, {"from": alice})
+    mock_lp_token.deposit(10 ** 20, {"from": alice})
+    mock_lp_token.deposit(10 ** 21, {"from": bob})
+
+    tx = gauge_v3.user_checkpoint(alice, {"from": alice})
+    assert gauge_v3.working_balances(alice) == _expected_working_balance(gauge_v3, voting_escrow, alice, tx)
+
+    # a new lock changes the total, which the next transaction reads again
+    voting_escrow.create_lock(10 ** 21, chain.time() + 52 * WEEK, {"from": bob})
+    tx = gauge_v3.user_checkpoint(alice, {"from": alice})
+    assert gauge_v3.working_balances(alice) == _expected_working_balance(gauge_v3, voting_escrow, alice, tx)
+
+    chain.sleep(30 * WEEK)
+    for acct in (alice, bob):
+        tx = gauge_v3.user_checkpoint(acct, {"from": acct})
+        assert gauge_v3.working_balances(acct) == _expected_working_balance(gauge_v3, voting_escrow, acct, tx)
+
+
+def test_batch_reads_total_once(chain, accounts, gauge_v3, voting_escrow, token, coin_deposit, mock_lp_token):
+    alice, bob = accounts[:2]
+
+    for acct in (alice, bob):
+        token.mint(acct, 10 ** 21, {"from": alice})
+        token.approve(voting_escrow, MAX_UINT256, {"from": acct})
+        voting_escrow.create_lock(10 ** 20, chain.time() + 52 * WEEK, {"from": acct})
+    coin_deposit.mint(alice, 10 ** 21, {"from": alice})
+    coin_deposit.approve(mock_lp_token, MAX_UINT256, {"from": alice})
+    mock_lp_token.deposit(10 ** 21, {"from": alice})
+
+    # both users of the transfer are boosted against the same voting total
+    chain.sleep(WEEK)
+    tx = mock_lp_token.transfer(bob, 10 ** 20, {"from": alice})
+    # alice is updated before bob's deposit is added to the gauge total
+    total = gauge_v3.totalSupply() - 10 ** 20
+    assert gauge_v3.working_balances(alice) == _expected_working_balance(
+        gauge_v3, voting_escrow, alice, tx, total
+    )
+    assert gauge_v3.working_balances(bob) == _expected_working_balance(gauge_v3, voting_escrow, bob, tx)
@@ -2,6 +2,7 @@ import itertools
 
 import brownie
 import pytest
+from brownie import ZERO_ADDRESS
 
 TYPE_WEIGHTS = [5e17, 1e19]
 GAUGE_WEIGHTS = [1e19, 1e18, 5e17]
@@ -106,6 +107,62 @@ def test_mint_multiple_gauges(accounts, chain, three_gauges, minter, token, mock
     assert token.balanceOf(accounts[1]) == total_minted
 
 
+def test_mint_batch(accounts, chain, three_gauges, minter, token, mock_lp_token_A, mock_lp_token_B, mock_lp_token_C):
+    #deposit to three_gauges
+    mock_lp_token_A.deposit(10 ** 17, {"from": accounts[1]})
+    mock_lp_token_B.deposit(2 * 10 ** 17, {"from": accounts[1]})
+    mock_lp_token_C.deposit(3 * 10 ** 17, {"from": accounts[1]})
+
+    chain.sleep(MONTH)
+    tx = minter.mint_batch(list(three_gauges) + [ZERO_ADDRESS] * 29, {"from": accounts[1]})
+
+    total_minted = 0
+    for gauge in three_gauges:
+        minted = minter.minted(accounts[1], gauge)
+        assert minted == gauge.integrate_fraction(accounts[1])
+        total_minted += minted
+
+    assert total_minted > 0
+    assert token.balanceOf(accounts[1]) == total_minted
+    assert len(tx.events["Transfer"]) == 1
+    assert [dict(i) for i in tx.events["Minted"]] == [
+        {"recipient": accounts[1], "gauge": gauge, "minted": minter.minted(accounts[1], gauge)}
+        for gauge in three_gauges
+    ]
+    assert tx.events["MintedBatch"] == {
+        "recipient": accounts[1], "n_gauges": 3, "amount": total_minted
+    }
+
+
+def test_mint_batch_after_mint(accounts, chain, three_gauges, minter, token, mock_lp_token_A, mock_lp_token_B):
+    mock_lp_token_A.deposit(10 ** 17, {"from": accounts[1]})
+    mock_lp_token_B.deposit(2 * 10 ** 17, {"from": accounts[1]})
+
+    chain.sleep(MONTH)
+    minter.mint(three_gauges[0], {"from": accounts[1]})
+    chain.sleep(WEEK)
+    minter.mint_batch(list(three_gauges[:2]) + [ZERO_ADDRESS] * 30, {"from": accounts[1]})
+
+    expected = sum(three_gauges[i].integrate_fraction(accounts[1]) for i in range(2))
+    assert token.balanceOf(accounts[1]) == expected
+    for i in range(2):
+        assert minter.minted(accounts[1], three_gauges[i]) == three_gauges[i].integrate_fraction(accounts[1])
+
+
+def test_mint_batch_nothing_to_mint(accounts, three_gauges, minter, token):
+    tx = minter.mint_batch(list(three_gauges) + [ZERO_ADDRESS] * 29, {"from": accounts[1]})
+
+    assert token.balanceOf(accounts[1]) == 0
+    assert "Transfer" not in tx.events
+    assert "Minted" not in tx.events
+    assert "MintedBatch" not in tx.events
+
+
+def test_mint_batch_not_a_gauge(accounts, three_gauges, minter):
+    with brownie.reverts("dev: gauge is not added"):
+        minter.mint_batch([three_gauges[0], accounts[1]] + [ZERO_ADDRESS] * 30, {"from": accounts[0]})
+
+
 def test_mint_after_withdraw(accounts, chain, three_gauges, minter, token, mock_lp_token_A):
     #deposit to three_gauges[0]
     mock_lp_token_A.deposit(1e18, {"from": accounts[1]})
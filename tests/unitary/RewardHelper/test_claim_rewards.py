@@ -178,3 +178,115 @@ def test_claim_multiple_rewards(accounts, three_gauges, chain, mock_lp_token_A,
     assert claimed == reward_balance
 
 
+
+def test_claim_same_block_single_period(accounts, three_gauges, chain, mock_lp_token_A, reward_helper, minter):
+    minter.toggle_approve_mint(reward_helper, {"from": accounts[1]})
+    mock_lp_token_A.deposit(LP_AMOUNT, {"from": accounts[1]})
+
+    chain.sleep(WEEK)
+    chain.mine()
+
+    gauge = three_gauges[0]
+    period = gauge.period()
+    point_period = gauge.point_period()
+
+    # mint_for and claim_rewards both checkpoint the gauge within one transaction
+    tx = reward_helper.claim_rewards_for(accounts[1],
+        [gauge,
+        ZERO_ADDRESS, ZERO_ADDRESS, ZERO_ADDRESS, ZERO_ADDRESS,
+        ZERO_ADDRESS, ZERO_ADDRESS, ZERO_ADDRESS, ZERO_ADDRESS, ZERO_ADDRESS])
+
+    assert gauge.period() == period + 1
+    assert gauge.point_period() == point_period + 1
+    assert gauge.period_timestamp(period + 1) == tx.timestamp
+    assert gauge.integrate_checkpoint() == tx.timestamp
+
+
+def _pairs(pairs):
+    padding = [ZERO_ADDRESS] * (100 - len(pairs))
+    return [i[0] for i in pairs] + padding, [i[1] for i in pairs] + padding
+
+
+def test_claim_many(accounts, three_gauges, chain, gauge_controller,
+        mock_lp_token_A, mock_lp_token_B, mock_lp_token_C, reward_helper, token, minter):
+    for acct in accounts[1:4]:
+        minter.toggle_approve_mint(reward_helper, {"from": acct})
+    mock_lp_token_A.deposit(LP_AMOUNT, {"from": accounts[1]})
+    mock_lp_token_B.deposit(LP_AMOUNT, {"from": accounts[1]})
+    mock_lp_token_B.deposit(LP_AMOUNT, {"from": accounts[2]})
+    mock_lp_token_C.deposit(LP_AMOUNT, {"from": accounts[3]})
+
+    chain.sleep(MONTH)
+    chain.mine()
+
+    pairs = [
+        (accounts[1], three_gauges[0]),
+        (accounts[1], three_gauges[1]),
+        (accounts[2], three_gauges[1]),
+        (accounts[3], three_gauges[1]),
+        (accounts[3], three_gauges[2]),
+    ]
+    tx = reward_helper.claim_rewards_for_many(*_pairs(pairs), {"from": accounts[4]})
+
+    for acct in accounts[1:4]:
+        expected = sum(gauge.integrate_fraction(acct) for gauge in three_gauges)
+        assert expected > 0
+        assert token.balanceOf(acct) == expected
+    for acct, gauge in pairs:
+        assert minter.minted(acct, gauge) == gauge.integrate_fraction(acct)
+
+    # every gauge is checked in the controller once
+    checks = [
+        i for i in tx.subcalls if i["from"] == reward_helper and i["to"] == gauge_controller
+    ]
+    assert len(checks) == 3
+
+
+def test_claim_many_matches_single(accounts, three_gauges, chain,
+        mock_lp_token_A, mock_lp_token_B, reward_helper, token, minter):
+    for acct in accounts[1:3]:
+        minter.toggle_approve_mint(reward_helper, {"from": acct})
+    mock_lp_token_A.deposit(LP_AMOUNT, {"from": accounts[1]})
+    mock_lp_token_B.deposit(LP_AMOUNT, {"from": accounts[2]})
+
+    # both paths start from the same time, and each claim is compared with
+    # what the gauge accrued up to the block it was paid in
+    start = chain.time() + MONTH
+    pairs = [(accounts[1], three_gauges[0]), (accounts[2], three_gauges[1])]
+
+    chain.mine(timestamp=start)
+    reward_helper.claim_rewards_for_many(*_pairs(pairs), {"from": accounts[4]})
+    batched = [token.balanceOf(acct) for acct, _ in pairs]
+    assert batched == [gauge.integrate_fraction(acct) for acct, gauge in pairs]
+    assert min(batched) > 0
+
+    chain.undo()
+    chain.mine(timestamp=start)
+    for acct, gauge in pairs:
+        reward_helper.claim_rewards_for(acct, [gauge] + [ZERO_ADDRESS] * 9, {"from": accounts[4]})
+        assert token.balanceOf(acct) == gauge.integrate_fraction(acct) > 0
+        assert minter.minted(acct, gauge) == gauge.integrate_fraction(acct)
+
+
+def test_claim_many_stops_at_empty_address(accounts, three_gauges, chain, mock_lp_token_A, reward_helper, token, minter):
+    for acct in accounts[1:3]:
+        minter.toggle_approve_mint(reward_helper, {"from": acct})
+        mock_lp_token_A.deposit(LP_AMOUNT, {"from": acct})
+
+    chain.sleep(MONTH)
+    chain.mine()
+
+    addrs, gauges = _pairs([(accounts[1], three_gauges[0])])
+    addrs[2] = accounts[2]
+    gauges[2] = three_gauges[0]
+    reward_helper.claim_rewards_for_many(addrs, gauges, {"from": accounts[4]})
+
+    assert token.balanceOf(accounts[1]) > 0
+    assert token.balanceOf(accounts[2]) == 0
+
+
+def test_claim_many_not_a_gauge(accounts, three_gauges, reward_helper):
+    pairs = [(accounts[1], three_gauges[0]), (accounts[1], accounts[5])]
+
+    with brownie.reverts("dev: gauge is not added"):
+        reward_helper.claim_rewards_for_many(*_pairs(pairs), {"from": accounts[4]})
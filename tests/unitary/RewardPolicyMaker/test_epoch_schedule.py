@@ -0,0 +1,32 @@
+from brownie import chain
+from brownie.test import given, strategy
+from hypothesis import settings
+
+WEEK = 86400 * 7
+EPOCH_BATCH = 16
+
+
+@given(offset=strategy("uint256", max_value=30 * WEEK))
+@settings(max_examples=20)
+def test_epoch_schedule_matches_views(reward_policy_maker, offset):
+    first = reward_policy_maker.first_epoch_time()
+    timestamp = first - WEEK + offset
+
+    ends, rates = reward_policy_maker.epoch_schedule(timestamp)
+
+    start = timestamp
+    for i in range(EPOCH_BATCH):
+        epoch = reward_policy_maker.epoch_at(start)
+        assert ends[i] == reward_policy_maker.epoch_start_time(epoch + 1)
+        assert rates[i] == reward_policy_maker.rate_at(start)
+        start = ends[i]
+
+
+def test_epoch_schedule_after_rewards_change(accounts, reward_policy_maker):
+    epoch = reward_policy_maker.current_epoch()
+    reward_policy_maker.set_rewards_at(epoch + 3, 7 * 10 ** 18, {"from": accounts[0]})
+
+    ends, rates = reward_policy_maker.epoch_schedule(chain.time())
+
+    assert rates[3] == 7 * 10 ** 18 // WEEK
+    assert ends[0] == reward_policy_maker.future_epoch_time()